@@ -31,6 +31,7 @@ SeeedHASensor::SeeedHASensor(
     _icon(""),
     _value(0),
     _precision(1),               // Default 1 decimal | 默认 1 位小数
+    _expectedInterval(0),        // No staleness check | 不检测过期
     _hasValue(false),
     _ha(nullptr)
 {
@@ -59,6 +60,10 @@ void SeeedHASensor::setIcon(const String& icon) {
     _icon = icon;
 }
 
+void SeeedHASensor::setExpectedInterval(uint32_t seconds) {
+    _expectedInterval = seconds;
+}
+
 void SeeedHASensor::toJson(JsonObject& obj) const {
     // Convert sensor info to JSON format
     // This JSON is sent to Home Assistant
@@ -93,6 +98,11 @@ void SeeedHASensor::toJson(JsonObject& obj) const {
         obj["icon"] = _icon;
     }
 
+    // Expected report interval | 预期上报间隔
+    if (_expectedInterval > 0) {
+        obj["expected_interval"] = _expectedInterval;
+    }
+
     // Current value (if set) | 当前值（如果已设置）
     if (_hasValue) {
         obj["state"] = _value;
@@ -266,7 +276,12 @@ SeeedHADiscovery::SeeedHADiscovery() :
     _haStateCallback(nullptr),
     _debug(false),
     _lastHeartbeat(0),
-    _deviceId("")  // Will be generated in begin() after WiFi init
+    _lastStats(0),
+    _lastHandleMicros(0),
+    _loopTimeSum(0),
+    _loopCount(0),
+    _deviceId(""),  // Will be generated in begin() after WiFi init
+    _powerProfile("")
 {
     // Device ID will be generated in begin() after WiFi is initialized
     // 设备 ID 将在 begin() 中 WiFi 初始化后生成
@@ -315,6 +330,10 @@ void SeeedHADiscovery::setDeviceInfo(const String& name, const String& model, co
     _deviceVersion = version;
 }
 
+void SeeedHADiscovery::setPowerProfile(const String& profile) {
+    _powerProfile = profile;
+}
+
 void SeeedHADiscovery::enableDebug(bool enable) {
     _debug = enable;
 }
@@ -736,6 +755,10 @@ void SeeedHADiscovery::_handleHTTPInfo() {
     doc["ip"] = WiFi.localIP().toString();
     doc["mac"] = WiFi.macAddress();
     doc["rssi"] = WiFi.RSSI();
+    // Power profile lets HA tune liveness detection | 供电类型用于调整 HA 的存活检测
+    if (_powerProfile.length() > 0) {
+        doc["power_profile"] = _powerProfile;
+    }
     // Add connection status - indicates if device is already connected to an HA instance
     // 添加连接状态 - 表示设备是否已连接到某个 HA 实例
     doc["connected"] = _wsClientConnected;
@@ -762,6 +785,11 @@ void SeeedHADiscovery::_handleWSEvent(uint8_t num, WStype_t type, uint8_t* paylo
 
             // Send discovery info to new client | 向新客户端发送发现信息
             _sendDiscovery(num);
+#if SEEED_HA_STATS_INTERVAL > 0
+            // Send health stats right away so HA creates the diagnostic sensors
+            // 立即发送健康统计，让 HA 创建诊断传感器
+            _sendStats(num);
+#endif
             break;
         }
 
@@ -824,38 +852,52 @@ void SeeedHADiscovery::_handleWSEvent(uint8_t num, WStype_t type, uint8_t* paylo
 }
 
 void SeeedHADiscovery::_sendDiscovery(uint8_t clientNum) {
-    // Build discovery message | 构建发现消息
-    JsonDocument doc;
-    doc["type"] = "discovery";
-
-    JsonArray entities = doc["entities"].to<JsonArray>();
-
-    // Add all sensors | 添加所有传感器
-    for (auto sensor : _sensors) {
-        JsonObject obj = entities.add<JsonObject>();
-        sensor->toJson(obj);
-    }
-
-    // Add all switches | 添加所有开关
-    for (auto sw : _switches) {
-        JsonObject obj = entities.add<JsonObject>();
-        sw->toJson(obj);
-    }
+    // Discovery is sent in pages of SEEED_HA_DISCOVERY_PAGE_SIZE entities,
+    // so only one small JSON document is held in memory at a time.
+    // Format: {type: "discovery", page: 0, pages: N, total: M, entities: [...]}
+    // 发现信息按 SEEED_HA_DISCOVERY_PAGE_SIZE 个实体分页发送，
+    // 同一时间只在内存中保留一个较小的 JSON 文档。
+    const size_t total = _sensors.size() + _switches.size();
+    const size_t pageSize = SEEED_HA_DISCOVERY_PAGE_SIZE;
+    const size_t pages = total == 0 ? 1 : (total + pageSize - 1) / pageSize;
+
+    for (size_t page = 0; page < pages; page++) {
+        // Build discovery page | 构建发现消息页
+        JsonDocument doc;
+        doc["type"] = "discovery";
+        doc["page"] = page;
+        doc["pages"] = pages;
+        doc["total"] = total;
+
+        JsonArray entities = doc["entities"].to<JsonArray>();
+
+        // Sensors first, then switches | 先传感器，后开关
+        const size_t first = page * pageSize;
+        const size_t last = min(first + pageSize, total);
+        for (size_t i = first; i < last; i++) {
+            JsonObject obj = entities.add<JsonObject>();
+            if (i < _sensors.size()) {
+                _sensors[i]->toJson(obj);
+            } else {
+                _switches[i - _sensors.size()]->toJson(obj);
+            }
+        }
 
-    // Serialize and send | 序列化并发送
-    String message;
-    serializeJson(doc, message);
+        // Serialize and send | 序列化并发送
+        String message;
+        serializeJson(doc, message);
 
-    if (clientNum == 255) {
-        // Broadcast to all clients | 广播给所有客户端
-        _broadcastMessage(message);
-    } else {
-        // Send to specific client | 发送给指定客户端
-        _wsServer->sendTXT(clientNum, message);
+        if (clientNum == 255) {
+            // Broadcast to all clients | 广播给所有客户端
+            _broadcastMessage(message);
+        } else {
+            // Send to specific client | 发送给指定客户端
+            _wsServer->sendTXT(clientNum, message);
+        }
     }
 
     _log("Sent discovery info: " + String(_sensors.size()) + " sensors, " +
-         String(_switches.size()) + " switches");
+         String(_switches.size()) + " switches in " + String(pages) + " page(s)");
 }
 
 void SeeedHADiscovery::_sendSensorState(const String& sensorId, uint8_t clientNum) {
@@ -896,6 +938,34 @@ void SeeedHADiscovery::_sendSensorState(const String& sensorId, uint8_t clientNu
     _log("Sent state update: " + sensorId + " = " + String(sensor->getValue()));
 }
 
+void SeeedHADiscovery::_sendStats(uint8_t clientNum) {
+    // Health stats let HA chart heap trends and detect reboot loops
+    // 健康统计用于 HA 计算堆内存趋势和检测重启循环
+    _lastStats = millis();
+
+    JsonDocument doc;
+    doc["type"] = "stats";
+    doc["free_heap"] = ESP.getFreeHeap();
+    doc["min_free_heap"] = ESP.getMinFreeHeap();
+    doc["rssi"] = WiFi.RSSI();
+    doc["uptime"] = _lastStats / 1000;
+    // Average loop time in ms | 平均循环耗时（毫秒）
+    if (_loopCount > 0) {
+        doc["loop_time"] = (float)_loopTimeSum / _loopCount / 1000.0f;
+    }
+    _loopTimeSum = 0;
+    _loopCount = 0;
+
+    String message;
+    serializeJson(doc, message);
+
+    if (clientNum == 255) {
+        _broadcastMessage(message);
+    } else {
+        _wsServer->sendTXT(clientNum, message);
+    }
+}
+
 void SeeedHADiscovery::_broadcastMessage(const String& message) {
     // WebSockets library needs non-const reference, so create copy
     // WebSockets 库的 broadcastTXT 需要非 const 引用，所以创建副本
@@ -1134,6 +1204,14 @@ void SeeedHADiscovery::handle() {
         _wsServer->loop();
     }
 
+    // Measure time between handle() calls (the user's loop) | 测量两次 handle() 之间的时间（用户循环）
+    unsigned long nowMicros = micros();
+    if (_lastHandleMicros != 0) {
+        _loopTimeSum += nowMicros - _lastHandleMicros;
+        _loopCount++;
+    }
+    _lastHandleMicros = nowMicros;
+
     // Periodic heartbeat (every 30 seconds) | 定期心跳（每 30 秒）
     unsigned long now = millis();
     if (now - _lastHeartbeat > 30000) {
@@ -1150,6 +1228,13 @@ void SeeedHADiscovery::handle() {
             _broadcastMessage(message);
         }
     }
+
+#if SEEED_HA_STATS_INTERVAL > 0
+    // Periodic health stats | 定期健康统计
+    if (_wsClientConnected && now - _lastStats > SEEED_HA_STATS_INTERVAL) {
+        _sendStats();
+    }
+#endif
 }
 
 bool SeeedHADiscovery::isWiFiConnected() const {
@@ -77,6 +77,18 @@ class SeeedWiFiProvisioning;
 // Maximum number of subscribed HA entities | 最大订阅 HA 实体数量
 #define SEEED_HA_MAX_SUBSCRIBED_ENTITIES 20
 
+// Entities per discovery page (keeps each JSON document small on boards with many entities)
+// 每页发现消息的实体数量（实体较多时避免构建过大的 JSON 文档）
+#ifndef SEEED_HA_DISCOVERY_PAGE_SIZE
+#define SEEED_HA_DISCOVERY_PAGE_SIZE 8
+#endif
+
+// Health stats interval in ms (heap, RSSI, uptime, loop time), 0 disables
+// 健康统计上报间隔（毫秒，堆内存、信号、运行时间、循环耗时），0 表示不上报
+#ifndef SEEED_HA_STATS_INTERVAL
+#define SEEED_HA_STATS_INTERVAL 60000
+#endif
+
 // Default ports | 默认端口
 #define SEEED_HA_HTTP_PORT 80   // HTTP server port (for device info API) | HTTP 服务器端口（用于设备信息接口）
 #define SEEED_HA_WS_PORT 81     // WebSocket port (for real-time communication) | WebSocket 端口（用于实时通信）
@@ -207,6 +219,19 @@ public:
      */
     void setIcon(const String& icon);
 
+    /**
+     * Set expected report interval
+     * 设置预期上报间隔
+     *
+     * If setValue() is not called for twice this interval, Home Assistant marks
+     * the sensor unavailable (e.g. when its I2C bus hangs). 0 disables the check.
+     * 如果超过两倍间隔没有调用 setValue()，Home Assistant 会把传感器标记为不可用
+     * （例如 I2C 总线卡死时）。0 表示不检测。
+     *
+     * @param seconds Expected interval between readings | 两次读数之间的预期间隔（秒）
+     */
+    void setExpectedInterval(uint32_t seconds);
+
     // =========================================================================
     // Getters | 获取方法
     // =========================================================================
@@ -239,6 +264,7 @@ private:
     String _icon;         // Icon | 图标
     float _value;         // Current value | 当前值
     int _precision;       // Display precision | 显示精度
+    uint32_t _expectedInterval;  // Expected report interval (s), 0 = unchecked | 预期上报间隔（秒），0 表示不检测
     bool _hasValue;       // Whether value is set | 是否已设置值
 
     // Associated main class instance | 关联的主类实例
@@ -598,6 +624,21 @@ public:
      */
     void setDeviceInfo(const String& name, const String& model, const String& version = SEEED_HA_DISCOVERY_VERSION);
 
+    /**
+     * Set power profile
+     * 设置供电类型
+     *
+     * Home Assistant tunes how quickly it detects a dropped connection:
+     * mains-powered boards are checked every few seconds, battery boards
+     * are probed rarely. Without it, HA learns from the traffic it sees.
+     * Home Assistant 据此调整检测断线的速度：市电设备每隔几秒检查一次，
+     * 电池设备很少探测。不设置时 HA 根据观察到的流量学习。
+     *
+     * @param profile "mains" or "battery"
+     *                "mains"（市电）或 "battery"（电池）
+     */
+    void setPowerProfile(const String& profile);
+
     /**
      * Enable debug output
      * 启用调试输出
@@ -938,6 +979,7 @@ private:
     String _deviceModel;   // Device model | 设备型号
     String _deviceVersion; // Firmware version | 固件版本
     String _deviceId;      // Device unique ID (based on MAC) | 设备唯一 ID（基于 MAC 地址）
+    String _powerProfile;  // Power profile ("mains" / "battery") | 供电类型
 
     // -------------------------------------------------------------------------
     // Network Services | 网络服务
@@ -972,6 +1014,10 @@ private:
     // -------------------------------------------------------------------------
     bool _debug;                  // Debug mode | 调试模式
     unsigned long _lastHeartbeat; // Last heartbeat time | 上次心跳时间
+    unsigned long _lastStats;     // Last health stats time | 上次健康统计时间
+    unsigned long _lastHandleMicros; // Last handle() call (micros) | 上次调用 handle() 的时间（微秒）
+    unsigned long _loopTimeSum;   // Loop time since last stats (micros) | 上次统计以来的循环耗时（微秒）
+    unsigned long _loopCount;     // Loops since last stats | 上次统计以来的循环次数
 
     // -------------------------------------------------------------------------
     // Internal Methods | 内部方法
@@ -996,8 +1042,8 @@ private:
     // WebSocket event handler | WebSocket 事件处理
     void _handleWSEvent(uint8_t num, WStype_t type, uint8_t* payload, size_t length);
 
-    // Send discovery info (list of supported sensors)
-    // 发送发现信息（设备支持的传感器列表）
+    // Send discovery info (list of supported sensors), split into pages
+    // 发送发现信息（设备支持的传感器列表），分页发送
     void _sendDiscovery(uint8_t clientNum = 255);
 
     // Send sensor state update | 发送传感器状态更新
@@ -1006,6 +1052,10 @@ private:
     // Send switch state update | 发送开关状态更新
     void _sendSwitchState(const String& switchId, uint8_t clientNum = 255);
 
+    // Send health stats (heap, RSSI, uptime, loop time)
+    // 发送健康统计（堆内存、信号、运行时间、循环耗时）
+    void _sendStats(uint8_t clientNum = 255);
+
     // Handle command from HA | 处理来自 HA 的命令消息
     void _handleCommand(JsonDocument& doc);
 
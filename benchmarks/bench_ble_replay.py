@@ -0,0 +1,61 @@
+"""
+BLE 广播回放基准测试
+BLE advertisement replay benchmark.
+
+把抓取文件（或生成的广播）尽快回放到 bluetooth.parse_ble_advertisement，
+报告吞吐量和延迟。回放到运行中的配置入口请在 Home Assistant 中使用
+ble_capture.coordinator_handler。
+Replays a capture file (or generated advertisements) into
+bluetooth.parse_ble_advertisement as fast as possible and reports throughput
+and latency. To replay into a running config entry, use
+ble_capture.coordinator_handler inside Home Assistant.
+
+需要安装 Home Assistant 的开发环境，在仓库根目录运行：
+Needs a Home Assistant development environment; run from the repository root:
+
+    python benchmarks/bench_ble_replay.py [抓取文件 | capture file] [速度 | speed]
+"""
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.seeed_ha_discovery.ble_capture import (  # noqa: E402
+    CaptureRecord,
+    async_replay,
+    read_capture_file,
+)
+from custom_components.seeed_ha_discovery.bluetooth import parse_ble_advertisement  # noqa: E402
+from custom_components.seeed_ha_discovery.const import BTHOME_SERVICE_UUID  # noqa: E402
+
+
+def make_records(count: int = 100000) -> list[CaptureRecord]:
+    """生成温湿度广播，每秒 10 条 | Generate temperature/humidity advertisements, 10 per second"""
+    return [
+        CaptureRecord(
+            timestamp=index / 10,
+            address=f"AA:BB:CC:DD:{index % 8:02X}:01",
+            rssi=-60 - index % 10,
+            name="Seeed Temp",
+            service_data={
+                BTHOME_SERVICE_UUID: bytes.fromhex(f"4000{index % 256:02x}02ca0903bf130164"),
+            },
+        )
+        for index in range(count)
+    ]
+
+
+def main() -> None:
+    """运行基准测试 | Run the benchmark"""
+    records = read_capture_file(sys.argv[1]) if len(sys.argv) > 1 else make_records()
+    speed = float(sys.argv[2]) if len(sys.argv) > 2 else 0
+    stats = asyncio.run(async_replay(records, parse_ble_advertisement, speed))
+    for key, value in stats.summary().items():
+        print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+BTHome 解码基准测试
+BTHome decoder benchmark.
+
+对比预编译表解码器（bluetooth.decode_bthome）和之前的逐对象查字典解析器。
+Compares the precompiled-table decoder (bluetooth.decode_bthome) with the
+previous dict-lookup-per-object parser.
+
+需要安装 Home Assistant 的开发环境，在仓库根目录运行：
+Needs a Home Assistant development environment; run from the repository root:
+
+    python benchmarks/bench_bthome.py
+"""
+from __future__ import annotations
+
+import struct
+import sys
+import timeit
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.seeed_ha_discovery.bluetooth import (  # noqa: E402
+    BTHomeSensorData,
+    decode_bthome,
+)
+from custom_components.seeed_ha_discovery.const import (  # noqa: E402
+    BTHOME_BINARY_SENSOR_TYPES,
+    BTHOME_EVENT_TYPES,
+    BTHOME_SENSOR_TYPES,
+)
+
+# 测试负载 | Test payloads
+PAYLOADS: dict[str, bytes] = {
+    # 温度 + 湿度 + 电池 | Temperature + humidity + battery
+    "temp_humi_battery": bytes.fromhex("40" "02ca09" "03bf13" "0164"),
+    # 按钮事件 | Button event
+    "button": bytes.fromhex("40" "3a01"),
+    # 多种对象 | Many objects
+    "mixed": bytes.fromhex(
+        "40"
+        "02ca09"      # Temperature 25.06
+        "03bf13"      # Humidity 50.55
+        "0164"        # Battery 100
+        "04138a01"    # Pressure 1008.83
+        "05138a14"    # Illuminance
+        "0c020c"      # Voltage 3.074
+        "0b021b00"    # Power
+        "1201f0"      # CO2
+        "2101"        # Motion
+        "45cc00"      # Temperature 20.4
+        "4605"        # UV Index
+    ),
+}
+
+
+# =============================================================================
+# 之前的解析器（仅用于对比）| Previous parser (for comparison only)
+# =============================================================================
+
+def legacy_parse_bthome_data(data: bytes) -> tuple[list[BTHomeSensorData], list[dict[str, Any]], bool, bool]:
+    """之前的 parse_bthome_data | The previous parse_bthome_data"""
+    if len(data) < 1:
+        return [], [], False, False
+
+    sensors: list[BTHomeSensorData] = []
+    events: list[dict[str, Any]] = []
+
+    device_info = data[0]
+    is_v2 = (device_info & 0xE0) == 0x40
+    is_encrypted = bool(device_info & 0x01)
+
+    if is_encrypted or not is_v2:
+        return [], [], is_v2, is_encrypted
+
+    offset = 1
+    while offset < len(data):
+        object_id = data[offset]
+        offset += 1
+
+        sensor_info = None
+        is_event = False
+
+        if object_id in BTHOME_SENSOR_TYPES:
+            sensor_info = BTHOME_SENSOR_TYPES[object_id]
+        elif object_id in BTHOME_BINARY_SENSOR_TYPES:
+            sensor_info = BTHOME_BINARY_SENSOR_TYPES[object_id]
+        elif object_id in BTHOME_EVENT_TYPES:
+            sensor_info = BTHOME_EVENT_TYPES[object_id]
+            is_event = True
+
+        if sensor_info is None:
+            offset += 2
+            continue
+
+        data_size = _legacy_get_data_size(object_id)
+        if offset + data_size > len(data):
+            break
+
+        value_bytes = data[offset:offset + data_size]
+        offset += data_size
+
+        value = _legacy_parse_value(object_id, value_bytes)
+
+        factor = sensor_info.get("factor", 1)
+        if isinstance(value, (int, float)) and factor != 1:
+            value = round(value * factor, 2)
+
+        if is_event:
+            event_name = sensor_info.get("events", {}).get(value, "unknown")
+            events.append({
+                "type": sensor_info["name"],
+                "event": event_name,
+                "value": value,
+            })
+        else:
+            sensors.append(BTHomeSensorData(
+                object_id=object_id,
+                name=sensor_info["name"],
+                value=value,
+                device_class=sensor_info.get("device_class"),
+                unit=sensor_info.get("unit"),
+            ))
+
+    return sensors, events, is_v2, is_encrypted
+
+
+def _legacy_get_data_size(object_id: int) -> int:
+    """之前的 _get_data_size | The previous _get_data_size"""
+    one_byte = {
+        0x01, 0x09, 0x0F, 0x10, 0x11, 0x15, 0x16,
+        0x20, 0x21, 0x2E, 0x2F, 0x3A, 0x46,
+    }
+    three_bytes = {0x04, 0x05, 0x0A, 0x0B, 0x42, 0x4B}
+    four_bytes = {0x3E, 0x4C, 0x4D, 0x4E, 0x4F}
+
+    if object_id in one_byte:
+        return 1
+    elif object_id in three_bytes:
+        return 3
+    elif object_id in four_bytes:
+        return 4
+    else:
+        return 2
+
+
+def _legacy_parse_value(object_id: int, value_bytes: bytes) -> int | float:
+    """之前的 _parse_value | The previous _parse_value"""
+    size = len(value_bytes)
+    signed_types = {0x02, 0x08, 0x3F, 0x45}
+
+    if size == 1:
+        if object_id in signed_types:
+            return struct.unpack("<b", value_bytes)[0]
+        return value_bytes[0]
+    elif size == 2:
+        if object_id in signed_types:
+            return struct.unpack("<h", value_bytes)[0]
+        return struct.unpack("<H", value_bytes)[0]
+    elif size == 3:
+        return value_bytes[0] | (value_bytes[1] << 8) | (value_bytes[2] << 16)
+    elif size == 4:
+        return struct.unpack("<I", value_bytes)[0]
+    else:
+        return 0
+
+
+# =============================================================================
+# 基准测试 | Benchmark
+# =============================================================================
+
+def check_agreement() -> None:
+    """
+    确认两个解析器结果一致（十进制缩放因子小于 0.01 的对象现在保留完整精度）
+    Check both parsers agree (objects with decimal factors below 0.01 now keep
+    full precision).
+    """
+    for name, payload in PAYLOADS.items():
+        legacy_sensors, legacy_events, _, _ = legacy_parse_bthome_data(payload)
+        decoded = decode_bthome(payload)
+        assert len(legacy_sensors) == len(decoded.sensors), name
+        for old, new in zip(legacy_sensors, decoded.sensors):
+            assert (old.object_id, old.name, old.unit) == (new.object_id, new.name, new.unit), name
+            assert abs(old.value - new.value) <= 0.005, (name, old, new)
+        assert legacy_events == decoded.events, name
+
+
+def main() -> None:
+    """运行基准测试 | Run the benchmark"""
+    check_agreement()
+    number = 20000
+    print(f"{'payload':<20} {'legacy µs':>10} {'compiled µs':>12} {'speedup':>8}")
+    for name, payload in PAYLOADS.items():
+        legacy = min(timeit.repeat(
+            lambda: legacy_parse_bthome_data(payload), number=number, repeat=5
+        )) / number * 1e6
+        compiled = min(timeit.repeat(
+            lambda: decode_bthome(payload), number=number, repeat=5
+        )) / number * 1e6
+        print(f"{name:<20} {legacy:>10.2f} {compiled:>12.2f} {legacy / compiled:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
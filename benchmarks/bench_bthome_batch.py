@@ -0,0 +1,111 @@
+"""
+BTHome 批量解码基准测试
+BTHome batch decoder benchmark.
+
+生成几种布局的随机负载，确认 bthome_batch.decode_bthome_batch 与逐条调用
+bluetooth.decode_bthome 的结果完全一致，然后对比两者的速度。
+Generates random payloads in a few layouts, checks that
+bthome_batch.decode_bthome_batch matches calling bluetooth.decode_bthome row by
+row exactly, then compares their speed.
+
+需要安装 Home Assistant 的开发环境和 NumPy，在仓库根目录运行：
+Needs a Home Assistant development environment and NumPy; run from the repository root:
+
+    python benchmarks/bench_bthome_batch.py [行数 | rows]
+"""
+from __future__ import annotations
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.seeed_ha_discovery.bluetooth import decode_bthome  # noqa: E402
+from custom_components.seeed_ha_discovery.bthome_batch import (  # noqa: E402
+    decode_bthome_batch,
+    pack_payloads,
+)
+
+# 布局：[(Object ID, 字节数)] | Layouts: [(object ID, size)]
+LAYOUTS: list[list[tuple[int, int]]] = [
+    # 包 ID + 温度 + 湿度 + 电池 | Packet id + temperature + humidity + battery
+    [(0x00, 1), (0x02, 2), (0x03, 2), (0x01, 1)],
+    # 按钮事件 | Button event
+    [(0x00, 1), (0x3A, 1)],
+    # 多种对象 | Many objects
+    [(0x01, 1), (0x04, 3), (0x05, 3), (0x0C, 2), (0x12, 2), (0x21, 1), (0x45, 2), (0x46, 1), (0x58, 1)],
+    # 调光旋钮 + 重复的温度 | Dimmer + repeated temperature
+    [(0x02, 2), (0x02, 2), (0x3C, 2)],
+]
+
+
+def make_payloads(rows: int, seed: int = 1) -> list[bytes]:
+    """生成随机负载 | Generate random payloads"""
+    rng = random.Random(seed)
+    payloads = []
+    for _ in range(rows):
+        layout = rng.choice(LAYOUTS)
+        payload = bytearray(b"\x40")
+        for object_id, size in layout:
+            payload.append(object_id)
+            payload += rng.randbytes(size)
+        payloads.append(bytes(payload))
+    # 加密和含文本对象的负载（批量解码回退）| Encrypted and text payloads (batch falls back)
+    payloads.append(bytes.fromhex("41a47266c95f730011223378237214"))
+    payloads.append(bytes.fromhex("40" "5302aabb"))
+    return payloads
+
+
+def check_agreement(payloads: list[bytes]) -> None:
+    """确认批量解码与标量解码完全一致 | Check the batch decoder matches the scalar one exactly"""
+    batch = decode_bthome_batch(*pack_payloads(payloads))
+    for row, payload in enumerate(payloads):
+        if not batch.decoded[row]:
+            continue
+        scalar = decode_bthome(payload)
+        assert batch.packet_id[row] == (-1 if scalar.packet_id is None else scalar.packet_id), row
+
+        seen: dict[str, int] = {}
+        expected = {}
+        for sensor in scalar.sensors:
+            key = f"{sensor.object_id:02x}_{sensor.name.lower().replace(' ', '_')}"
+            seen[key] = seen.get(key, 0) + 1
+            expected[key if seen[key] == 1 else f"{key}_{seen[key]}"] = sensor.value
+        got = {
+            key: column[row].item()
+            for key, column in batch.columns.items()
+            if batch.present[key][row]
+        }
+        assert got == expected, (row, got, expected)
+        for key, value in expected.items():
+            assert type(got[key]) is type(value), (row, key)
+
+        events = [(key, codes[row].item()) for key, codes in batch.events.items() if batch.present[key][row]]
+        assert len(events) == len(scalar.events), row
+    print(f"agreement: {int(batch.decoded.sum())} of {len(payloads)} rows decoded in {batch.layouts} layouts")
+
+
+def main() -> None:
+    """运行基准测试 | Run the benchmark"""
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    payloads = make_payloads(rows)
+    check_agreement(payloads[:20000] + payloads[-2:])
+
+    start = time.perf_counter()
+    for payload in payloads:
+        decode_bthome(payload)
+    scalar = time.perf_counter() - start
+
+    matrix, lengths = pack_payloads(payloads)
+    start = time.perf_counter()
+    decode_bthome_batch(matrix, lengths)
+    batch = time.perf_counter() - start
+
+    print(f"scalar: {scalar:.3f} s ({len(payloads) / scalar:,.0f} payloads/s)")
+    print(f"batch:  {batch:.3f} s ({len(payloads) / batch:,.0f} payloads/s), {scalar / batch:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -37,6 +37,8 @@ from typing import Any
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 
 from .const import (
     DOMAIN,
@@ -46,17 +48,34 @@ from .const import (
     CONF_CONNECTION_TYPE,
     CONF_BLE_ADDRESS,
     CONF_SUBSCRIBED_ENTITIES,
+    CONF_AGGREGATION_WINDOWS,
     CONNECTION_TYPE_WIFI,
     CONNECTION_TYPE_BLE,
     DEFAULT_WS_PORT,
 )
 from .coordinator import SeeedHACoordinator
 from .device import SeeedHADevice
+from .services import async_setup_services
 
 # 创建日志记录器
 # Create logger for this module
 _LOGGER = logging.getLogger(__name__)
 
+# 只能通过配置流程添加 | Config entries only
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """
+    设置集成
+    Set up the integration.
+
+    注册 BLE 广播抓取与回放服务。
+    Registers the BLE advertisement capture and replay services.
+    """
+    async_setup_services(hass)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """
@@ -104,6 +123,9 @@ async def _async_setup_wifi_entry(hass: HomeAssistant, entry: ConfigEntry) -> bo
     # 创建设备实例 - 负责与 ESP32 通信
     device = SeeedHADevice(hass, host, port, entry)
 
+    # 应用用户选项中的聚合窗口 | Apply aggregation windows from options
+    device.set_aggregation_windows(entry.options.get(CONF_AGGREGATION_WINDOWS, {}))
+
     # 创建协调器 - 管理数据更新和实体状态
     coordinator = SeeedHACoordinator(hass, device, entry)
 
@@ -149,6 +171,12 @@ async def _async_setup_ble_entry(hass: HomeAssistant, entry: ConfigEntry) -> boo
     1. 被动监听模式 - 传感器数据通过蓝牙广播接收
     2. 主动连接模式 - 通过 GATT 控制设备（如开关）
     """
+    from homeassistant.components.bluetooth import BluetoothScanningMode
+    from homeassistant.components.bluetooth.passive_update_processor import (
+        PassiveBluetoothProcessorCoordinator,
+    )
+
+    from .ble_sensor import SeeedBLEDeviceData
     from .const import CONF_BLE_CONTROL, CONF_BLE_SUBSCRIBED_ENTITIES
 
     ble_address = entry.data[CONF_BLE_ADDRESS]
@@ -171,10 +199,24 @@ async def _async_setup_ble_entry(hass: HomeAssistant, entry: ConfigEntry) -> boo
         _LOGGER.info("Loading switch platform for BLE manager (control=%s, subscribed=%d)", 
                      ble_control, len(ble_subscribed))
 
+    # 被动蓝牙处理器协调器：每条广播只处理一次，再分发给各平台的处理器
+    # Passive Bluetooth processor coordinator: each advertisement is handled once,
+    # then dispatched to the processors of the platforms
+    device_data = SeeedBLEDeviceData(hass, entry)
+    coordinator = PassiveBluetoothProcessorCoordinator(
+        hass,
+        _LOGGER,
+        address=ble_address,
+        mode=BluetoothScanningMode.PASSIVE,
+        update_method=device_data.update,
+    )
+
     # 保存配置和已加载的平台列表（用于卸载时）
     # Save config and list of loaded platforms (for unloading)
     hass.data[DOMAIN][entry.entry_id] = {
         "ble_address": ble_address,
+        "ble_coordinator": coordinator,
+        "ble_device_data": device_data,
         "connection_type": CONNECTION_TYPE_BLE,
         "ble_control": ble_control or bool(ble_subscribed),
         "loaded_platforms": platforms,  # Record actually loaded platforms | 记录实际加载的平台
@@ -182,6 +224,9 @@ async def _async_setup_ble_entry(hass: HomeAssistant, entry: ConfigEntry) -> boo
 
     await hass.config_entries.async_forward_entry_setups(entry, platforms)
 
+    # 处理器注册完成后再开始监听广播 | Start listening once the processors are registered
+    entry.async_on_unload(coordinator.async_start())
+
     # 注册配置更新监听器
     entry.async_on_unload(entry.add_update_listener(async_update_options))
 
@@ -278,6 +323,7 @@ async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
         subscribed_entities = entry.options.get(CONF_SUBSCRIBED_ENTITIES, [])
         await device.async_setup_entity_subscription(subscribed_entities)
         _LOGGER.info("Updated entity subscription: %d entities", len(subscribed_entities))
+        device.set_aggregation_windows(entry.options.get(CONF_AGGREGATION_WINDOWS, {}))
 
     # BLE 设备的重载由 config_flow 的 delayed_reload 处理，这里不重复重载
     # BLE device reload is handled by config_flow's delayed_reload, don't reload here
@@ -0,0 +1,497 @@
+"""
+Seeed HA Discovery - BLE 广播抓取与回放
+Seeed HA Discovery - BLE advertisement capture and replay.
+
+现场问题往往只在特定的广播序列下出现。这个模块：
+Field issues often only show up with a particular sequence of advertisements. This module:
+1. 定义紧凑的二进制抓取格式（时间戳、地址、RSSI、名称、Service Data、Manufacturer Data）
+   Defines a compact binary capture format (timestamp, address, RSSI, name,
+   service data, manufacturer data)
+2. 在 Home Assistant 中抓取指定设备（或全部）的广播
+   Captures the advertisements of one device (or all) in Home Assistant
+3. 不需要无线电，按原速或加速把抓取的广播送入 BLE 接入路径
+   （去重、解密、解码、按钮事件、处理器和实体），并报告吞吐量和延迟
+   Replays captures into the BLE ingest path (de-duplication, decryption,
+   decoding, button events, processor and entities) at real or accelerated
+   speed without a radio, and reports throughput and latency
+
+文件格式（小端）| File format (little-endian):
+    文件头 | Header   b"SBLC" + 版本 | version (u8)
+    每条记录 | Record  时间戳 | timestamp (f64, 秒 | seconds)
+                      地址 | address (6 bytes)
+                      RSSI (i8)
+                      名称长度 | name length (u8)
+                      Service Data 个数 | service data count (u8)
+                      Manufacturer Data 个数 | manufacturer data count (u8)
+                      名称 | name (UTF-8)
+                      每个 Service Data | each service data:
+                          UUID 长度 | UUID length (u8, 2 = 16 位 UUID | 16-bit UUID, 16 = 完整 | full)
+                          UUID, 数据长度 | data length (u8), 数据 | data
+                      每个 Manufacturer Data | each manufacturer data:
+                          公司 ID | company ID (u16), 数据长度 | data length (u8), 数据 | data
+
+在 Home Assistant 中通过服务使用 | In Home Assistant, use the services:
+    seeed_ha_discovery.start_capture / stop_capture / replay（见 services.py | see services.py）
+
+用法 | Usage:
+    recorder = BLECaptureRecorder(hass, "/config/ble.sblc", address)
+    recorder.async_start()
+    ...
+    await recorder.async_stop()
+
+    stats = await async_replay(read_capture_file(path), coordinator_handler(hass, entry_id), speed=10)
+"""
+from __future__ import annotations
+
+import asyncio
+import struct
+import time
+import uuid
+from datetime import datetime, timedelta
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO
+
+from home_assistant_bluetooth import BluetoothServiceInfoBleak
+from homeassistant.components import bluetooth
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import DOMAIN
+
+# 文件头 | File header
+CAPTURE_MAGIC = b"SBLC"
+CAPTURE_VERSION = 1
+
+_HEADER = struct.Struct("<4sB")
+_RECORD = struct.Struct("<d6sbBBB")
+_MANUFACTURER = struct.Struct("<HB")
+
+# 抓取时每这么多条记录或每这么多秒写入一次文件，内存占用有上限
+# While capturing, the file is written every this many records or seconds,
+# so memory use stays bounded
+CAPTURE_FLUSH_RECORDS = 1000
+CAPTURE_FLUSH_INTERVAL = 10
+
+# 蓝牙基础 UUID，16 位 UUID 只保存 2 字节
+# Bluetooth base UUID; 16-bit UUIDs are stored in 2 bytes
+_BASE_UUID_SUFFIX = "-0000-1000-8000-00805f9b34fb"
+
+
+@dataclass(slots=True)
+class CaptureRecord:
+    """
+    一条抓取的广播
+    One captured advertisement.
+    """
+    # 抓取时间（秒，单调时钟）| Capture time (seconds, monotonic clock)
+    timestamp: float
+    address: str
+    rssi: int
+    name: str = ""
+    service_data: dict[str, bytes] = field(default_factory=dict)
+    manufacturer_data: dict[int, bytes] = field(default_factory=dict)
+
+    def to_service_info(self) -> BluetoothServiceInfoBleak:
+        """
+        转换为蓝牙服务信息，供 BLE 接入路径使用
+        Convert to Bluetooth service info for the BLE ingest path.
+
+        time 取自抓取的时间戳，回放的结果与回放速度无关；没有无线电，
+        所以 device 和 advertisement 为 None。
+        time is the captured timestamp, so the replay result does not depend on
+        the replay speed; there is no radio, so device and advertisement are None.
+        """
+        return BluetoothServiceInfoBleak(
+            name=self.name,
+            address=self.address,
+            rssi=self.rssi,
+            manufacturer_data=self.manufacturer_data,
+            service_data=self.service_data,
+            service_uuids=list(self.service_data),
+            source="replay",
+            device=None,
+            advertisement=None,
+            connectable=False,
+            time=self.timestamp,
+            tx_power=None,
+        )
+
+
+def _encode_uuid(value: str) -> bytes:
+    """
+    编码 UUID：基础 UUID 上的 16 位 UUID 用 2 字节
+    Encode a UUID: 16-bit UUIDs on the base UUID take 2 bytes.
+    """
+    value = value.lower()
+    if value.startswith("0000") and value.endswith(_BASE_UUID_SUFFIX):
+        return bytes.fromhex(value[4:8])
+    return uuid.UUID(value).bytes
+
+
+def _decode_uuid(raw: bytes) -> str:
+    """
+    解码 UUID
+    Decode a UUID.
+    """
+    if len(raw) == 2:
+        return f"0000{raw.hex()}{_BASE_UUID_SUFFIX}"
+    return str(uuid.UUID(bytes=raw))
+
+
+def encode_record(record: CaptureRecord) -> bytes:
+    """
+    编码一条记录
+    Encode one record.
+    """
+    name = record.name.encode()[:255]
+    parts = [
+        _RECORD.pack(
+            record.timestamp,
+            bytes.fromhex(record.address.replace(":", "")),
+            max(-128, min(127, record.rssi)),
+            len(name),
+            len(record.service_data),
+            len(record.manufacturer_data),
+        ),
+        name,
+    ]
+    for service_uuid, data in record.service_data.items():
+        raw_uuid = _encode_uuid(service_uuid)
+        parts += (bytes((len(raw_uuid),)), raw_uuid, bytes((len(data),)), data)
+    for company_id, data in record.manufacturer_data.items():
+        parts += (_MANUFACTURER.pack(company_id, len(data)), data)
+    return b"".join(parts)
+
+
+def write_capture(fileobj: BinaryIO, records: Iterable[CaptureRecord]) -> int:
+    """
+    写入抓取文件
+    Write a capture file.
+
+    参数 | Args:
+        fileobj: 以二进制模式打开的文件 | File opened in binary mode
+        records: 要写入的记录 | Records to write
+
+    返回 | Returns:
+        int: 写入的记录数 | Records written
+    """
+    fileobj.write(_HEADER.pack(CAPTURE_MAGIC, CAPTURE_VERSION))
+    count = 0
+    for record in records:
+        fileobj.write(encode_record(record))
+        count += 1
+    return count
+
+
+def read_capture(fileobj: BinaryIO) -> Iterator[CaptureRecord]:
+    """
+    读取抓取文件
+    Read a capture file.
+
+    参数 | Args:
+        fileobj: 以二进制模式打开的文件 | File opened in binary mode
+
+    返回 | Returns:
+        Iterator: 按顺序返回记录；文件末尾不完整的记录被忽略
+                  Records in order; an incomplete record at the end is ignored
+
+    异常 | Raises:
+        ValueError: 不是抓取文件或版本不支持 | Not a capture file or unsupported version
+    """
+    data = fileobj.read()
+    if len(data) < _HEADER.size:
+        raise ValueError("Not a BLE capture file")
+    magic, version = _HEADER.unpack_from(data)
+    if magic != CAPTURE_MAGIC or version != CAPTURE_VERSION:
+        raise ValueError(f"Unsupported BLE capture file: {magic!r} v{version}")
+
+    offset = _HEADER.size
+    end = len(data)
+    try:
+        while offset < end:
+            timestamp, address, rssi, name_len, service_count, manufacturer_count = (
+                _RECORD.unpack_from(data, offset)
+            )
+            offset += _RECORD.size
+            name = data[offset:offset + name_len].decode(errors="replace")
+            offset += name_len
+
+            service_data: dict[str, bytes] = {}
+            for _ in range(service_count):
+                uuid_len = data[offset]
+                service_uuid = _decode_uuid(data[offset + 1:offset + 1 + uuid_len])
+                offset += 1 + uuid_len
+                data_len = data[offset]
+                service_data[service_uuid] = data[offset + 1:offset + 1 + data_len]
+                offset += 1 + data_len
+
+            manufacturer_data: dict[int, bytes] = {}
+            for _ in range(manufacturer_count):
+                company_id, data_len = _MANUFACTURER.unpack_from(data, offset)
+                offset += _MANUFACTURER.size
+                manufacturer_data[company_id] = data[offset:offset + data_len]
+                offset += data_len
+
+            if offset > end:
+                return
+            yield CaptureRecord(
+                timestamp=timestamp,
+                address=":".join(f"{byte:02X}" for byte in address),
+                rssi=rssi,
+                name=name,
+                service_data=service_data,
+                manufacturer_data=manufacturer_data,
+            )
+    except (struct.error, IndexError, ValueError):
+        # 文件末尾被截断（例如抓取时断电）| Truncated at the end (e.g. power lost while capturing)
+        return
+
+
+def read_capture_file(path: str) -> list[CaptureRecord]:
+    """
+    读取抓取文件的所有记录（阻塞，在 executor 中调用）
+    Read all records of a capture file (blocking, call from an executor).
+    """
+    with open(path, "rb") as fileobj:
+        return list(read_capture(fileobj))
+
+
+class BLECaptureRecorder:
+    """
+    在 Home Assistant 中抓取 BLE 广播
+    Capture BLE advertisements in Home Assistant.
+
+    记录先在内存中编码，每 CAPTURE_FLUSH_RECORDS 条或每 CAPTURE_FLUSH_INTERVAL 秒
+    在 executor 中追加到文件，同一时间只有一次写入，保证顺序。
+    Records are encoded in memory and appended to the file in an executor every
+    CAPTURE_FLUSH_RECORDS records or CAPTURE_FLUSH_INTERVAL seconds; only one
+    write runs at a time, so the order is kept.
+    """
+
+    def __init__(self, hass: HomeAssistant, path: str, address: str | None = None) -> None:
+        """
+        初始化抓取
+        Initialize the capture.
+
+        参数 | Args:
+            hass: Home Assistant 实例
+            path: 抓取文件路径 | Capture file path
+            address: 只抓取这个地址，None 表示全部 | Only capture this address, None for all
+        """
+        self._hass = hass
+        self._path = path
+        self._address = address
+        self._buffer = bytearray(_HEADER.pack(CAPTURE_MAGIC, CAPTURE_VERSION))
+        # 第一次写入创建文件，之后追加 | The first write creates the file, later ones append
+        self._mode = "wb"
+        self._pending = 0
+        self._writing: asyncio.Future | None = None
+        self._unsubscribe: Callable[[], None] | None = None
+        self._unsubscribe_timer: Callable[[], None] | None = None
+        self.records = 0
+
+    @callback
+    def async_start(self) -> None:
+        """
+        开始抓取
+        Start capturing.
+        """
+        matcher = bluetooth.BluetoothCallbackMatcher(connectable=False)
+        if self._address:
+            matcher["address"] = self._address
+        self._unsubscribe = bluetooth.async_register_callback(
+            self._hass,
+            self._async_on_advertisement,
+            matcher,
+            bluetooth.BluetoothScanningMode.PASSIVE,
+        )
+        self._unsubscribe_timer = async_track_time_interval(
+            self._hass, self._async_on_timer, timedelta(seconds=CAPTURE_FLUSH_INTERVAL)
+        )
+
+    @callback
+    def _async_on_advertisement(
+        self,
+        service_info: bluetooth.BluetoothServiceInfoBleak,
+        change: bluetooth.BluetoothChange,
+    ) -> None:
+        """
+        记录一条广播
+        Record one advertisement.
+        """
+        self._buffer += encode_record(CaptureRecord(
+            timestamp=service_info.time,
+            address=service_info.address,
+            rssi=service_info.rssi,
+            name=service_info.name or "",
+            service_data=service_info.service_data,
+            manufacturer_data=service_info.manufacturer_data,
+        ))
+        self.records += 1
+        self._pending += 1
+        if self._pending >= CAPTURE_FLUSH_RECORDS:
+            self._async_flush()
+
+    @callback
+    def _async_on_timer(self, now: datetime) -> None:
+        """
+        定时写入 | Periodic write
+        """
+        self._async_flush()
+
+    @callback
+    def _async_flush(self) -> asyncio.Future | None:
+        """
+        把缓冲区交给 executor 写入；上一次写入未完成时等下一次
+        Hand the buffer to the executor; if the previous write is still running,
+        wait for the next flush.
+
+        返回 | Returns:
+            Future: 本次写入，没有开始写入时为 None | This write, None if none was started
+        """
+        if not self._buffer or (self._writing is not None and not self._writing.done()):
+            return None
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        self._pending = 0
+        self._writing = self._hass.async_add_executor_job(self._write, data, self._mode)
+        self._mode = "ab"
+        return self._writing
+
+    async def async_stop(self) -> int:
+        """
+        停止抓取并写入剩余的记录
+        Stop capturing and write the remaining records.
+
+        返回 | Returns:
+            int: 抓取的记录数 | Records captured
+        """
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+        if self._unsubscribe_timer is not None:
+            self._unsubscribe_timer()
+            self._unsubscribe_timer = None
+        if self._writing is not None:
+            await self._writing
+        if (writing := self._async_flush()) is not None:
+            await writing
+        return self.records
+
+    def _write(self, data: bytes, mode: str) -> None:
+        """
+        写入文件（executor）| Write the file (executor)
+        """
+        with open(self._path, mode) as fileobj:
+            fileobj.write(data)
+
+
+@dataclass(slots=True)
+class ReplayStats:
+    """
+    回放统计
+    Replay statistics.
+    """
+    records: int = 0
+    # 回放总时长（秒）| Total replay time (seconds)
+    duration: float = 0.0
+    # 每条记录的处理耗时（秒）| Handling time of each record (seconds)
+    latencies: list[float] = field(default_factory=list)
+    # 相对计划时间的延后（秒）| Delay relative to the scheduled time (seconds)
+    max_lag: float = 0.0
+    total_lag: float = 0.0
+
+    def summary(self) -> dict[str, float]:
+        """
+        返回吞吐量和延迟摘要（延迟单位毫秒）
+        Return a throughput and latency summary (latencies in milliseconds).
+        """
+        latencies = sorted(self.latencies)
+
+        def percentile(fraction: float) -> float:
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] * 1000
+
+        return {
+            "records": self.records,
+            "duration": round(self.duration, 3),
+            "throughput": round(self.records / self.duration, 1) if self.duration else 0.0,
+            "latency_p50": round(percentile(0.50), 3),
+            "latency_p95": round(percentile(0.95), 3),
+            "latency_p99": round(percentile(0.99), 3),
+            "latency_max": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+            "lag_mean": round(self.total_lag / self.records * 1000, 3) if self.records else 0.0,
+            "lag_max": round(self.max_lag * 1000, 3),
+        }
+
+
+async def async_replay(
+    records: Iterable[CaptureRecord],
+    handler: Callable[[BluetoothServiceInfoBleak], Any],
+    speed: float = 1.0,
+) -> ReplayStats:
+    """
+    回放抓取的广播
+    Replay captured advertisements.
+
+    参数 | Args:
+        records: 抓取的记录 | Captured records
+        handler: 接收每条广播的函数（同步执行完整的接入路径）
+                 Function receiving each advertisement (runs the whole ingest path synchronously)
+        speed: 回放速度倍数，1 为原速，0 为尽快回放
+               Replay speed multiplier, 1 for real time, 0 for as fast as possible
+
+    返回 | Returns:
+        ReplayStats: 吞吐量和延迟统计 | Throughput and latency statistics
+    """
+    stats = ReplayStats()
+    perf = time.perf_counter
+    start = perf()
+    first: float | None = None
+
+    for record in records:
+        service_info = record.to_service_info()
+        if speed > 0:
+            if first is None:
+                first = record.timestamp
+            due = start + (record.timestamp - first) / speed
+            if (delay := due - perf()) > 0:
+                await asyncio.sleep(delay)
+            lag = max(0.0, perf() - due)
+            stats.total_lag += lag
+            stats.max_lag = max(stats.max_lag, lag)
+
+        began = perf()
+        handler(service_info)
+        stats.latencies.append(perf() - began)
+        stats.records += 1
+
+    stats.duration = perf() - start
+    return stats
+
+
+def coordinator_handler(hass: HomeAssistant, entry_id: str) -> Callable[[BluetoothServiceInfoBleak], Any]:
+    """
+    返回把广播送入配置入口的 BLE 接入路径的函数
+    Return a function feeding advertisements into the BLE ingest path of a config entry.
+
+    与无线电收到广播时相同：协调器的更新方法（去重、解密、解码、按钮事件），
+    再由传感器处理器更新实体。只使用公开接口，不经过协调器的内部方法，
+    所以协调器的可用性不受回放影响。
+    Same as a radio advertisement: the coordinator's update method
+    (de-duplication, decryption, decoding, button events), then the sensor
+    processor updates the entities. Only public interfaces are used, not the
+    coordinator's internals, so the coordinator's availability is not affected
+    by a replay.
+    """
+    data = hass.data[DOMAIN][entry_id]
+    device_data = data["ble_device_data"]
+    processor = data["ble_processor"]
+
+    @callback
+    def _handle(service_info: BluetoothServiceInfoBleak) -> None:
+        processor.async_handle_update(device_data.update(service_info))
+
+    return _handle
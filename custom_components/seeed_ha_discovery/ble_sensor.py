@@ -4,24 +4,51 @@ Seeed HA Discovery - BLE sensor entities.
 
 这个文件负责：
 This file is responsible for:
-1. 创建和管理 BLE 设备的传感器实体
-   Create and manage BLE device sensor entities
-2. 接收蓝牙广播数据更新
-   Receive Bluetooth broadcast data updates
-3. 解析 BTHome 格式数据并更新传感器状态
-   Parse BTHome format data and update sensor state
+1. 把蓝牙广播转换为一次数据更新（PassiveBluetoothDataUpdate），
+   由被动蓝牙处理器一次性应用到设备的所有传感器实体
+   Turn a Bluetooth advertisement into one data update (PassiveBluetoothDataUpdate)
+   that the passive Bluetooth processor applies to all sensor entities of the device in one pass
+2. 首次出现的传感器自动创建实体
+   Create entities for sensors the first time they appear
+3. 重复的广播在解析前丢弃，按钮事件不会重复触发
+   Repeated advertisements are dropped before parsing, so button events never fire twice
+4. 只在值变化时写入状态；值不变时每隔 max age 重新写入一次，使 last_reported 保持有效
+   States are written only when the value changes; an unchanged value is re-written
+   once per max age so last_reported stays meaningful
+5. 可用性由处理器协调器根据广播间隔判断，不需要每个传感器单独记录
+   Availability is derived by the processor coordinator from advertisement gaps,
+   without per-sensor bookkeeping
+6. 处理器带实体描述类注册，由 Home Assistant 保存出现过的对象和最近的值，
+   设置时直接创建实体并恢复值
+   The processor registers with an entity description class, so Home Assistant
+   persists the objects seen and their last values, and entities are created
+   and restored at setup
+7. 配置了绑定密钥时解密加密的 BTHome 广播，重放的包在解密前被拒绝
+   Encrypted BTHome advertisements are decrypted when a bind key is configured,
+   and replayed packets are rejected before decryption
+8. 链路质量诊断传感器（平滑的 RSSI、广播间隔、丢包率）每条广播 O(1) 更新，
+   但只按固定间隔写入状态
+   Link quality diagnostic sensors (smoothed RSSI, advertisement interval, packet
+   loss) are updated in O(1) per advertisement but written at a fixed interval
+
+数据流程 | Data flow:
+    蓝牙广播 -> PassiveBluetoothProcessorCoordinator -> SeeedBLEDeviceData.update
+    -> 需要写入的传感器 -> SeeedBLEDeviceData.to_data_update -> 处理器 -> 实体
+    Advertisement -> PassiveBluetoothProcessorCoordinator -> SeeedBLEDeviceData.update
+    -> sensors to write -> SeeedBLEDeviceData.to_data_update -> processor -> entities
 """
 from __future__ import annotations
 
 import logging
+from datetime import datetime, timedelta
 from typing import Any
 
-from homeassistant.components import bluetooth
-from homeassistant.components.bluetooth import (
-    BluetoothServiceInfoBleak,
-    async_register_callback,
-    BluetoothChange,
-    BluetoothCallbackMatcher,
+from homeassistant.components.bluetooth import BluetoothServiceInfoBleak
+from homeassistant.components.bluetooth.passive_update_processor import (
+    PassiveBluetoothDataProcessor,
+    PassiveBluetoothDataUpdate,
+    PassiveBluetoothEntityKey,
+    PassiveBluetoothProcessorEntity,
 )
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -30,22 +57,348 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import (
+    PERCENTAGE,
+    SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
+    EntityCategory,
+    UnitOfTime,
+)
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_time_interval
 
 from .const import (
     DOMAIN,
     MANUFACTURER,
     CONF_BLE_ADDRESS,
+    CONF_BLE_BIND_KEY,
+    CONF_BLE_MAX_AGE,
     CONF_DEVICE_ID,
     CONF_MODEL,
     BTHOME_SERVICE_UUID,
+    BLE_LINK_UPDATE_INTERVAL,
+    DEFAULT_BLE_MAX_AGE,
+    SEEED_MANUFACTURER_ID,
 )
-from .bluetooth import parse_ble_advertisement, BTHomeSensorData
+from .bluetooth import (
+    BTHOME_DEVICE_INFO_ENCRYPT,
+    AdvertisementCache,
+    BTHomeDecryptor,
+    BTHomeSensorData,
+    LinkQuality,
+    bthome_packet_id,
+    decode_bthome,
+)
+from .seeed_payload import SeeedPayloadDecoder, seeed_payload_sequence
 
 _LOGGER = logging.getLogger(__name__)
 
+# 链路质量诊断传感器 | Link quality diagnostic sensors
+LINK_SENSORS: tuple[SensorEntityDescription, ...] = (
+    SensorEntityDescription(
+        key="rssi",
+        name="Signal Strength",
+        device_class=SensorDeviceClass.SIGNAL_STRENGTH,
+        native_unit_of_measurement=SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+    ),
+    SensorEntityDescription(
+        key="advertisement_interval",
+        name="Advertisement Interval",
+        icon="mdi:timer-outline",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+    ),
+    SensorEntityDescription(
+        key="packet_loss",
+        name="Packet Loss",
+        icon="mdi:lan-disconnect",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+    ),
+)
+
+
+class StateWriteStats:
+    """
+    BLE 传感器状态写入统计
+    BLE sensor state write statistics.
+    """
+
+    def __init__(self, max_age: float) -> None:
+        """
+        初始化统计
+        Initialize statistics.
+
+        参数 | Args:
+            max_age: 值不变时重新写入的间隔（秒），0 表示不重新写入
+                     Re-write interval of an unchanged value in seconds, 0 disables it
+        """
+        self.max_age = max_age
+        # 值变化而写入的次数 | Writes caused by a changed value
+        self.written = 0
+        # 值不变、到期重新写入的次数 | Re-writes of an unchanged value after max age
+        self.refreshed = 0
+        # 值不变而跳过的次数 | Updates skipped because the value did not change
+        self.suppressed = 0
+
+    def stats(self) -> dict[str, float]:
+        """
+        返回写入统计（用于诊断）
+        Return write statistics (for diagnostics).
+        """
+        return {
+            "max_age": self.max_age,
+            "written": self.written,
+            "refreshed": self.refreshed,
+            "suppressed": self.suppressed,
+        }
+
+
+class SeeedBLEDeviceData:
+    """
+    BLE 设备数据
+    BLE device data.
+
+    update() 是处理器协调器的更新方法：去重、解码、触发按钮事件，并返回需要写入的传感器；
+    to_data_update() 是处理器的更新方法：把这些传感器转换为一次 PassiveBluetoothDataUpdate。
+    update() is the processor coordinator's update method: it de-duplicates, decodes,
+    fires button events and returns the sensors to write; to_data_update() is the
+    processor's update method: it turns those sensors into one PassiveBluetoothDataUpdate.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """
+        初始化设备数据
+        Initialize device data.
+
+        参数 | Args:
+            hass: Home Assistant 实例
+            entry: 配置入口
+        """
+        self._hass = hass
+        self.address = entry.data[CONF_BLE_ADDRESS]
+        self.device_id = entry.data.get(
+            CONF_DEVICE_ID, f"ble_{self.address.replace(':', '_').lower()}"
+        )
+        self.device_name = entry.title
+        self.device_info = DeviceInfo(
+            identifiers={(DOMAIN, self.device_id)},
+            name=self.device_name,
+            manufacturer=MANUFACTURER,
+            model=entry.data.get(CONF_MODEL, "XIAO BLE"),
+        )
+
+        # 广播去重缓存 | Advertisement de-duplication cache
+        self.cache = AdvertisementCache()
+        # 解密器（配置了绑定密钥时），AES-CCM 上下文只构建一次
+        # Decryptor (with a bind key), the AES-CCM context is built once
+        self.decryptor: BTHomeDecryptor | None = None
+        if bind_key := entry.data.get(CONF_BLE_BIND_KEY):
+            self.decryptor = BTHomeDecryptor(self.address, bytes.fromhex(bind_key))
+        # Seeed 紧凑负载的去重缓存（按序号）和解码器（保存关键帧）
+        # De-duplication cache (by sequence) and decoder (keeps keyframes) of the compact Seeed payload
+        self.seeed_cache = AdvertisementCache(seeed_payload_sequence)
+        self.seeed_decoder = SeeedPayloadDecoder()
+        # 链路质量 | Link quality
+        self.link = LinkQuality()
+        # 状态写入统计 | State write statistics
+        self.write_stats = StateWriteStats(
+            entry.options.get(CONF_BLE_MAX_AGE, DEFAULT_BLE_MAX_AGE)
+        )
+        # {传感器 key: (最近写入的数据, 写入时间)} | {sensor key: (last written data, write time)}
+        self._written: dict[str, tuple[BTHomeSensorData, float]] = {}
+        # {传感器 key: 实体描述} | {sensor key: entity description}
+        self._descriptions: dict[str, SensorEntityDescription] = {}
+
+    @callback
+    def update(self, service_info: BluetoothServiceInfoBleak) -> dict[str, BTHomeSensorData]:
+        """
+        处理一条广播，返回需要写入的传感器
+        Handle one advertisement and return the sensors to write.
+
+        参数 | Args:
+            service_info: 蓝牙服务信息 | Bluetooth service info
+
+        返回 | Returns:
+            dict: {传感器 key: 传感器数据}，只包含值变化或超过 max age 的传感器
+                  {sensor key: sensor data}, only sensors that changed or passed max age
+        """
+        # 使用广播自带的时间（单调时钟），回放时与原速无关，结果可复现
+        # Use the advertisement's own time (monotonic clock) so a replay is
+        # deterministic regardless of its speed
+        now = service_info.time
+        # 每条广播都计入 RSSI 和广播间隔 | Every advertisement counts towards RSSI and interval
+        self.link.observe(service_info.rssi, now)
+
+        bthome_data = service_info.service_data.get(BTHOME_SERVICE_UUID)
+        if bthome_data is None:
+            return self._update_seeed(service_info, now)
+
+        # 丢弃重复的广播（不解析），只重新写入到期的值
+        # Drop repeated advertisements (without parsing), only re-write expired values
+        if self.cache.is_duplicate(service_info.address, bthome_data):
+            return self._expired(now)
+
+        # 加密的广播：先检查重放再解密 | Encrypted advertisement: check for replay, then decrypt
+        if bthome_data and bthome_data[0] & BTHOME_DEVICE_INFO_ENCRYPT:
+            if self.decryptor is None:
+                return {}
+            if (bthome_data := self.decryptor.decrypt(bthome_data)) is None:
+                return {}
+
+        self.link.observe_packet(bthome_packet_id(bthome_data))
+        payload = decode_bthome(bthome_data)
+        if payload.events:
+            self._fire_events(payload.events)
+        return self._changed(payload.sensors, now)
+
+    def _update_seeed(
+        self, service_info: BluetoothServiceInfoBleak, now: float
+    ) -> dict[str, BTHomeSensorData]:
+        """
+        处理 Manufacturer Data 中的 Seeed 紧凑负载
+        Handle the compact Seeed payload in the manufacturer data.
+        """
+        seeed_data = service_info.manufacturer_data.get(SEEED_MANUFACTURER_ID)
+        if seeed_data is None:
+            return {}
+
+        if self.seeed_cache.is_duplicate(service_info.address, seeed_data):
+            return self._expired(now)
+        if (sensors := self.seeed_decoder.decode(seeed_data)) is None:
+            return {}
+        self.link.observe_packet(seeed_payload_sequence(seeed_data))
+        return self._changed(sensors, now)
+
+    def _changed(self, sensors: list[BTHomeSensorData], now: float) -> dict[str, BTHomeSensorData]:
+        """
+        返回值变化或超过 max age 的传感器
+        Return the sensors that changed or passed max age.
+        """
+        stats = self.write_stats
+        to_write: dict[str, BTHomeSensorData] = {}
+        for sensor_data in sensors:
+            sensor_key = f"{sensor_data.object_id:02x}_{sensor_data.name.lower().replace(' ', '_')}"
+            last = self._written.get(sensor_key)
+            if last is None or last[0].value != sensor_data.value:
+                stats.written += 1
+            elif stats.max_age and now - last[1] >= stats.max_age:
+                stats.refreshed += 1
+            else:
+                stats.suppressed += 1
+                continue
+            self._written[sensor_key] = (sensor_data, now)
+            to_write[sensor_key] = sensor_data
+        return to_write
+
+    def _expired(self, now: float) -> dict[str, BTHomeSensorData]:
+        """
+        返回超过 max age 的传感器并更新写入时间
+        Return sensors past max age and update their write time.
+        """
+        stats = self.write_stats
+        expired: dict[str, BTHomeSensorData] = {}
+        for sensor_key, (sensor_data, written) in self._written.items():
+            if stats.max_age and now - written >= stats.max_age:
+                expired[sensor_key] = sensor_data
+            else:
+                stats.suppressed += 1
+        for sensor_key, sensor_data in expired.items():
+            self._written[sensor_key] = (sensor_data, now)
+        stats.refreshed += len(expired)
+        return expired
+
+    def _fire_events(self, events: list[dict[str, Any]]) -> None:
+        """
+        触发按钮事件
+        Fire button events.
+        """
+        for event_data in events:
+            # 收到 BLE 事件 | Received BLE event
+            _LOGGER.info(
+                "Received BLE event: %s - %s",
+                event_data.get("type"),
+                event_data.get("event"),
+            )
+            # 触发 Home Assistant 事件
+            self._hass.bus.async_fire(
+                f"{DOMAIN}_button_event",
+                {
+                    "device_id": self.device_id,
+                    "device_name": self.device_name,
+                    "address": self.address,
+                    "event_type": event_data.get("type"),
+                    "event": event_data.get("event"),
+                    "value": event_data.get("value"),
+                },
+            )
+
+    def to_data_update(self, sensors: dict[str, BTHomeSensorData]) -> PassiveBluetoothDataUpdate:
+        """
+        把需要写入的传感器转换为一次数据更新
+        Turn the sensors to write into one data update.
+
+        参数 | Args:
+            sensors: update() 的返回值 | Return value of update()
+
+        返回 | Returns:
+            PassiveBluetoothDataUpdate: 只包含这些传感器的实体数据，处理器只通知对应的实体
+                                        Entity data of these sensors only; the processor
+                                        notifies just those entities
+        """
+        entity_descriptions: dict[PassiveBluetoothEntityKey, SensorEntityDescription] = {}
+        entity_names: dict[PassiveBluetoothEntityKey, str | None] = {}
+        entity_data: dict[PassiveBluetoothEntityKey, Any] = {}
+        for sensor_key, sensor_data in sensors.items():
+            entity_key = PassiveBluetoothEntityKey(sensor_key, None)
+            entity_descriptions[entity_key] = self._description(sensor_key, sensor_data)
+            entity_names[entity_key] = sensor_data.name
+            entity_data[entity_key] = sensor_data.value
+        return PassiveBluetoothDataUpdate(
+            devices={None: self.device_info},
+            entity_descriptions=entity_descriptions,
+            entity_names=entity_names,
+            entity_data=entity_data,
+        )
+
+    def _description(self, sensor_key: str, sensor_data: BTHomeSensorData) -> SensorEntityDescription:
+        """
+        返回传感器的实体描述（按 key 缓存）
+        Return the entity description of a sensor (cached per key).
+        """
+        if (description := self._descriptions.get(sensor_key)) is not None:
+            return description
+
+        # 设置设备类别 | Set device class
+        device_class = None
+        if sensor_data.device_class:
+            try:
+                device_class = SensorDeviceClass(sensor_data.device_class)
+            except ValueError:
+                _LOGGER.warning("Unknown device class: %s", sensor_data.device_class)
+
+        description = SensorEntityDescription(
+            key=sensor_key,
+            device_class=device_class,
+            native_unit_of_measurement=sensor_data.unit or None,
+            state_class=SensorStateClass.MEASUREMENT if sensor_data.device_class else None,
+        )
+        self._descriptions[sensor_key] = description
+        # 创建 BLE 传感器 | Creating BLE sensor
+        _LOGGER.info(
+            "Creating BLE sensor: %s = %s %s",
+            sensor_data.name,
+            sensor_data.value,
+            sensor_data.unit or "",
+        )
+        return description
+
 
 async def async_setup_ble_sensors(
     hass: HomeAssistant,
@@ -56,188 +409,160 @@ async def async_setup_ble_sensors(
     设置 BLE 传感器实体
     Set up BLE sensor entities.
 
+    处理器注册到 __init__ 中创建的处理器协调器，新的传感器出现时自动创建实体。
+    The processor registers with the processor coordinator created in __init__,
+    and entities are created as new sensors appear.
+
     参数 | Args:
         hass: Home Assistant 实例
         entry: 配置入口
         async_add_entities: 添加实体的回调
     """
-    ble_address = entry.data[CONF_BLE_ADDRESS]
-    device_id = entry.data.get(CONF_DEVICE_ID, f"ble_{ble_address.replace(':', '_').lower()}")
-    device_name = entry.title
-    model = entry.data.get(CONF_MODEL, "XIAO BLE")
+    data = hass.data[DOMAIN][entry.entry_id]
+    coordinator = data["ble_coordinator"]
+    device_data: SeeedBLEDeviceData = data["ble_device_data"]
 
     # 设置 BLE 传感器 | Setting up BLE sensors
-    _LOGGER.info("Setting up BLE sensors: %s (%s)", device_name, ble_address)
+    _LOGGER.info("Setting up BLE sensors: %s (%s)", device_data.device_name, device_data.address)
 
-    # 存储已创建的传感器
-    created_sensors: dict[str, SeeedBLESensor] = {}
-
-    @callback
-    def _async_handle_bluetooth_event(
-        service_info: BluetoothServiceInfoBleak,
-        change: BluetoothChange,
-    ) -> None:
-        """
-        处理蓝牙事件
-        Handle bluetooth event.
-        """
-        # 只处理我们的设备 | Only process our device
-        if service_info.address.upper() != ble_address.upper():
-            return
-
-        # 收到 BLE 广播 | Received BLE advertisement
-        _LOGGER.debug(
-            "Received BLE advertisement: %s (%s), RSSI: %d",
-            service_info.name,
-            service_info.address,
-            service_info.rssi,
-        )
-
-        # 解析广播数据
-        device = parse_ble_advertisement(service_info)
-        if device is None:
-            return
-
-        # 处理传感器数据
-        new_entities = []
-        for sensor_data in device.sensors:
-            # 创建传感器 key
-            sensor_key = f"{sensor_data.object_id:02x}_{sensor_data.name.lower().replace(' ', '_')}"
-
-            if sensor_key in created_sensors:
-                # 更新现有传感器
-                created_sensors[sensor_key].update_value(sensor_data.value)
-            else:
-                # 创建新传感器
-                sensor = SeeedBLESensor(
-                    entry=entry,
-                    device_id=device_id,
-                    device_name=device_name,
-                    model=model,
-                    sensor_data=sensor_data,
-                    sensor_key=sensor_key,
-                )
-                created_sensors[sensor_key] = sensor
-                new_entities.append(sensor)
-                # 创建 BLE 传感器 | Creating BLE sensor
-                _LOGGER.info(
-                    "Creating BLE sensor: %s = %s %s",
-                    sensor_data.name,
-                    sensor_data.value,
-                    sensor_data.unit or "",
-                )
-
-        # 添加新实体
-        if new_entities:
-            async_add_entities(new_entities)
-
-        # 处理按钮事件 | Handle button events
-        if device.events:
-            for event_data in device.events:
-                # 收到 BLE 事件 | Received BLE event
-                _LOGGER.info(
-                    "Received BLE event: %s - %s",
-                    event_data.get("type"),
-                    event_data.get("event"),
-                )
-                # 触发 Home Assistant 事件
-                hass.bus.async_fire(
-                    f"{DOMAIN}_button_event",
-                    {
-                        "device_id": device_id,
-                        "device_name": device_name,
-                        "address": ble_address,
-                        "event_type": event_data.get("type"),
-                        "event": event_data.get("event"),
-                        "value": event_data.get("value"),
-                    },
-                )
-
-    # 注册蓝牙回调 | Register Bluetooth callback
-    # 使用 Service Data UUID 匹配 | Match using Service Data UUID
+    # 注册时传入实体描述类，Home Assistant 会恢复上次保存的实体和值，
+    # 不用等待第一条广播
+    # Registering with the entity description class makes Home Assistant restore
+    # the entities and values saved last time, without waiting for the first advertisement
+    processor = PassiveBluetoothDataProcessor(device_data.to_data_update)
     entry.async_on_unload(
-        async_register_callback(
-            hass,
-            _async_handle_bluetooth_event,
-            BluetoothCallbackMatcher(
-                service_data_uuid=BTHOME_SERVICE_UUID,
-                address=ble_address,
-            ),
-            bluetooth.BluetoothScanningMode.PASSIVE,
-        )
+        processor.async_add_entities_listener(SeeedBLESensor, async_add_entities)
+    )
+    entry.async_on_unload(
+        coordinator.async_register_processor(processor, SensorEntityDescription)
+    )
+    # 回放时直接把数据送入处理器 | Replays feed the processor directly
+    data["ble_processor"] = processor
+
+    # 链路质量诊断传感器 | Link quality diagnostic sensors
+    async_add_entities(
+        SeeedBLELinkSensor(coordinator, device_data, description)
+        for description in LINK_SENSORS
     )
 
     # BLE 传感器设置完成 | BLE sensor setup complete
     _LOGGER.info("BLE sensor setup complete, waiting for advertisement data...")
 
 
-class SeeedBLESensor(SensorEntity):
+class SeeedBLESensor(
+    PassiveBluetoothProcessorEntity[PassiveBluetoothDataProcessor[Any]],
+    SensorEntity,
+):
     """
     Seeed BLE 传感器实体
     Sensor entity for Seeed BLE devices.
     """
 
-    _attr_has_entity_name = True
-
     def __init__(
         self,
-        entry: ConfigEntry,
-        device_id: str,
-        device_name: str,
-        model: str,
-        sensor_data: BTHomeSensorData,
-        sensor_key: str,
+        processor: PassiveBluetoothDataProcessor[Any],
+        entity_key: PassiveBluetoothEntityKey,
+        description: SensorEntityDescription,
+        context: Any = None,
     ) -> None:
         """
         初始化 BLE 传感器
         Initialize BLE sensor.
         """
-        self._entry = entry
-        self._device_id = device_id
-        self._device_name = device_name
-        self._model = model
-        self._sensor_key = sensor_key
+        super().__init__(processor, entity_key, description, context)
+        # 保持原有的设备和唯一 ID，已有的实体不受影响
+        # Keep the existing device and unique ID so existing entities carry over
+        # 恢复的设备信息来自 JSON，identifiers 是列表，转换回元组集合
+        # Restored device info comes from JSON with identifiers as lists,
+        # turn them back into a set of tuples
+        device_info = processor.devices[None]
+        identifiers = {tuple(identifier) for identifier in device_info["identifiers"]}
+        device_id = next(iter(identifiers))[1]
+        self._attr_device_info = DeviceInfo({**device_info, "identifiers": identifiers})
+        self._attr_unique_id = f"{device_id}_{entity_key.key}"
 
-        # 设置实体属性
-        self._attr_name = sensor_data.name
-        self._attr_unique_id = f"{device_id}_{sensor_key}"
-        self._attr_native_value = sensor_data.value
+    @property
+    def native_value(self) -> Any:
+        """
+        返回传感器值
+        Return sensor value.
+        """
+        return self.processor.entity_data.get(self.entity_key)
 
-        # 设置单位
-        if sensor_data.unit:
-            self._attr_native_unit_of_measurement = sensor_data.unit
 
-        # 设置设备类别 | Set device class
-        if sensor_data.device_class:
-            try:
-                self._attr_device_class = SensorDeviceClass(sensor_data.device_class)
-            except ValueError:
-                _LOGGER.warning("Unknown device class: %s", sensor_data.device_class)
+class SeeedBLELinkSensor(SensorEntity):
+    """
+    Seeed BLE 链路质量诊断传感器
+    Link quality diagnostic sensor for Seeed BLE devices.
 
-        # 设置状态类别
-        if sensor_data.device_class:
-            self._attr_state_class = SensorStateClass.MEASUREMENT
+    值在每条广播时更新，但状态只每 BLE_LINK_UPDATE_INTERVAL 秒写入一次。
+    The value is updated on every advertisement, but the state is written only
+    once every BLE_LINK_UPDATE_INTERVAL seconds.
+    """
 
-    @property
-    def device_info(self) -> DeviceInfo:
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        coordinator: Any,
+        device_data: SeeedBLEDeviceData,
+        description: SensorEntityDescription,
+    ) -> None:
         """
-        返回设备信息
-        Return device info.
+        初始化链路质量传感器
+        Initialize link quality sensor.
+
+        参数 | Args:
+            coordinator: 处理器协调器 | Processor coordinator
+            device_data: BLE 设备数据 | BLE device data
+            description: 实体描述 | Entity description
         """
-        return DeviceInfo(
-            identifiers={(DOMAIN, self._device_id)},
-            name=self._device_name,
-            manufacturer=MANUFACTURER,
-            model=self._model,
+        self.entity_description = description
+        self._coordinator = coordinator
+        self._link = device_data.link
+        self._attr_unique_id = f"{device_data.device_id}_link_{description.key}"
+        self._attr_device_info = device_data.device_info
+
+    async def async_added_to_hass(self) -> None:
+        """
+        实体添加到 HA 时调用，开始定时写入状态
+        Called when entity is added to HA; start the periodic state write.
+        """
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_track_time_interval(
+                self.hass,
+                self._async_write_link_state,
+                timedelta(seconds=BLE_LINK_UPDATE_INTERVAL),
+            )
         )
 
     @callback
-    def update_value(self, value: Any) -> None:
+    def _async_write_link_state(self, now: datetime) -> None:
         """
-        更新传感器值
-        Update sensor value.
+        定时写入状态 | Write the state periodically
         """
-        self._attr_native_value = value
         self.async_write_ha_state()
-        # 更新 BLE 传感器 | Update BLE sensor
-        _LOGGER.debug("Updated BLE sensor %s: %s", self._attr_name, value)
+
+    @property
+    def available(self) -> bool:
+        """
+        返回实体是否可用
+        Return if entity is available.
+        """
+        return self._coordinator.available
+
+    @property
+    def native_value(self) -> float | None:
+        """
+        返回传感器值
+        Return sensor value.
+        """
+        key = self.entity_description.key
+        if key == "rssi":
+            return self._link.rssi
+        if key == "advertisement_interval":
+            return self._link.interval
+        return self._link.packet_loss
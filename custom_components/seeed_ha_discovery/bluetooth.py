@@ -15,18 +15,29 @@ BTHome 数据格式 | BTHome data format:
 - Service UUID: 0xFCD2
 - Device Info: 1 byte (包含版本号和加密信息 | contains version and encryption info)
 - Sensor Data: [Object ID (1 byte)][Value (1-4 bytes)]...
+
+解码使用启动时编译好的对象表（大小、struct 格式、缩放因子、种类），
+覆盖完整的 BTHome v2 对象集。
+Decoding uses an object table compiled at import (size, struct format,
+factor, kind) covering the full BTHome v2 object set.
+
+加密负载 | Encrypted payload (AES-CCM, 4 字节 MIC | 4-byte MIC):
+- Device Info (1 byte) | 密文 | Ciphertext | 计数器 | Counter (4 bytes, LE) | MIC (4 bytes)
+- Nonce = MAC (6) + UUID16 (d2 fc) + Device Info (1) + 计数器 | Counter (4)
 """
 from __future__ import annotations
 
 import logging
 import struct
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Callable, NamedTuple
 
 from bluetooth_data_tools import short_address
 from home_assistant_bluetooth import BluetoothServiceInfoBleak
 
 from .const import (
+    BLE_LINK_EWMA_ALPHA,
+    BLE_LINK_LOSS_WINDOW,
     BTHOME_SERVICE_UUID,
     BTHOME_SENSOR_TYPES,
     BTHOME_BINARY_SENSOR_TYPES,
@@ -42,8 +53,18 @@ BTHOME_DEVICE_INFO_TRIGGER = 0x04  # 触发器设备 | Trigger device
 BTHOME_DEVICE_INFO_VERSION_MASK = 0xE0  # 版本位掩码 | Version bit mask
 BTHOME_VERSION_2 = 0x40  # BTHome v2
 
+# BTHome 加密负载 | BTHome encrypted payload
+BTHOME_COUNTER_SIZE = 4  # 计数器字节数 | Counter bytes
+BTHOME_MIC_SIZE = 4  # MIC 字节数 | MIC bytes
+BTHOME_UUID16 = b"\xd2\xfc"  # Nonce 中的 UUID16（小端）| UUID16 in the nonce (little-endian)
+BTHOME_BIND_KEY_SIZE = 16  # 绑定密钥字节数 | Bind key bytes
+# 计数器比上次小这么多时视为设备重启后重新计数（仍需通过 MIC 校验）
+# A counter this far below the last one counts as a restart after a reboot
+# (it must still pass the MIC check)
+BTHOME_COUNTER_RESET_GAP = 1024
 
-@dataclass
+
+@dataclass(slots=True)
 class BTHomeSensorData:
     """
     BTHome 传感器数据
@@ -80,185 +101,627 @@ class SeeedBLEDevice:
         return short_address(self.address)
 
 
-def parse_bthome_data(data: bytes) -> tuple[list[BTHomeSensorData], list[dict[str, Any]], bool, bool]:
+# 对象种类 | Object kinds
+KIND_SENSOR = 0  # 传感器 | Sensor
+KIND_BINARY = 1  # 二进制传感器 | Binary sensor
+KIND_EVENT = 2  # 事件（按钮、调光旋钮）| Event (button, dimmer)
+KIND_META = 3  # 元数据（包 ID、固件版本等），不创建实体 | Metadata (packet id, firmware, ...), no entity
+
+# 包 ID 对象 | Packet id object
+BTHOME_PACKET_ID = 0x00
+
+# 变长对象（第一个字节是长度）| Variable-length objects (first byte is the length)
+BTHOME_VARIABLE_LENGTH = -1
+
+# BTHome v2 对象的数据格式（struct 格式字符，"u24" 为 24 位无符号整数）
+# Data format of BTHome v2 objects (struct format characters, "u24" is a 24-bit unsigned integer)
+_BTHOME_FORMATS: dict[int, str] = {
+    0x00: "B",    # Packet ID
+    0x01: "B",    # Battery
+    0x02: "h",    # Temperature
+    0x03: "H",    # Humidity
+    0x04: "u24",  # Pressure
+    0x05: "u24",  # Illuminance
+    0x06: "H",    # Mass (kg)
+    0x07: "H",    # Mass (lb)
+    0x08: "h",    # Dewpoint
+    0x09: "B",    # Count uint8
+    0x0A: "u24",  # Energy
+    0x0B: "u24",  # Power
+    0x0C: "H",    # Voltage
+    0x0D: "H",    # PM2.5
+    0x0E: "H",    # PM10
+    **{object_id: "B" for object_id in range(0x0F, 0x12)},  # Binary
+    0x12: "H",    # CO2
+    0x13: "H",    # TVOC
+    0x14: "H",    # Moisture
+    **{object_id: "B" for object_id in range(0x15, 0x2E)},  # Binary
+    0x2E: "B",    # Humidity uint8
+    0x2F: "B",    # Moisture uint8
+    0x3A: "B",    # Button
+    0x3C: "BB",   # Dimmer (event, steps)
+    0x3D: "H",    # Count uint16
+    0x3E: "I",    # Count uint32
+    0x3F: "h",    # Rotation
+    0x40: "H",    # Distance (mm)
+    0x41: "H",    # Distance (m)
+    0x42: "u24",  # Duration
+    0x43: "H",    # Current
+    0x44: "H",    # Speed
+    0x45: "h",    # Temperature (0.1)
+    0x46: "B",    # UV Index
+    0x47: "H",    # Volume (L)
+    0x48: "H",    # Volume (mL)
+    0x49: "H",    # Volume Flow Rate
+    0x4A: "H",    # Voltage (0.1)
+    0x4B: "u24",  # Gas
+    0x4C: "I",    # Gas uint32
+    0x4D: "I",    # Energy uint32
+    0x4E: "I",    # Volume uint32
+    0x4F: "I",    # Water
+    0x50: "I",    # Timestamp
+    0x51: "H",    # Acceleration
+    0x52: "H",    # Gyroscope
+    0x53: "",     # Text (variable length)
+    0x54: "",     # Raw (variable length)
+    0x55: "I",    # Volume Storage
+    0x56: "H",    # Conductivity
+    0x57: "b",    # Temperature sint8
+    0x58: "b",    # Temperature sint8 (0.35)
+    0x59: "b",    # Count sint8
+    0x5A: "h",    # Count sint16
+    0x5B: "i",    # Count sint32
+    0x5C: "i",    # Power sint32
+    0x5D: "h",    # Current sint16
+    0x5E: "H",    # Direction
+    0x5F: "H",    # Precipitation
+    0x60: "B",    # Channel
+    0x61: "H",    # Rotational Speed
+    0xF0: "H",    # Device type ID
+    0xF1: "I",    # Firmware version uint32
+    0xF2: "u24",  # Firmware version uint24
+}
+
+_U24 = struct.Struct("<HB")
+
+
+def _unpack_u24(buffer: bytes, offset: int) -> tuple[int]:
     """
-    解析 BTHome 格式的 Service Data
-    Parse BTHome format service data.
+    读取 24 位无符号小端整数
+    Read a 24-bit unsigned little-endian integer.
+    """
+    low, high = _U24.unpack_from(buffer, offset)
+    return (low | high << 16,)
+
+
+class BTHomeObject(NamedTuple):
+    """
+    预编译的 BTHome 对象描述
+    Precompiled BTHome object description.
+    """
+    kind: int
+    # struct 格式字符（"u24" 为 24 位无符号整数，变长对象为空）
+    # struct format characters ("u24" is a 24-bit unsigned integer, empty for variable-length objects)
+    fmt: str
+    # 数据字节数，变长对象为 BTHOME_VARIABLE_LENGTH | Data bytes, BTHOME_VARIABLE_LENGTH for variable-length objects
+    size: int
+    # unpack(buffer, offset) -> tuple
+    unpack: Callable[[bytes, int], tuple] | None
+    # 十进制缩放因子用整数除法（结果与四舍五入一致）；其他因子用乘法
+    # Decimal factors divide by an integer (exactly rounded); other factors multiply
+    divisor: int
+    factor: float
+    name: str
+    device_class: str | None
+    unit: str | None
+    events: dict[int, str] | None
+
+
+def _compile_bthome_table() -> tuple[BTHomeObject | None, ...]:
+    """
+    把格式表和 const 中的类型映射编译成按 Object ID 索引的表
+    Compile the format table and the type mappings from const into a table
+    indexed by object ID.
+    """
+    table: list[BTHomeObject | None] = [None] * 256
+    for object_id, fmt in _BTHOME_FORMATS.items():
+        if object_id in BTHOME_SENSOR_TYPES:
+            kind, info = KIND_SENSOR, BTHOME_SENSOR_TYPES[object_id]
+        elif object_id in BTHOME_BINARY_SENSOR_TYPES:
+            kind, info = KIND_BINARY, BTHOME_BINARY_SENSOR_TYPES[object_id]
+        elif object_id in BTHOME_EVENT_TYPES:
+            kind, info = KIND_EVENT, BTHOME_EVENT_TYPES[object_id]
+        else:
+            kind, info = KIND_META, {}
+
+        if not fmt:
+            size, unpack = BTHOME_VARIABLE_LENGTH, None
+        elif fmt == "u24":
+            size, unpack = 3, _unpack_u24
+        else:
+            compiled = struct.Struct(f"<{fmt}")
+            size, unpack = compiled.size, compiled.unpack_from
+
+        factor = info.get("factor", 1)
+        divisor = round(1 / factor)
+        if abs(divisor * factor - 1) > 1e-9:
+            divisor = 1
+        else:
+            factor = 1
+
+        table[object_id] = BTHomeObject(
+            kind=kind,
+            fmt=fmt,
+            size=size,
+            unpack=unpack,
+            divisor=divisor,
+            factor=factor,
+            name=info.get("name", ""),
+            device_class=info.get("device_class"),
+            unit=info.get("unit"),
+            events=info.get("events"),
+        )
+    return tuple(table)
+
+
+# 按 Object ID 索引的 BTHome 对象表 | BTHome object table indexed by object ID
+_BTHOME_TABLE = _compile_bthome_table()
+
+
+def bthome_object(object_id: int) -> BTHomeObject | None:
+    """
+    按 Object ID 获取预编译的 BTHome 对象描述
+    Get the precompiled BTHome object description by object ID.
 
     参数 | Args:
-        data: BTHome Service Data 字节 | BTHome Service Data bytes
+        object_id: BTHome Object ID（0-255）
 
     返回 | Returns:
-        tuple: (传感器列表, 事件列表, 是否 BTHome v2, 是否加密)
-               (sensor list, event list, is BTHome v2, is encrypted)
+        BTHomeObject: 对象描述，未知对象为 None | Object description, None for unknown objects
+    """
+    return _BTHOME_TABLE[object_id]
+
+
+@dataclass(slots=True)
+class BTHomePayload:
+    """
+    一条 BTHome Service Data 的解码结果
+    Decoded result of one BTHome service data payload.
     """
-    if len(data) < 1:
-        return [], [], False, False
+    sensors: list[BTHomeSensorData] = field(default_factory=list)
+    events: list[dict[str, Any]] = field(default_factory=list)
+    is_v2: bool = False
+    is_encrypted: bool = False
+    # 包 ID（对象 0x00），设备未发送时为 None | Packet id (object 0x00), None if not sent
+    packet_id: int | None = None
 
-    sensors: list[BTHomeSensorData] = []
-    events: list[dict[str, Any]] = []
+
+def decode_bthome(data: bytes) -> BTHomePayload:
+    """
+    解码 BTHome 格式的 Service Data
+    Decode BTHome format service data.
+
+    每个对象只查一次预编译表，用 struct.unpack_from 直接从缓冲区读取，不切片。
+    Each object costs one lookup in the precompiled table and is read straight
+    from the buffer with struct.unpack_from, without slicing.
+
+    参数 | Args:
+        data: BTHome Service Data 字节 | BTHome Service Data bytes
+
+    返回 | Returns:
+        BTHomePayload: 传感器、事件、版本、加密标志和包 ID
+                       Sensors, events, version, encryption flag and packet id
+    """
+    payload = BTHomePayload()
+    end = len(data)
+    if end < 1:
+        return payload
 
     # 第一个字节是设备信息 | First byte is device info
     device_info = data[0]
-    is_v2 = (device_info & BTHOME_DEVICE_INFO_VERSION_MASK) == BTHOME_VERSION_2
-    is_encrypted = bool(device_info & BTHOME_DEVICE_INFO_ENCRYPT)
+    payload.is_v2 = (device_info & BTHOME_DEVICE_INFO_VERSION_MASK) == BTHOME_VERSION_2
+    payload.is_encrypted = bool(device_info & BTHOME_DEVICE_INFO_ENCRYPT)
 
-    if is_encrypted:
+    if payload.is_encrypted:
         # BTHome 数据已加密 | BTHome data is encrypted
         _LOGGER.debug("BTHome data is encrypted, skipping parse")
-        return [], [], is_v2, is_encrypted
+        return payload
 
-    if not is_v2:
+    if not payload.is_v2:
         # 不是 BTHome v2 格式 | Not BTHome v2 format
         _LOGGER.debug("Not BTHome v2 format")
-        return [], [], is_v2, is_encrypted
+        return payload
+
+    table = _BTHOME_TABLE
+    sensors = payload.sensors
+    debug = _LOGGER.isEnabledFor(logging.DEBUG)
 
-    # 从第二个字节开始解析传感器数据 | Parse sensor data starting from second byte
+    # 从第二个字节开始解析对象 | Parse objects starting from second byte
     offset = 1
-    while offset < len(data):
+    while offset < end:
         object_id = data[offset]
         offset += 1
+        obj = table[object_id]
 
-        # 获取传感器类型信息 | Get sensor type info
-        sensor_info = None
-        is_event = False
-        is_binary = False
-
-        if object_id in BTHOME_SENSOR_TYPES:
-            sensor_info = BTHOME_SENSOR_TYPES[object_id]
-        elif object_id in BTHOME_BINARY_SENSOR_TYPES:
-            sensor_info = BTHOME_BINARY_SENSOR_TYPES[object_id]
-            is_binary = True
-        elif object_id in BTHOME_EVENT_TYPES:
-            sensor_info = BTHOME_EVENT_TYPES[object_id]
-            is_event = True
-
-        if sensor_info is None:
+        if obj is None:
             # 未知的 Object ID | Unknown Object ID
             _LOGGER.debug("Unknown Object ID: 0x%02X", object_id)
             # 尝试跳过未知数据（假设 2 字节）| Try to skip unknown data (assume 2 bytes)
             offset += 2
             continue
 
-        # 根据 Object ID 获取数据大小 | Get data size based on Object ID
-        data_size = _get_data_size(object_id)
-        if offset + data_size > len(data):
+        size = obj.size
+        if size == BTHOME_VARIABLE_LENGTH:
+            # 变长对象：长度字节 + 数据 | Variable length: length byte + data
+            if offset >= end:
+                break
+            size = data[offset] + 1
+
+        if offset + size > end:
             # 数据不完整 | Incomplete data
-            _LOGGER.warning("Incomplete data: need %d bytes, only have %d bytes", data_size, len(data) - offset)
+            _LOGGER.warning("Incomplete data: need %d bytes, only have %d bytes", size, end - offset)
             break
 
-        # 读取值 | Read value
-        value_bytes = data[offset:offset + data_size]
-        offset += data_size
-
-        # 解析值 | Parse value
-        value = _parse_value(object_id, value_bytes)
+        kind = obj.kind
+        if kind == KIND_META:
+            if object_id == BTHOME_PACKET_ID:
+                payload.packet_id = data[offset]
+            offset += size
+            continue
 
-        # 应用缩放因子 | Apply scaling factor
-        factor = sensor_info.get("factor", 1)
-        if isinstance(value, (int, float)) and factor != 1:
-            value = round(value * factor, 2)
+        values = obj.unpack(data, offset)
+        offset += size
 
-        if is_event:
+        if kind == KIND_EVENT:
             # 事件类型 | Event type
-            event_name = sensor_info.get("events", {}).get(value, "unknown")
-            events.append({
-                "type": sensor_info["name"],
+            event_name = obj.events.get(values[0], "unknown")
+            payload.events.append({
+                "type": obj.name,
                 "event": event_name,
-                "value": value,
+                "value": values[-1],
             })
-            _LOGGER.debug("BTHome event: %s = %s", sensor_info["name"], event_name)
-        else:
-            # 传感器类型 | Sensor type
-            sensor = BTHomeSensorData(
-                object_id=object_id,
-                name=sensor_info["name"],
-                value=value,
-                device_class=sensor_info.get("device_class"),
-                unit=sensor_info.get("unit"),
+            if debug:
+                _LOGGER.debug("BTHome event: %s = %s", obj.name, event_name)
+            continue
+
+        # 应用缩放因子 | Apply scaling factor
+        value = values[0]
+        if obj.divisor != 1:
+            value = value / obj.divisor
+        elif obj.factor != 1:
+            value = round(value * obj.factor, 2)
+
+        sensors.append(BTHomeSensorData(
+            object_id=object_id,
+            name=obj.name,
+            value=value,
+            device_class=obj.device_class,
+            unit=obj.unit,
+        ))
+        if debug:
+            _LOGGER.debug("BTHome sensor: %s = %s %s", obj.name, value, obj.unit or "")
+
+    return payload
+
+
+def parse_bthome_data(data: bytes) -> tuple[list[BTHomeSensorData], list[dict[str, Any]], bool, bool]:
+    """
+    解析 BTHome 格式的 Service Data
+    Parse BTHome format service data.
+
+    参数 | Args:
+        data: BTHome Service Data 字节 | BTHome Service Data bytes
+
+    返回 | Returns:
+        tuple: (传感器列表, 事件列表, 是否 BTHome v2, 是否加密)
+               (sensor list, event list, is BTHome v2, is encrypted)
+    """
+    payload = decode_bthome(data)
+    return payload.sensors, payload.events, payload.is_v2, payload.is_encrypted
+
+
+def bthome_packet_id(data: bytes) -> int | None:
+    """
+    不解码整个负载，直接读取 BTHome 包 ID
+    Read the BTHome packet id without decoding the whole payload.
+
+    BTHome v2 对象按 ID 升序排列，所以包 ID（0x00）如果存在，总是第一个对象。
+    BTHome v2 objects are sorted by ID, so the packet id (0x00), when present,
+    is always the first object.
+    """
+    if (
+        len(data) >= 3
+        and not data[0] & BTHOME_DEVICE_INFO_ENCRYPT
+        and data[1] == BTHOME_PACKET_ID
+    ):
+        return data[2]
+    return None
+
+
+def parse_bind_key(value: str) -> bytes | None:
+    """
+    解析 32 位十六进制的绑定密钥
+    Parse a 32-digit hex bind key.
+
+    返回 | Returns:
+        bytes: 16 字节密钥，格式错误时为 None | 16-byte key, None if malformed
+    """
+    try:
+        key = bytes.fromhex(value.strip())
+    except ValueError:
+        return None
+    return key if len(key) == BTHOME_BIND_KEY_SIZE else None
+
+
+class BTHomeDecryptor:
+    """
+    单个设备的 BTHome 解密器
+    BTHome decryptor of one device.
+
+    AES-CCM 上下文和 Nonce 前缀只在创建时构建一次，之后每条广播复用。
+    计数器必须严格递增：不大于上次成功解密的计数器的包在解密前就被拒绝（重放）。
+    只有通过 MIC 校验的包才会推进计数器，伪造的计数器无法把窗口推到前面。
+    The AES-CCM context and the nonce prefix are built once and reused for every
+    advertisement. Counters must strictly increase: a packet whose counter is not
+    above the last successfully decrypted one is rejected before decryption (replay).
+    Only packets passing the MIC check advance the counter, so forged counters
+    cannot push the window ahead.
+
+    设备重启或换电池后计数器会从头开始：比上次小至少 BTHOME_COUNTER_RESET_GAP
+    的计数器仍会尝试解密，通过 MIC 校验时重置窗口。
+    Devices restart their counter after a reboot or a battery swap: a counter at
+    least BTHOME_COUNTER_RESET_GAP below the last one is still decrypted, and the
+    window is reset when it passes the MIC check.
+    """
+
+    def __init__(self, address: str, bind_key: bytes) -> None:
+        """
+        初始化解密器
+        Initialize the decryptor.
+
+        参数 | Args:
+            address: 设备 MAC 地址 | Device MAC address
+            bind_key: 16 字节绑定密钥 | 16-byte bind key
+        """
+        from cryptography.hazmat.primitives.ciphers.aead import AESCCM
+
+        self._cipher = AESCCM(bind_key, tag_length=BTHOME_MIC_SIZE)
+        self._nonce_prefix = bytes.fromhex(address.replace(":", "")) + BTHOME_UUID16
+        # 上次成功解密的计数器 | Counter of the last successfully decrypted packet
+        self.last_counter: int | None = None
+        # 统计 | Statistics
+        self.decrypted = 0
+        self.replayed = 0
+        self.failed = 0
+        self.resets = 0
+
+    def decrypt(self, data: bytes) -> bytes | None:
+        """
+        解密一条 BTHome 负载
+        Decrypt one BTHome payload.
+
+        参数 | Args:
+            data: 加密的 BTHome Service Data | Encrypted BTHome service data
+
+        返回 | Returns:
+            bytes: 去掉加密标志的明文负载，可直接交给 decode_bthome；
+                   重放、格式错误或校验失败时为 None
+                   Plaintext payload with the encryption flag cleared, ready for
+                   decode_bthome; None on replay, malformed data or a failed check
+        """
+        from cryptography.exceptions import InvalidTag
+
+        if len(data) < 1 + BTHOME_COUNTER_SIZE + BTHOME_MIC_SIZE:
+            self.failed += 1
+            return None
+
+        # 先检查计数器，重放的包不解密 | Check the counter first, replays are not decrypted
+        counter_bytes = data[-BTHOME_COUNTER_SIZE - BTHOME_MIC_SIZE:-BTHOME_MIC_SIZE]
+        counter = int.from_bytes(counter_bytes, "little")
+        reset = False
+        if self.last_counter is not None and counter <= self.last_counter:
+            if self.last_counter - counter < BTHOME_COUNTER_RESET_GAP:
+                self.replayed += 1
+                return None
+            # 远小于上次的计数器：可能是设备重启，通过 MIC 校验后才重置
+            # Far below the last counter: possibly a device restart, reset only after the MIC check
+            reset = True
+
+        nonce = self._nonce_prefix + data[:1] + counter_bytes
+        ciphertext = data[1:-BTHOME_COUNTER_SIZE - BTHOME_MIC_SIZE] + data[-BTHOME_MIC_SIZE:]
+        try:
+            plaintext = self._cipher.decrypt(nonce, ciphertext, None)
+        except InvalidTag:
+            self.failed += 1
+            _LOGGER.debug("BTHome decryption failed (wrong bind key?), counter %d", counter)
+            return None
+
+        if reset:
+            self.resets += 1
+            _LOGGER.info(
+                "BTHome counter restarted (%d -> %d), device rebooted?", self.last_counter, counter
             )
-            sensors.append(sensor)
-            _LOGGER.debug("BTHome sensor: %s = %s %s", sensor.name, sensor.value, sensor.unit or "")
-
-    return sensors, events, is_v2, is_encrypted
-
-
-def _get_data_size(object_id: int) -> int:
-    """
-    根据 Object ID 获取数据大小
-    Get data size based on Object ID.
-    """
-    # 1 字节数据 | 1-byte data
-    one_byte = {
-        0x01,  # Battery
-        0x09,  # Count uint8
-        0x0F,  # Binary Generic
-        0x10,  # Binary Power
-        0x11,  # Binary Opening
-        0x15,  # Battery Low
-        0x16,  # Battery Charging
-        0x20,  # Occupancy
-        0x21,  # Motion
-        0x2E,  # Humidity uint8
-        0x2F,  # Moisture uint8
-        0x3A,  # Button
-        0x46,  # UV Index
-    }
-
-    # 3 字节数据 | 3-byte data
-    three_bytes = {
-        0x04,  # Pressure
-        0x05,  # Illuminance
-        0x0A,  # Energy
-        0x0B,  # Power
-        0x42,  # Duration
-        0x4B,  # Gas
-    }
-
-    # 4 字节数据 | 4-byte data
-    four_bytes = {
-        0x3E,  # Count uint32
-        0x4C,  # Gas uint32
-        0x4D,  # Energy uint32
-        0x4E,  # Volume uint32
-        0x4F,  # Water
-    }
-
-    if object_id in one_byte:
-        return 1
-    elif object_id in three_bytes:
-        return 3
-    elif object_id in four_bytes:
-        return 4
-    else:
-        return 2  # 默认 2 字节 | Default 2 bytes
-
-
-def _parse_value(object_id: int, value_bytes: bytes) -> int | float:
-    """
-    解析传感器值
-    Parse sensor value from bytes.
-    """
-    size = len(value_bytes)
-
-    # 有符号类型 | Signed types
-    signed_types = {0x02, 0x08, 0x3F, 0x45}  # Temperature, Dewpoint, Rotation, Temperature_tenth
-
-    if size == 1:
-        if object_id in signed_types:
-            return struct.unpack("<b", value_bytes)[0]
-        return value_bytes[0]
-    elif size == 2:
-        if object_id in signed_types:
-            return struct.unpack("<h", value_bytes)[0]
-        return struct.unpack("<H", value_bytes)[0]
-    elif size == 3:
-        # 24 位无符号整数 | 24-bit unsigned integer
-        return value_bytes[0] | (value_bytes[1] << 8) | (value_bytes[2] << 16)
-    elif size == 4:
-        return struct.unpack("<I", value_bytes)[0]
-    else:
-        return 0
+        self.last_counter = counter
+        self.decrypted += 1
+        return bytes((data[0] & ~BTHOME_DEVICE_INFO_ENCRYPT,)) + plaintext
+
+    def stats(self) -> dict[str, int | None]:
+        """
+        返回解密统计
+        Return decryption statistics.
+        """
+        return {
+            "last_counter": self.last_counter,
+            "decrypted": self.decrypted,
+            "replayed": self.replayed,
+            "failed": self.failed,
+            "resets": self.resets,
+        }
+
+
+class AdvertisementCache:
+    """
+    BLE 广播去重缓存
+    BLE advertisement de-duplication cache.
+
+    信标在两次测量之间会重复发送同一条广播。按地址保存最近一次的
+    BTHome Service Data，重复的广播在解析前就被丢弃：
+    Beacons repeat the same advertisement between measurements. The last BTHome
+    service data is kept per address and repeats are dropped before parsing:
+    - 负载带包 ID 时，包 ID 相同即为重复
+      With a packet id, the same packet id means a repeat
+    - 否则负载字节完全相同即为重复
+      Otherwise identical payload bytes mean a repeat
+    """
+
+    def __init__(self, packet_id: Callable[[bytes], int | None] = bthome_packet_id) -> None:
+        """
+        初始化缓存
+        Initialize the cache.
+
+        参数 | Args:
+            packet_id: 从负载读取包 ID 的函数（默认 BTHome）
+                       Function reading the packet id from a payload (BTHome by default)
+        """
+        self._packet_id = packet_id
+        # {地址: 最近一次的 Service Data} | {address: last service data}
+        self._last: dict[str, bytes] = {}
+        # 统计 | Statistics
+        self.accepted = 0
+        self.duplicates = 0
+
+    def is_duplicate(self, address: str, data: bytes) -> bool:
+        """
+        检查广播是否重复，不重复时记录下来
+        Check if an advertisement is a repeat, recording it when it is not.
+
+        参数 | Args:
+            address: 设备地址 | Device address
+            data: BTHome Service Data
+
+        返回 | Returns:
+            bool: 是否为重复广播 | Whether the advertisement is a repeat
+        """
+        last = self._last.get(address)
+        if last is not None:
+            packet_id = self._packet_id(data)
+            if packet_id is not None:
+                duplicate = packet_id == self._packet_id(last)
+            else:
+                duplicate = data == last
+            if duplicate:
+                self.duplicates += 1
+                return True
+        self._last[address] = data
+        self.accepted += 1
+        return False
+
+    def stats(self) -> dict[str, int]:
+        """
+        返回去重统计
+        Return de-duplication statistics.
+        """
+        return {
+            "addresses": len(self._last),
+            "accepted": self.accepted,
+            "duplicates": self.duplicates,
+        }
+
+
+class LinkQuality:
+    """
+    BLE 链路质量
+    BLE link quality.
+
+    每条广播 O(1) 更新：
+    Updated in O(1) per advertisement:
+    - 平滑的 RSSI（EWMA，包括重复的广播）| Smoothed RSSI (EWMA, repeats included)
+    - 观测到的广播间隔（EWMA，包括重复的广播）| Observed advertisement interval (EWMA, repeats included)
+    - 根据包 ID 的跳变估计丢包率：包 ID 每个新读数加 1，跳过的 ID 就是丢失的包
+      Packet loss estimated from packet ID gaps: the packet ID increases by one
+      per new reading, so skipped IDs are lost packets
+    """
+
+    def __init__(self, alpha: float = BLE_LINK_EWMA_ALPHA) -> None:
+        """
+        初始化链路质量统计
+        Initialize link quality statistics.
+
+        参数 | Args:
+            alpha: EWMA 平滑系数 | EWMA smoothing factor
+        """
+        self._alpha = alpha
+        self.rssi: float | None = None
+        self.interval: float | None = None
+        self.advertisements = 0
+        self._last_seen: float | None = None
+        self._last_packet_id: int | None = None
+        # 收到的和预期的新包数 | New packets received and expected
+        self._received = 0
+        self._expected = 0
+
+    def observe(self, rssi: int, now: float) -> None:
+        """
+        记录一条广播（包括重复的）
+        Record one advertisement (repeats included).
+
+        参数 | Args:
+            rssi: 信号强度（dBm）| Signal strength (dBm)
+            now: 当前时间（单调时钟）| Current time (monotonic clock)
+        """
+        alpha = self._alpha
+        self.advertisements += 1
+        self.rssi = rssi if self.rssi is None else self.rssi + alpha * (rssi - self.rssi)
+
+        if self._last_seen is not None:
+            gap = now - self._last_seen
+            self.interval = gap if self.interval is None else self.interval + alpha * (gap - self.interval)
+        self._last_seen = now
+
+    def observe_packet(self, packet_id: int | None) -> None:
+        """
+        记录一个新的读数的包 ID（去重和解密之后）
+        Record the packet ID of a new reading (after de-duplication and decryption).
+
+        参数 | Args:
+            packet_id: 包 ID（0-255），没有时为 None | Packet ID (0-255), None if absent
+        """
+        if packet_id is None:
+            return
+        last = self._last_packet_id
+        self._last_packet_id = packet_id
+        if last is None:
+            self._received = self._expected = 1
+        elif packet_id != last:
+            # 包 ID 是 8 位，回绕后继续计算 | Packet IDs are 8-bit, keep counting across the wrap
+            self._received += 1
+            self._expected += (packet_id - last) % 256
+            if self._expected > BLE_LINK_LOSS_WINDOW:
+                self._received //= 2
+                self._expected //= 2
+
+    @property
+    def packet_loss(self) -> float | None:
+        """
+        估计的丢包率（%），没有包 ID 时为 None
+        Estimated packet loss (%), None without packet IDs.
+        """
+        if self._expected <= 1:
+            return None
+        return 100 * (1 - self._received / self._expected)
+
+    def stats(self) -> dict[str, float | int | None]:
+        """
+        返回链路质量统计
+        Return link quality statistics.
+        """
+        loss = self.packet_loss
+        return {
+            "rssi": round(self.rssi, 1) if self.rssi is not None else None,
+            "advertisement_interval": round(self.interval, 2) if self.interval is not None else None,
+            "packet_loss": round(loss, 1) if loss is not None else None,
+            "advertisements": self.advertisements,
+        }
 
 
 def parse_ble_advertisement(
@@ -288,9 +751,10 @@ def parse_ble_advertisement(
     bthome_data = service_data.get(BTHOME_SERVICE_UUID)
 
     if bthome_data is None:
-        # 没有 BTHome Service Data | No BTHome Service Data
+        # 没有 BTHome Service Data，尝试 Seeed 紧凑负载
+        # No BTHome Service Data, try the compact Seeed payload
         _LOGGER.debug("No BTHome Service Data")
-        return None
+        return _parse_seeed_advertisement(service_info)
 
     _LOGGER.debug("BTHome Service Data: %s", bthome_data.hex())
 
@@ -337,6 +801,35 @@ def parse_ble_advertisement(
     return device
 
 
+def _parse_seeed_advertisement(
+    service_info: BluetoothServiceInfoBleak,
+) -> SeeedBLEDevice | None:
+    """
+    解析 Manufacturer Data 中的 Seeed 紧凑负载
+    Parse the compact Seeed payload in the manufacturer data.
+
+    单条广播没有关键帧上下文，差分帧中的计数器会被跳过。
+    A single advertisement has no keyframe context, so counters of delta frames are skipped.
+    """
+    from .seeed_payload import SeeedPayloadDecoder
+
+    seeed_data = service_info.manufacturer_data.get(SEEED_MANUFACTURER_ID)
+    if seeed_data is None:
+        return None
+    sensors = SeeedPayloadDecoder().decode(seeed_data)
+    if sensors is None:
+        _LOGGER.debug("Not a compact Seeed payload")
+        return None
+
+    return SeeedBLEDevice(
+        address=service_info.address,
+        name=service_info.name or f"Seeed BLE {short_address(service_info.address)}",
+        rssi=service_info.rssi,
+        sensors=sensors,
+        raw_data=seeed_data,
+    )
+
+
 def is_seeed_ble_device(service_info: BluetoothServiceInfoBleak) -> bool:
     """
     检查是否是 Seeed BLE 设备
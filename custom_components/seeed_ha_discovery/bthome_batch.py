@@ -0,0 +1,270 @@
+"""
+Seeed HA Discovery - BTHome 批量解码
+Seeed HA Discovery - Batch BTHome decoding.
+
+离线分析（调试、现场排查）时要解码数百万条抓取的广播，逐条调用
+decode_bthome 太慢。这个模块一次解码整个 NumPy 字节矩阵：
+Offline analysis (commissioning, troubleshooting) decodes millions of captured
+advertisements, and calling decode_bthome one by one is too slow. This module
+decodes a whole NumPy byte matrix at once:
+1. 长度、设备信息字节和各对象 ID 位置都相同的行共用一个布局，
+   布局只用标量逻辑推导一次，然后用向量化比较找出所有同布局的行
+   Rows with the same length, device info byte and object IDs at the same
+   positions share a layout; each layout is derived once with scalar logic and
+   all matching rows are found with one vectorized comparison
+2. 每个对象的值按小端字节直接组合成整数列，再按对象表缩放
+   Each object's bytes are combined little-endian into an integer column,
+   then scaled from the object table
+3. 结果与 decode_bthome 完全一致：十进制因子用同样的除法；其他因子对
+   每个不同的原始值调用一次 Python 的 round()
+   Results match decode_bthome exactly: decimal factors use the same division;
+   other factors call Python's round() once per distinct raw value
+
+加密、非 v2 或含变长对象（文本、原始数据）的行不解码（decoded 为 False），
+调用方可以对这些行回退到 decode_bthome。
+Encrypted, non-v2 rows and rows with variable-length objects (text, raw) are not
+decoded (decoded is False); callers can fall back to decode_bthome for them.
+
+NumPy 只在这个模块中导入，集成运行时不会加载它。
+NumPy is imported only in this module; the integration never loads it at runtime.
+
+用法 | Usage:
+    matrix, lengths = pack_payloads(payloads)
+    batch = decode_bthome_batch(matrix, lengths)
+    batch.columns["02_temperature"][batch.present["02_temperature"]]
+"""
+from __future__ import annotations
+
+import struct
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from .bluetooth import (
+    BTHOME_DEVICE_INFO_ENCRYPT,
+    BTHOME_DEVICE_INFO_VERSION_MASK,
+    BTHOME_PACKET_ID,
+    BTHOME_VARIABLE_LENGTH,
+    BTHOME_VERSION_2,
+    KIND_EVENT,
+    KIND_META,
+    bthome_object,
+)
+
+
+@dataclass(slots=True)
+class _BatchField:
+    """
+    布局中的一个对象
+    One object of a layout.
+    """
+    object_id: int
+    # 列名（与传感器 key 相同，同一负载中重复的对象加 _2、_3 后缀）
+    # Column name (the sensor key, repeated objects in one payload get _2, _3 suffixes)
+    key: str
+    # [(偏移, 字节数, 是否有符号)]，一个对象可以有多个值（如 Dimmer）
+    # [(offset, size, signed)], one object may hold several values (e.g. Dimmer)
+    values: list[tuple[int, int, bool]]
+
+
+@dataclass(slots=True)
+class BTHomeBatch:
+    """
+    批量解码结果，所有数组的第一维都是行
+    Batch decoding result; the first axis of every array is the row.
+    """
+    # 该行是否已解码 | Whether the row was decoded
+    decoded: np.ndarray
+    # 包 ID，没有时为 -1 | Packet id, -1 when absent
+    packet_id: np.ndarray
+    # {传感器 key: 值列}，整数对象为 int64，缩放后的对象为 float64
+    # {sensor key: value column}, int64 for integer objects, float64 for scaled ones
+    columns: dict[str, np.ndarray] = field(default_factory=dict)
+    # {传感器 key: 该行是否有这个对象} | {sensor key: whether the row has this object}
+    present: dict[str, np.ndarray] = field(default_factory=dict)
+    # {事件 key: 事件代码列} | {event key: event code column}
+    events: dict[str, np.ndarray] = field(default_factory=dict)
+    # {事件 key: 事件值列（最后一个值，如 Dimmer 步数）}
+    # {event key: event value column (last value, e.g. Dimmer steps)}
+    event_values: dict[str, np.ndarray] = field(default_factory=dict)
+    # 找到的布局数 | Number of layouts found
+    layouts: int = 0
+
+
+def pack_payloads(payloads: Iterable[bytes]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    把负载列表打包成补零的字节矩阵和长度数组
+    Pack a list of payloads into a zero-padded byte matrix and a length array.
+
+    参数 | Args:
+        payloads: BTHome Service Data 列表 | BTHome service data list
+
+    返回 | Returns:
+        tuple: (uint8 矩阵 (N, 最大长度), 长度 (N,)) | (uint8 matrix (N, max length), lengths (N,))
+    """
+    payloads = list(payloads)
+    lengths = np.fromiter((len(payload) for payload in payloads), dtype=np.int64, count=len(payloads))
+    width = int(lengths.max()) if len(payloads) else 0
+    matrix = np.zeros((len(payloads), width), dtype=np.uint8)
+    for row, payload in enumerate(payloads):
+        matrix[row, :len(payload)] = np.frombuffer(payload, dtype=np.uint8)
+    return matrix, lengths
+
+
+def _field_values(fmt: str, offset: int) -> list[tuple[int, int, bool]]:
+    """
+    把 struct 格式拆成 (偏移, 字节数, 是否有符号)
+    Split a struct format into (offset, size, signed).
+    """
+    if fmt == "u24":
+        return [(offset, 3, False)]
+    values = []
+    for code in fmt:
+        size = struct.calcsize(f"<{code}")
+        values.append((offset, size, code.islower()))
+        offset += size
+    return values
+
+
+def _derive_layout(row: np.ndarray, length: int) -> tuple[list[int], list[_BatchField] | None]:
+    """
+    用与 decode_bthome 相同的规则遍历一行，得到布局
+    Walk one row with the same rules as decode_bthome to get its layout.
+
+    返回 | Returns:
+        tuple: (对象 ID 的位置, 字段列表；不支持时为 None)
+               (object ID positions, field list; None when unsupported)
+    """
+    data = bytes(row[:length])
+    device_info = data[0]
+    if (
+        device_info & BTHOME_DEVICE_INFO_ENCRYPT
+        or (device_info & BTHOME_DEVICE_INFO_VERSION_MASK) != BTHOME_VERSION_2
+    ):
+        return [], None
+
+    positions: list[int] = []
+    fields: list[_BatchField] = []
+    seen: dict[str, int] = {}
+    offset = 1
+    while offset < length:
+        object_id = data[offset]
+        positions.append(offset)
+        offset += 1
+        obj = bthome_object(object_id)
+        if obj is None:
+            # 与 decode_bthome 一样跳过 2 字节 | Skip 2 bytes like decode_bthome
+            offset += 2
+            continue
+        if obj.size == BTHOME_VARIABLE_LENGTH:
+            return positions, None
+        if offset + obj.size > length:
+            break
+
+        if obj.kind == KIND_META and object_id != BTHOME_PACKET_ID:
+            offset += obj.size
+            continue
+        key = f"{object_id:02x}_{obj.name.lower().replace(' ', '_')}"
+        seen[key] = seen.get(key, 0) + 1
+        if seen[key] > 1:
+            key = f"{key}_{seen[key]}"
+        fields.append(_BatchField(object_id, key, _field_values(obj.fmt, offset)))
+        offset += obj.size
+    return positions, fields
+
+
+def _read_column(matrix: np.ndarray, rows: np.ndarray, offset: int, size: int, signed: bool) -> np.ndarray:
+    """
+    读取小端整数列
+    Read a little-endian integer column.
+    """
+    column = np.zeros(len(rows), dtype=np.int64)
+    for index in range(size):
+        column |= matrix[rows, offset + index].astype(np.int64) << (8 * index)
+    if signed:
+        sign = np.int64(1) << (8 * size - 1)
+        column = np.where(column & sign, column - (sign << 1), column)
+    return column
+
+
+def _scale(object_id: int, raw: np.ndarray) -> np.ndarray:
+    """
+    按对象表缩放原始值，结果与 decode_bthome 完全一致
+    Scale raw values from the object table, exactly like decode_bthome.
+    """
+    obj = bthome_object(object_id)
+    if obj.divisor != 1:
+        return raw / obj.divisor
+    if obj.factor != 1:
+        # 对每个不同的原始值调用一次 round()，保证与标量解析一致
+        # Call round() once per distinct raw value to stay identical to the scalar parser
+        distinct, inverse = np.unique(raw, return_inverse=True)
+        scaled = np.array([round(int(value) * obj.factor, 2) for value in distinct], dtype=np.float64)
+        return scaled[inverse]
+    return raw
+
+
+def decode_bthome_batch(matrix: np.ndarray, lengths: np.ndarray | None = None) -> BTHomeBatch:
+    """
+    批量解码 BTHome 负载
+    Decode BTHome payloads in bulk.
+
+    参数 | Args:
+        matrix: uint8 矩阵 (N, 宽度)，每行一条负载（补零）| uint8 matrix (N, width), one payload per row (zero-padded)
+        lengths: 每行负载的长度，省略时为整行 | Payload length of each row, the full width when omitted
+
+    返回 | Returns:
+        BTHomeBatch: 按列组织的解码结果 | Column-oriented decoding result
+    """
+    matrix = np.asarray(matrix, dtype=np.uint8)
+    count, width = matrix.shape
+    if lengths is None:
+        lengths = np.full(count, width, dtype=np.int64)
+
+    batch = BTHomeBatch(
+        decoded=np.zeros(count, dtype=bool),
+        packet_id=np.full(count, -1, dtype=np.int16),
+    )
+    # 空行不解码 | Empty rows are not decoded
+    pending = lengths > 0
+
+    while pending.any():
+        first = int(np.argmax(pending))
+        length = int(lengths[first])
+        positions, fields = _derive_layout(matrix[first], length)
+
+        # 同一布局：长度、设备信息字节和对象 ID 都相同
+        # Same layout: same length, device info byte and object IDs
+        match = pending & (lengths == length) & (matrix[:, 0] == matrix[first, 0])
+        if positions:
+            match &= np.all(matrix[:, positions] == matrix[first, positions], axis=1)
+        pending &= ~match
+        if fields is None:
+            continue
+
+        batch.layouts += 1
+        rows = np.flatnonzero(match)
+        batch.decoded[rows] = True
+        for batch_field in fields:
+            object_id = batch_field.object_id
+            raws = [_read_column(matrix, rows, *value) for value in batch_field.values]
+            if object_id == BTHOME_PACKET_ID:
+                batch.packet_id[rows] = raws[0]
+                continue
+
+            if bthome_object(object_id).kind == KIND_EVENT:
+                targets = ((batch.events, raws[0]), (batch.event_values, raws[-1]))
+            else:
+                targets = ((batch.columns, _scale(object_id, raws[0])),)
+            for columns, values in targets:
+                column = columns.get(batch_field.key)
+                if column is None:
+                    column = columns[batch_field.key] = np.zeros(count, dtype=values.dtype)
+                elif column.dtype != values.dtype:
+                    column = columns[batch_field.key] = column.astype(np.result_type(column, values))
+                column[rows] = values
+            present = batch.present.setdefault(batch_field.key, np.zeros(count, dtype=bool))
+            present[rows] = True
+
+    return batch
@@ -31,27 +31,28 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from collections.abc import Mapping
 from typing import Any
 
 import aiohttp
 
 from homeassistant.components.camera import Camera
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import (
     DOMAIN,
-    MANUFACTURER,
     CONF_DEVICE_ID,
     CONF_HOST,
-    CONF_MODEL,
     CONF_CONNECTION_TYPE,
     CONNECTION_TYPE_WIFI,
     DEFAULT_CAMERA_PORT,
 )
+from .discovery import PlatformDiscovery
+from .entity_store import EntityRecord
 
 # 创建日志记录器 | Create logger
 _LOGGER = logging.getLogger(__name__)
@@ -102,17 +103,21 @@ async def _async_setup_wifi_cameras(
     # 设置 WiFi 摄像头平台 | Setting up WiFi camera platform
     _LOGGER.info("Setting up WiFi camera platform, device: %s", entry.data.get(CONF_DEVICE_ID))
 
+    # 发现管理器 - 根据发现差异添加、删除和更新摄像头
+    # Discovery manager - adds, removes and updates cameras from discovery diffs
+    manager = PlatformDiscovery(
+        hass,
+        "camera",
+        lambda record: SeeedHACamera(coordinator, record, entry, host),
+        async_add_entities,
+    )
+
     # 创建已发现的摄像头实体 | Create discovered camera entities
-    entities = []
-    for entity_id, entity_config in coordinator.device.entities.items():
-        # 只处理 camera 类型的实体 | Only process camera type entities
-        if entity_config.get("type") == "camera":
-            _LOGGER.info("Creating camera: %s (%s)", entity_id, entity_config.get("name"))
-            entities.append(SeeedHACamera(coordinator, entity_config, entry, host))
+    manager.async_apply(coordinator.device.entities.of_type("camera").values())
 
     # 如果没有发现摄像头实体，但设备是 ESP32-S3，尝试添加默认摄像头
     # If no camera entity discovered but device is ESP32-S3, try adding default camera
-    if not entities:
+    if not manager.entities:
         device_info = coordinator.device.device_info
         model = device_info.get("model", "").lower()
         
@@ -123,42 +128,30 @@ async def _async_setup_wifi_cameras(
             # 尝试连接摄像头端点 | Try to connect to camera endpoint
             if await _check_camera_available(hass, host):
                 _LOGGER.info("Camera endpoint found, creating default camera entity")
-                default_camera_config = {
+                default_camera = EntityRecord("camera", {
                     "id": "camera",
                     "name": "Camera",
                     "type": "camera",
-                }
-                entities.append(SeeedHACamera(coordinator, default_camera_config, entry, host))
-
-    # 添加实体到 HA | Add entities to HA
-    if entities:
-        async_add_entities(entities)
-        _LOGGER.info("Added %d cameras", len(entities))
+                })
+                manager.add_static(
+                    "camera", SeeedHACamera(coordinator, default_camera, entry, host)
+                )
 
     # 注册发现回调，处理后续发现的摄像头 | Register discovery callback
-    def handle_discovery(data: dict[str, Any]) -> None:
+    def handle_discovery(records: Mapping[str, EntityRecord], complete: bool) -> None:
         """
-        处理新发现的摄像头
-        Handle newly discovered cameras.
-        """
-        new_entities = []
-
-        for entity_id, entity_config in coordinator.device.entities.items():
-            if entity_config.get("type") == "camera":
-                # 检查实体是否已存在 | Check if entity already exists
-                existing_ids = [e._entity_id for e in entities]
-                if entity_id not in existing_ids:
-                    _LOGGER.info("Discovered new camera: %s", entity_id)
-                    new_entity = SeeedHACamera(coordinator, entity_config, entry, host)
-                    entities.append(new_entity)
-                    new_entities.append(new_entity)
+        处理设备发现（只收到 camera 类型的记录）
+        Handle discovery (only receives camera records).
 
-        if new_entities:
-            async_add_entities(new_entities)
-            _LOGGER.info("Dynamically added %d new cameras", len(new_entities))
+        新实体被创建，消失的实体被删除，配置变化的实体被更新。
+        New cameras are created, vanished ones removed and changed ones updated.
+        """
+        manager.async_apply(records.values(), complete)
 
-    # 注册回调 | Register callback
-    coordinator.device.add_discovery_callback(handle_discovery)
+    # 注册按类型路由的回调 | Register the type-routed callback
+    entry.async_on_unload(
+        coordinator.device.add_discovery_route("camera", handle_discovery)
+    )
 
 
 async def _check_camera_available(hass: HomeAssistant, host: str) -> bool:
@@ -201,7 +194,7 @@ class SeeedHACamera(Camera):
     def __init__(
         self,
         coordinator,
-        entity_config: dict[str, Any],
+        record: EntityRecord,
         entry: ConfigEntry,
         host: str,
     ) -> None:
@@ -211,7 +204,7 @@ class SeeedHACamera(Camera):
 
         参数 | Args:
             coordinator: 数据协调器 | Data coordinator
-            entity_config: 实体配置（来自设备发现）| Entity config (from device discovery)
+            record: 实体记录（配置来自设备发现）| Entity record (config from device discovery)
             entry: 配置入口 | Config entry
             host: 设备 IP 地址 | Device IP address
         """
@@ -219,89 +212,109 @@ class SeeedHACamera(Camera):
 
         self._coordinator = coordinator
         self._entry = entry
+        self._record = record
+        # 上次写入的可用性 | Availability last written
+        self._last_available = False
+        entity_config = record.config
         self._entity_config = entity_config
         self._host = host
 
         # 实体 ID（设备上报的 ID）| Entity ID (reported by device)
-        self._entity_id = entity_config.get("id", "camera")
+        self._entity_id = record.entity_id or "camera"
+
+        # 唯一 ID - 用于 HA 内部识别 | Unique ID - for HA internal identification
+        device_id = entry.data.get(CONF_DEVICE_ID, "")
+        self._attr_unique_id = f"{device_id}_{self._entity_id}"
 
-        # =====================================================================
         # 设置实体属性 | Set entity attributes
-        # =====================================================================
+        self._apply_config(entity_config)
+
+        # 帧间隔 - 静态图片刷新间隔
+        # Frame interval - still image refresh interval
+        self._attr_frame_interval = 0.25  # 4 fps | 4fps
 
+        # 摄像头初始化完成 | Camera initialization complete
+        _LOGGER.info(
+            "Camera initialized: %s (stream=%s)",
+            self._attr_name,
+            self._stream_url,
+        )
+
+    def _apply_config(self, entity_config: dict[str, Any]) -> None:
+        """
+        根据设备发现配置设置实体属性
+        Set entity attributes from the discovery config.
+        """
         # 实体名称 - 显示在 UI 上 | Entity name - displayed in UI
         self._attr_name = entity_config.get("name", "Camera")
 
-        # 唯一 ID - 用于 HA 内部识别 | Unique ID - for HA internal identification
-        device_id = entry.data.get(CONF_DEVICE_ID, "")
-        self._attr_unique_id = f"{device_id}_{self._entity_id}"
-
         # 获取摄像头端口（默认 82）| Get camera port (default 82)
         self._camera_port = entity_config.get("port", DEFAULT_CAMERA_PORT)
 
         # 构建 URL | Build URLs
         self._stream_url = entity_config.get(
             "stream_url",
-            f"http://{host}:{self._camera_port}/stream"
+            f"http://{self._host}:{self._camera_port}/stream"
         )
         self._still_url = entity_config.get(
             "still_url",
-            f"http://{host}:{self._camera_port}/camera"
+            f"http://{self._host}:{self._camera_port}/camera"
         )
 
         # 设置图标 | Set icon
         self._attr_icon = entity_config.get("icon", "mdi:camera")
 
-        # 帧间隔 - 静态图片刷新间隔
-        # Frame interval - still image refresh interval
-        self._attr_frame_interval = 0.25  # 4 fps | 4fps
-
-        # 摄像头初始化完成 | Camera initialization complete
-        _LOGGER.info(
-            "Camera initialized: %s (stream=%s)",
-            self._attr_name,
-            self._stream_url,
-        )
+    @callback
+    def async_apply_record(self, record: EntityRecord) -> None:
+        """
+        应用变化后的设备发现配置
+        Apply a changed discovery config.
+        """
+        self._record = record
+        self._entity_config = record.config
+        self._apply_config(record.config)
+        if self.hass is not None:
+            self.async_write_ha_state()
 
     @property
     def device_info(self) -> DeviceInfo:
         """
         返回设备信息
         Return device info.
+
+        同一设备的所有实体共享设备缓存的设备描述。
+        All entities of a device share the descriptor cached by the device.
         """
-        device_data = self._coordinator.device.device_info
-        entry_data = self._entry.data
-        
-        # 获取设备 IP 地址 | Get device IP address
-        host = entry_data.get("host", "")
-
-        info = DeviceInfo(
-            identifiers={(DOMAIN, entry_data.get(CONF_DEVICE_ID, ""))},
-            name=device_data.get("name", "Seeed HA Device"),
-            manufacturer=MANUFACTURER,
-            model=entry_data.get(CONF_MODEL, device_data.get("model", "ESP32")),
-            sw_version=device_data.get("version", "1.0.0"),
+        return self._coordinator.device.device_descriptor
+
+    async def async_added_to_hass(self) -> None:
+        """
+        实体添加到 HA 时监听协调器，可用性变化时写入状态
+        Listen to the coordinator once added, writing state when availability changes.
+        """
+        await super().async_added_to_hass()
+        self._last_available = self.available
+        self.async_on_remove(
+            self._coordinator.async_add_listener(self._handle_coordinator_update)
         )
-        
-        # 添加配置 URL（设备 IP 地址）| Add configuration URL (device IP)
-        if host:
-            info["configuration_url"] = f"http://{host}"
-        
-        # 添加 MAC 地址连接信息 | Add MAC address connection info
-        mac_address = entry_data.get("mac_address", "")
-        if mac_address:
-            from homeassistant.helpers.device_registry import CONNECTION_NETWORK_MAC
-            info["connections"] = {(CONNECTION_NETWORK_MAC, mac_address.lower())}
-        
-        return info
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """
+        协调器更新 - 只有可用性变化才写入状态
+        Coordinator update - state is only written when availability changes.
+        """
+        if (available := self.available) != self._last_available:
+            self._last_available = available
+            self.async_write_ha_state()
 
     @property
     def available(self) -> bool:
         """
-        返回实体是否可用
-        Return if entity is available.
+        返回实体是否可用（设备已连接且实体未过期）
+        Return if entity is available (device connected and entity not stale).
         """
-        return self._coordinator.device.connected
+        return self._coordinator.device.entity_available(self._record)
 
     async def async_camera_image(
         self, width: int | None = None, height: int | None = None
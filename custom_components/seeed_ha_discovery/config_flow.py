@@ -52,16 +52,27 @@ from .const import (
     CONF_MODEL,
     CONF_CONNECTION_TYPE,
     CONF_BLE_ADDRESS,
+    CONF_BLE_BIND_KEY,
     CONF_BLE_CONTROL,
     CONF_BLE_SUBSCRIBED_ENTITIES,
+    CONF_BLE_MAX_AGE,
     CONF_SUBSCRIBED_ENTITIES,
+    CONF_AGGREGATION_WINDOWS,
     CONNECTION_TYPE_WIFI,
     CONNECTION_TYPE_BLE,
+    DEFAULT_BLE_MAX_AGE,
     DEFAULT_HTTP_PORT,
     DEFAULT_WS_PORT,
+    BTHOME_SERVICE_UUID,
     SEEED_CONTROL_SERVICE_UUID,
 )
-from .bluetooth import parse_ble_advertisement, is_seeed_ble_device
+from .bluetooth import (
+    BTHomeDecryptor,
+    is_seeed_ble_device,
+    parse_ble_advertisement,
+    parse_bind_key,
+    parse_bthome_data,
+)
 
 # 创建日志记录器 | Create logger
 _LOGGER = logging.getLogger(__name__)
@@ -144,6 +155,10 @@ class SeeedHAConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self._ble_control: bool = False
         # BLE 设备的开关配置 | BLE switch configs
         self._switch_configs: list[dict[str, Any]] = []
+        # 发现时的 BTHome 负载（用于验证绑定密钥）| BTHome payload at discovery (to verify the bind key)
+        self._bthome_data: bytes | None = None
+        # BTHome 绑定密钥（加密设备）| BTHome bind key (encrypted devices)
+        self._bind_key: str | None = None
 
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
@@ -532,9 +547,66 @@ class SeeedHAConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         # 设置通知中显示的设备名称 | Set device name shown in notification
         self.context["title_placeholders"] = {"name": device.name}
 
+        # 加密的设备需要先输入绑定密钥 | Encrypted devices need a bind key first
+        if device.is_encrypted:
+            self._bthome_data = discovery_info.service_data.get(BTHOME_SERVICE_UUID)
+            return await self.async_step_bind_key()
+
         # 跳转到确认步骤 | Jump to confirm step
         return await self.async_step_bluetooth_confirm()
 
+    async def async_step_bind_key(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """
+        输入加密 BLE 设备的绑定密钥
+        Enter the bind key of an encrypted BLE device.
+
+        用发现时收到的广播验证密钥，解密成功后跳转到确认步骤。
+        The key is verified against the advertisement received at discovery;
+        once it decrypts, the flow moves on to the confirm step.
+
+        参数 | Args:
+            user_input: 用户输入的绑定密钥 | Bind key entered by the user
+
+        返回 | Returns:
+            FlowResult: 跳转到确认步骤或显示密钥表单 | Jump to confirm step or show key form
+        """
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            bind_key = parse_bind_key(user_input[CONF_BLE_BIND_KEY])
+            if bind_key is None:
+                errors[CONF_BLE_BIND_KEY] = "invalid_bind_key"
+            else:
+                decryptor = BTHomeDecryptor(self._ble_address, bind_key)
+                plaintext = decryptor.decrypt(self._bthome_data or b"")
+                if plaintext is None:
+                    errors[CONF_BLE_BIND_KEY] = "decryption_failed"
+                else:
+                    _LOGGER.info("Bind key verified for BLE device: %s", self._ble_address)
+                    self._bind_key = bind_key.hex()
+                    # 用解密后的数据显示传感器 | Show sensors from the decrypted data
+                    sensors = parse_bthome_data(plaintext)[0]
+                    self._ble_sensors = [
+                        f"{s.name}: {s.value} {s.unit or ''}" for s in sensors
+                    ]
+                    return await self.async_step_bluetooth_confirm()
+
+        return self.async_show_form(
+            step_id="bind_key",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_BLE_BIND_KEY): str,
+                }
+            ),
+            errors=errors,
+            description_placeholders={
+                "name": self._device_name,
+                "address": self._ble_address,
+            },
+        )
+
     async def async_step_bluetooth_confirm(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -563,6 +635,10 @@ class SeeedHAConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 CONF_CONNECTION_TYPE: CONNECTION_TYPE_BLE,
                 CONF_BLE_CONTROL: self._ble_control,
             }
+
+            # 加密设备保存绑定密钥 | Save the bind key of encrypted devices
+            if self._bind_key:
+                entry_data[CONF_BLE_BIND_KEY] = self._bind_key
             
             # 如果有开关配置，保存它 | If there are switch configs, save them
             if hasattr(self, '_switch_configs') and self._switch_configs:
@@ -692,12 +768,15 @@ class SeeedHAOptionsFlow(config_entries.OptionsFlow):
             return self.async_create_entry(
                 title="",
                 data={
-                    CONF_SUBSCRIBED_ENTITIES: user_input.get(CONF_SUBSCRIBED_ENTITIES, [])
+                    CONF_SUBSCRIBED_ENTITIES: user_input.get(CONF_SUBSCRIBED_ENTITIES, []),
+                    CONF_AGGREGATION_WINDOWS: user_input.get(CONF_AGGREGATION_WINDOWS) or {},
                 },
             )
 
         # 获取当前已选择的实体 | Get currently selected entities
         current_entities = self.config_entry.options.get(CONF_SUBSCRIBED_ENTITIES, [])
+        # 获取当前聚合窗口 | Get current aggregation windows
+        current_windows = self.config_entry.options.get(CONF_AGGREGATION_WINDOWS, {})
 
         # 显示实体选择表单 | Show entity selection form
         return self.async_show_form(
@@ -715,6 +794,11 @@ class SeeedHAOptionsFlow(config_entries.OptionsFlow):
                             domain=["sensor", "binary_sensor", "switch", "light", "climate", "weather"],
                         )
                     ),
+                    # 聚合窗口 - {设备实体 ID: 秒} | Aggregation windows - {device entity ID: seconds}
+                    vol.Optional(
+                        CONF_AGGREGATION_WINDOWS,
+                        default=current_windows,
+                    ): selector.ObjectSelector(),
                 }
             ),
             description_placeholders={
@@ -789,6 +873,9 @@ class SeeedHAOptionsFlow(config_entries.OptionsFlow):
                 title="",
                 data={
                     CONF_BLE_SUBSCRIBED_ENTITIES: entity_map,
+                    CONF_BLE_MAX_AGE: int(
+                        user_input.get(CONF_BLE_MAX_AGE, DEFAULT_BLE_MAX_AGE)
+                    ),
                 },
             )
 
@@ -800,6 +887,8 @@ class SeeedHAOptionsFlow(config_entries.OptionsFlow):
             entity_id = current_map.get(str(i), "")
             if entity_id:
                 current_entities.append(entity_id)
+        # 获取当前状态最长不写入时间 | Get current state max age
+        current_max_age = self.config_entry.options.get(CONF_BLE_MAX_AGE, DEFAULT_BLE_MAX_AGE)
 
         # 显示实体选择表单 | Show entity selection form
         return self.async_show_form(
@@ -817,6 +906,20 @@ class SeeedHAOptionsFlow(config_entries.OptionsFlow):
                             domain=["sensor", "binary_sensor", "switch", "light", "climate", "weather"],
                         )
                     ),
+                    # 值不变时多久重新写入一次状态（0 = 只在变化时写入）
+                    # How often an unchanged state is re-written (0 = on change only)
+                    vol.Optional(
+                        CONF_BLE_MAX_AGE,
+                        default=current_max_age,
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=0,
+                            max=86400,
+                            step=1,
+                            mode=selector.NumberSelectorMode.BOX,
+                            unit_of_measurement="s",
+                        )
+                    ),
                 }
             ),
             description_placeholders={
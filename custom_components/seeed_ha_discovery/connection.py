@@ -0,0 +1,771 @@
+"""
+Seeed HA Discovery - WiFi 连接管理
+Seeed HA Discovery - WiFi connection management.
+
+这个模块为 SeeedHADevice 的连接监督任务提供显式状态机：
+This module provides the explicit state machine behind SeeedHADevice's
+connection supervisor task:
+1. 每个设备只有一个监督任务负责连接、接收和重连，不会出现重叠连接
+   Each device has one supervisor task for connecting, receiving and
+   reconnecting, so connects never overlap
+2. 只允许定义过的状态转换，非法转换会被记录
+   Only defined transitions are allowed, illegal ones are logged
+3. 统计转换次数、各状态停留时间、套接字打开/关闭数和消息处理耗时
+   Counts transitions, time in each state, sockets opened/closed and
+   message handling time
+4. 有界接收队列把套接字读取和消息处理分开（IngestQueue）
+   A bounded ingest queue decouples socket reading from message processing (IngestQueue)
+5. 发送方向按水位检测拥塞，拥塞时暂缓 HA 状态推送（OutboundMonitor）
+   Outbound congestion is detected against watermarks and defers HA state
+   pushes while it lasts (OutboundMonitor)
+6. 按供电类型或观察到的流量调整存活检测，数据帧和 ping 都算存活证明（LivenessTracker）
+   Liveness detection adapts to the power profile or the observed traffic;
+   both data frames and pings count as proof of life (LivenessTracker)
+
+状态转换 | State transitions:
+    idle ──> connecting ──> connected ──> connecting (链路断开 | link lost)
+                 │              │
+                 │              └──> sleeping ──> connecting (设备休眠 | device sleep)
+                 └──> backoff ──> connecting (连接失败 | connect failed)
+    任意状态 ──> stopped (卸载 | unload)
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from enum import StrEnum
+from typing import Any, Callable
+
+from .const import (
+    HEARTBEAT_INTERVAL,
+    LIVENESS_EWMA_ALPHA,
+    LIVENESS_GAP_FACTOR,
+    LIVENESS_MIN_IDLE,
+    LIVENESS_PROBE_TIMEOUT,
+    LIVENESS_PROFILES,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ConnectionState(StrEnum):
+    """
+    WiFi 设备的连接状态
+    Connection state of a WiFi device.
+    """
+
+    # 尚未连接 | Not connected yet
+    IDLE = "idle"
+    # 正在获取 /info 并建立 WebSocket | Fetching /info and opening the WebSocket
+    CONNECTING = "connecting"
+    # WebSocket 已连接，正在接收消息 | WebSocket open, receiving messages
+    CONNECTED = "connected"
+    # 连接失败，等待重试 | Connect failed, waiting to retry
+    BACKOFF = "backoff"
+    # 设备通知进入休眠，立即重连 | Device announced sleep, reconnecting immediately
+    SLEEPING = "sleeping"
+    # 已卸载，不再重连 | Unloaded, no more reconnects
+    STOPPED = "stopped"
+
+
+# 允许的状态转换 | Allowed state transitions
+_TRANSITIONS: dict[ConnectionState, frozenset[ConnectionState]] = {
+    ConnectionState.IDLE: frozenset({ConnectionState.CONNECTING}),
+    ConnectionState.CONNECTING: frozenset(
+        {ConnectionState.CONNECTED, ConnectionState.BACKOFF, ConnectionState.IDLE}
+    ),
+    ConnectionState.CONNECTED: frozenset(
+        {ConnectionState.CONNECTING, ConnectionState.SLEEPING}
+    ),
+    ConnectionState.BACKOFF: frozenset({ConnectionState.CONNECTING}),
+    ConnectionState.SLEEPING: frozenset({ConnectionState.CONNECTING}),
+    ConnectionState.STOPPED: frozenset(),
+}
+
+
+class ConnectionStateMachine:
+    """
+    连接状态机
+    Connection state machine.
+
+    只做状态记录和统计，实际的连接工作由设备的监督任务完成。
+    Only records state and statistics; the device's supervisor task does
+    the actual connection work.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, name: str) -> None:
+        """
+        初始化状态机
+        Initialize the state machine.
+
+        参数 | Args:
+            loop: 事件循环 | Event loop
+            name: 用于日志的设备名称 | Device name for logging
+        """
+        self._loop = loop
+        self._name = name
+        self._state = ConnectionState.IDLE
+        self._entered = loop.time()
+
+        # 统计 | Statistics
+        self._transitions: dict[str, int] = {}
+        self._time_in_state: dict[ConnectionState, float] = dict.fromkeys(
+            ConnectionState, 0.0
+        )
+        self.connect_attempts = 0
+        self.connect_failures = 0
+        self.sockets_opened = 0
+        self.sockets_closed = 0
+        self.messages_handled = 0
+        self.handling_time = 0.0
+
+    @property
+    def state(self) -> ConnectionState:
+        """
+        当前状态
+        Current state.
+        """
+        return self._state
+
+    def transition(self, new_state: ConnectionState) -> bool:
+        """
+        转换到新状态
+        Transition to a new state.
+
+        任何状态都可以转换到 STOPPED；STOPPED 之后不再转换。
+        Any state may go to STOPPED; nothing leaves STOPPED.
+
+        参数 | Args:
+            new_state: 目标状态 | Target state
+
+        返回 | Returns:
+            bool: 转换是否被接受 | Whether the transition was accepted
+        """
+        old_state = self._state
+        if new_state == old_state:
+            return True
+        if new_state != ConnectionState.STOPPED and new_state not in _TRANSITIONS[old_state]:
+            _LOGGER.warning(
+                "Illegal connection transition %s -> %s (%s)", old_state, new_state, self._name
+            )
+            return False
+
+        now = self._loop.time()
+        self._time_in_state[old_state] += now - self._entered
+        self._entered = now
+        self._state = new_state
+
+        key = f"{old_state}->{new_state}"
+        self._transitions[key] = self._transitions.get(key, 0) + 1
+        _LOGGER.debug("Connection %s: %s -> %s", self._name, old_state, new_state)
+        return True
+
+    def record_handling(self, duration: float) -> None:
+        """
+        记录一条消息的处理耗时
+        Record the handling time of one message.
+        """
+        self.messages_handled += 1
+        self.handling_time += duration
+
+    def stats(self) -> dict[str, Any]:
+        """
+        返回连接统计
+        Return connection statistics.
+
+        open_sockets 应始终为 0 或 1，更大的值说明套接字泄漏。
+        open_sockets should always be 0 or 1; larger values indicate a socket leak.
+        """
+        time_in_state = dict(self._time_in_state)
+        time_in_state[self._state] += self._loop.time() - self._entered
+        return {
+            "state": str(self._state),
+            "transitions": dict(self._transitions),
+            "time_in_state": {
+                str(state): round(seconds, 3) for state, seconds in time_in_state.items()
+            },
+            "connect_attempts": self.connect_attempts,
+            "connect_failures": self.connect_failures,
+            "sockets_opened": self.sockets_opened,
+            "sockets_closed": self.sockets_closed,
+            "open_sockets": self.sockets_opened - self.sockets_closed,
+            "messages_handled": self.messages_handled,
+            "handling_time": round(self.handling_time, 3),
+        }
+
+
+class _QueuedFrame:
+    """
+    队列中的一帧
+    A frame in the ingest queue.
+    """
+
+    __slots__ = ("frame", "entity_id", "key", "index", "done")
+
+    def __init__(
+        self,
+        frame: dict[str, Any],
+        entity_id: str | None,
+        key: Any = None,
+        index: dict[Any, _QueuedFrame] | None = None,
+    ) -> None:
+        self.frame = frame
+        # state 帧的实体 ID，其他帧为 None | Entity ID of state frames, None otherwise
+        self.entity_id = entity_id
+        # 合并键及其所在的索引（不合并的帧为 None）
+        # Coalescing key and the index holding it (None for frames never coalesced)
+        self.key = key
+        self.index = index
+        # 已被取出或丢弃 | Already taken or dropped
+        self.done = False
+
+
+class IngestQueue:
+    """
+    有界接收队列
+    Bounded ingest queue.
+
+    把套接字读取和消息处理分开：读取端只解析 JSON 并入队，处理端逐帧处理，
+    处理变慢时不会阻塞读取。队列满时的丢弃策略：
+    Decouples socket reading from message processing: the reader only parses
+    JSON and enqueues, the processor handles frames one by one, so slow
+    processing never stalls reading. Overflow policy when full:
+    1. 新 state 帧替换同一实体仍在排队的旧 state 帧（被取代的帧先丢弃）
+       A new state frame replaces a queued state frame of the same entity
+       (superseded frames are dropped first)
+    2. 否则丢弃最旧的 state 帧
+       Otherwise the oldest queued state frame is dropped
+    3. 队列中没有 state 帧时丢弃新帧
+       With no queued state frames the new frame is dropped
+
+    控制帧不受队列是否已满影响，总是合并：每种类型只保留最新一帧（例如只有一个
+    待处理的 ping），discovery 按页合并，新的第 0 页会丢弃旧发现会话仍在排队的页。
+    这样控制帧也不会让队列超出上限。
+    Control frames are always coalesced, full or not: only the latest frame
+    of each type is kept (e.g. one pending ping), discovery is coalesced per
+    page, and a new page 0 drops the queued pages of the previous discovery
+    session. This keeps control frames within the bound as well.
+    """
+
+    def __init__(self, maxsize: int, state_type: str, discovery_type: str) -> None:
+        """
+        初始化队列
+        Initialize the queue.
+
+        参数 | Args:
+            maxsize: 最大排队帧数 | Maximum number of queued frames
+            state_type: 可丢弃的 state 消息类型 | Droppable state message type
+            discovery_type: 按页合并的 discovery 消息类型
+                            Discovery message type, coalesced per page
+        """
+        self._maxsize = maxsize
+        self._state_type = state_type
+        self._discovery_type = discovery_type
+        self._frames: deque[_QueuedFrame] = deque()
+        # 排队中的 state 帧（按到达顺序），用于找到最旧的 state 帧
+        # Queued state frames in arrival order, to find the oldest one
+        self._state_frames: deque[_QueuedFrame] = deque()
+        # 每个实体最新排队的 state 帧 | Latest queued state frame per entity
+        self._latest: dict[str, _QueuedFrame] = {}
+        # 每种控制帧类型最新排队的一帧 | Latest queued frame per control frame type
+        self._control: dict[Any, _QueuedFrame] = {}
+        # 当前发现会话排队中的页 | Queued pages of the current discovery session
+        self._pages: dict[Any, _QueuedFrame] = {}
+        self._size = 0
+        self._ready = asyncio.Event()
+        self._closed = False
+
+        # 统计 | Statistics
+        self.enqueued = 0
+        self.max_depth = 0
+        self.dropped_superseded = 0
+        self.dropped_oldest = 0
+        self.dropped_incoming = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        """
+        当前队列深度
+        Current queue depth.
+        """
+        return self._size
+
+    def reset(self) -> None:
+        """
+        清空队列并重新打开（每次建立连接时调用）
+        Empty and reopen the queue (called on every new connection).
+        """
+        self._frames.clear()
+        self._state_frames.clear()
+        self._latest.clear()
+        self._control.clear()
+        self._pages.clear()
+        self._size = 0
+        self._closed = False
+        self._ready.clear()
+
+    def close(self) -> None:
+        """
+        关闭队列，处理端取完剩余帧后结束
+        Close the queue; the processor ends after taking the remaining frames.
+        """
+        self._closed = True
+        self._ready.set()
+
+    def put(self, frame: dict[str, Any]) -> None:
+        """
+        放入一帧，必要时按丢弃策略腾出空间
+        Put a frame, making room by the overflow policy when needed.
+        """
+        msg_type = frame.get("type")
+        entity_id = None
+        key: Any = None
+        index: dict[Any, _QueuedFrame] | None = None
+        if msg_type == self._state_type:
+            if (entity_id := frame.get("entity_id")) is not None:
+                key, index = entity_id, self._latest
+        elif msg_type == self._discovery_type:
+            key, index = frame.get("page", 0), self._pages
+            if key == 0:
+                # 新的发现会话取代旧会话仍在排队的页
+                # A new discovery session supersedes the queued pages of the old one
+                for old in list(self._pages.values()):
+                    self._drop(old)
+                    self.coalesced += 1
+        else:
+            key, index = msg_type, self._control
+
+        if (
+            entity_id is None
+            and index is not None
+            and (old := index.get(key)) is not None
+        ):
+            # 控制帧总是合并，不占用额外空间 | Control frames always coalesce, taking no extra room
+            self._drop(old)
+            self.coalesced += 1
+        elif self._size >= self._maxsize and not self._make_room(entity_id):
+            self.dropped_incoming += 1
+            return
+
+        item = _QueuedFrame(frame, entity_id, key, index)
+        self._frames.append(item)
+        if entity_id is not None:
+            self._state_frames.append(item)
+        if index is not None:
+            index[key] = item
+        self._size += 1
+        self.enqueued += 1
+        self.max_depth = max(self.max_depth, self._size)
+        self._ready.set()
+
+    def _make_room(self, entity_id: str | None) -> bool:
+        """
+        按丢弃策略丢弃一帧
+        Drop one frame by the overflow policy.
+
+        返回 | Returns:
+            bool: 新帧是否可以入队 | Whether the new frame may be queued
+        """
+        # 1. 被新帧取代的同实体 state 帧 | State frame superseded by the new one
+        if entity_id is not None and (old := self._latest.get(entity_id)) is not None:
+            self._drop(old)
+            self.dropped_superseded += 1
+            return True
+
+        # 2. 最旧的 state 帧 | Oldest state frame
+        while self._state_frames:
+            oldest = self._state_frames.popleft()
+            if not oldest.done:
+                self._drop(oldest)
+                self.dropped_oldest += 1
+                return True
+
+        # 3. 没有可丢弃的帧：丢弃新帧 | 3. Nothing droppable: drop the new frame
+        return False
+
+    def _drop(self, item: _QueuedFrame) -> None:
+        """
+        丢弃一帧（惰性删除，取出时跳过）
+        Drop a frame (lazily, skipped when taken).
+        """
+        item.done = True
+        self._size -= 1
+        if (index := item.index) is not None and index.get(item.key) is item:
+            del index[item.key]
+
+    async def get(self) -> dict[str, Any] | None:
+        """
+        取出下一帧，队列为空时等待
+        Take the next frame, waiting while the queue is empty.
+
+        返回 | Returns:
+            dict | None: 下一帧；队列已关闭且为空时返回 None
+                         The next frame; None once the queue is closed and empty
+        """
+        frames = self._frames
+        while True:
+            while frames:
+                item = frames.popleft()
+                if item.done:
+                    continue
+                self._drop(item)
+                # 丢弃已处理的 state 帧引用 | Release references to taken state frames
+                state_frames = self._state_frames
+                while state_frames and state_frames[0].done:
+                    state_frames.popleft()
+                return item.frame
+            if self._closed:
+                return None
+            self._ready.clear()
+            await self._ready.wait()
+
+    def stats(self) -> dict[str, int]:
+        """
+        返回队列统计
+        Return queue statistics.
+        """
+        return {
+            "depth": self._size,
+            "max_depth": self.max_depth,
+            "capacity": self._maxsize,
+            "enqueued": self.enqueued,
+            "dropped_superseded": self.dropped_superseded,
+            "dropped_oldest": self.dropped_oldest,
+            "dropped_incoming": self.dropped_incoming,
+            "coalesced": self.coalesced,
+        }
+
+
+class OutboundMonitor:
+    """
+    发送方向的背压监测
+    Outbound backpressure monitor.
+
+    用套接字发送队列加上仍在发送中的字节数估计设备落后的字节数，
+    与高低水位比较（带滞回）判断是否拥塞。拥塞时设备会暂缓 HA 状态推送，
+    只保留每个实体的最新值；控制命令照常发送。
+    Estimates how far behind the device is from the socket send queue plus the
+    bytes still being sent, and compares it against high/low watermarks with
+    hysteresis. While congested the device
+    defers HA state pushes, keeping only the latest value per entity;
+    commands are still sent.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        high_watermark: int,
+        low_watermark: int,
+    ) -> None:
+        """
+        初始化监测器
+        Initialize the monitor.
+
+        参数 | Args:
+            loop: 事件循环 | Event loop
+            high_watermark: 进入拥塞的字节数 | Bytes at which congestion starts
+            low_watermark: 解除拥塞的字节数 | Bytes at which congestion ends
+        """
+        self._loop = loop
+        self._high = high_watermark
+        self._low = low_watermark
+        self._buffer_size: Callable[[], int] | None = None
+        self._in_flight = 0
+        self._congested = False
+        self._congested_since = 0.0
+
+        # 统计 | Statistics
+        self.bytes_sent = 0
+        self.max_outstanding = 0
+        self.congestion_events = 0
+        self.congested_time = 0.0
+        self.shed_pushes = 0
+        self.deferred_pushes = 0
+
+    def bind(self, buffer_size: Callable[[], int] | None) -> None:
+        """
+        绑定新连接的发送队列查询函数（连接关闭时为 None）
+        Bind the send queue query of a new connection (None once it closes).
+        """
+        self._buffer_size = buffer_size
+        self._in_flight = 0
+        self._update()
+
+    @property
+    def outstanding(self) -> int:
+        """
+        尚未被设备接收的字节数估计
+        Estimated bytes not yet taken by the device.
+        """
+        buffered = 0
+        if self._buffer_size is not None:
+            try:
+                buffered = self._buffer_size()
+            except Exception:  # noqa: BLE001
+                self._buffer_size = None
+        # 发送中的字节还在 aiohttp 中，尚未进入套接字，两者相加
+        # Bytes in flight are still inside aiohttp, not yet in the socket, so add both
+        return buffered + self._in_flight
+
+    @property
+    def congested(self) -> bool:
+        """
+        当前是否拥塞
+        Return if the connection is congested.
+        """
+        return self._update()
+
+    def begin(self, size: int) -> None:
+        """
+        开始发送一条消息
+        A message of size bytes starts being sent.
+        """
+        self._in_flight += size
+        self.bytes_sent += size
+
+    def end(self, size: int) -> None:
+        """
+        一条消息发送完成（或失败）
+        A message finished sending (or failed).
+        """
+        self._in_flight = max(0, self._in_flight - size)
+
+    def _update(self) -> bool:
+        """
+        按水位更新拥塞状态
+        Update congestion from the watermarks.
+        """
+        outstanding = self.outstanding
+        self.max_outstanding = max(self.max_outstanding, outstanding)
+        if not self._congested and outstanding >= self._high:
+            self._congested = True
+            self._congested_since = self._loop.time()
+            self.congestion_events += 1
+            _LOGGER.warning("Outbound congestion: %d bytes outstanding", outstanding)
+        elif self._congested and outstanding <= self._low:
+            self._congested = False
+            self.congested_time += self._loop.time() - self._congested_since
+            _LOGGER.info("Outbound congestion cleared")
+        return self._congested
+
+    def stats(self) -> dict[str, Any]:
+        """
+        返回背压统计
+        Return backpressure statistics.
+        """
+        congested_time = self.congested_time
+        if self._congested:
+            congested_time += self._loop.time() - self._congested_since
+        return {
+            "congested": self._congested,
+            "outstanding": self.outstanding,
+            "max_outstanding": self.max_outstanding,
+            "high_watermark": self._high,
+            "low_watermark": self._low,
+            "bytes_sent": self.bytes_sent,
+            "congestion_events": self.congestion_events,
+            "congested_time": round(congested_time, 3),
+            "deferred_pushes": self.deferred_pushes,
+            "shed_pushes": self.shed_pushes,
+        }
+
+
+class LivenessTracker:
+    """
+    自适应存活检测
+    Adaptive liveness detection.
+
+    任何收到的帧（数据、设备 ping、探测的 pong）都证明链路存活。
+    只有空闲超过 idle_timeout 才发送 WebSocket ping 探测，繁忙的链路不会产生额外探测；
+    探测在 probe_timeout 内没有任何响应时判定链路断开。
+    Any received frame (data, device ping, pong to a probe) proves the link is
+    alive. A WebSocket ping probe is only sent after idle_timeout without
+    traffic, so busy links carry no extra probes; the link is declared dead
+    when nothing arrives within probe_timeout of a probe.
+
+    idle_timeout 来自设备在 /info 中声明的供电类型；未声明时按设备主动发送的帧间隔
+    （指数加权平均）学习，但不会比 HEARTBEAT_INTERVAL 更慢。
+    idle_timeout comes from the power profile declared in /info; without one it
+    is learned from the gaps between unsolicited frames (EWMA), but is never
+    slower than HEARTBEAT_INTERVAL.
+
+    检测是惰性的：收到帧只更新时间戳，计时器到期时再检查。
+    Checking is lazy: a frame only updates a timestamp, the timer checks it
+    when it fires.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, name: str) -> None:
+        """
+        初始化存活检测
+        Initialize liveness detection.
+
+        参数 | Args:
+            loop: 事件循环 | Event loop
+            name: 日志中使用的名称（设备地址）| Name used in logs (device host)
+        """
+        self._loop = loop
+        self._name = name
+        self._profile: str | None = None
+        # 平均帧间隔跨连接保留 | The mean frame gap is kept across connections
+        self._mean_gap: float | None = None
+        self._last_seen = 0.0
+        self._last_unsolicited: float | None = None
+        self._probe_deadline: float | None = None
+        self._handle: asyncio.TimerHandle | None = None
+        self._probe: Callable[[], None] | None = None
+        self._expire: Callable[[], None] | None = None
+
+        # 统计 | Statistics
+        self.probes_sent = 0
+        self.probes_answered = 0
+        self.expirations = 0
+
+    def configure(self, profile: str | None) -> None:
+        """
+        设置设备声明的供电类型
+        Set the power profile declared by the device.
+        """
+        if profile is not None and profile not in LIVENESS_PROFILES:
+            _LOGGER.warning("Unknown power profile %s on %s", profile, self._name)
+            profile = None
+        self._profile = profile
+
+    @property
+    def idle_timeout(self) -> float:
+        """
+        无数据多久后发送探测（秒）
+        Idle time before a probe is sent (seconds).
+        """
+        if self._profile is not None:
+            return LIVENESS_PROFILES[self._profile][0]
+        if self._mean_gap is None:
+            return HEARTBEAT_INTERVAL
+        return min(
+            max(self._mean_gap * LIVENESS_GAP_FACTOR, LIVENESS_MIN_IDLE),
+            HEARTBEAT_INTERVAL,
+        )
+
+    @property
+    def probe_timeout(self) -> float:
+        """
+        等待探测响应的时间（秒）
+        Time to wait for a probe answer (seconds).
+        """
+        if self._profile is not None:
+            return LIVENESS_PROFILES[self._profile][1]
+        return LIVENESS_PROBE_TIMEOUT
+
+    def start(
+        self, probe: Callable[[], None], expire: Callable[[], None]
+    ) -> None:
+        """
+        开始检测一个新连接
+        Start watching a new connection.
+
+        参数 | Args:
+            probe: 发送探测 | Sends a probe
+            expire: 链路被判定断开时调用 | Called when the link is declared dead
+        """
+        self.stop()
+        self._probe = probe
+        self._expire = expire
+        self._last_seen = self._loop.time()
+        self._last_unsolicited = None
+        self._schedule(self._last_seen + self.idle_timeout)
+
+    def stop(self) -> None:
+        """
+        停止检测
+        Stop watching.
+        """
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self._probe = self._expire = None
+        self._probe_deadline = None
+
+    def observe(self, solicited: bool = False) -> None:
+        """
+        收到一帧
+        A frame was received.
+
+        参数 | Args:
+            solicited: 是否为探测的响应（不参与帧间隔学习）
+                       Whether it answers a probe (not used for gap learning)
+        """
+        now = self._loop.time()
+        self._last_seen = now
+        if self._probe_deadline is not None:
+            self._probe_deadline = None
+            self.probes_answered += 1
+        if solicited:
+            return
+        if self._last_unsolicited is not None:
+            gap = now - self._last_unsolicited
+            if self._mean_gap is None:
+                self._mean_gap = gap
+            else:
+                self._mean_gap += LIVENESS_EWMA_ALPHA * (gap - self._mean_gap)
+        self._last_unsolicited = now
+
+    def _schedule(self, when: float) -> None:
+        """
+        安排下一次检查
+        Schedule the next check.
+        """
+        self._handle = self._loop.call_at(when, self._check)
+
+    def _check(self) -> None:
+        """
+        检查链路是否空闲或探测是否超时
+        Check if the link is idle or a probe timed out.
+        """
+        self._handle = None
+        if self._expire is None:
+            return
+        now = self._loop.time()
+
+        if self._probe_deadline is not None:
+            if now < self._probe_deadline:
+                self._schedule(self._probe_deadline)
+                return
+            # 探测没有响应 | Probe was not answered
+            self.expirations += 1
+            _LOGGER.warning(
+                "No answer from %s for %.1f s, dropping link",
+                self._name, now - self._last_seen,
+            )
+            expire = self._expire
+            self.stop()
+            expire()
+            return
+
+        idle_until = self._last_seen + self.idle_timeout
+        if now < idle_until:
+            self._schedule(idle_until)
+            return
+
+        # 链路空闲，发送探测 | Link is idle, send a probe
+        self.probes_sent += 1
+        self._probe_deadline = now + self.probe_timeout
+        if self._probe is not None:
+            self._probe()
+        self._schedule(self._probe_deadline)
+
+    def stats(self) -> dict[str, Any]:
+        """
+        返回存活检测统计
+        Return liveness statistics.
+        """
+        return {
+            "power_profile": self._profile,
+            "idle_timeout": round(self.idle_timeout, 3),
+            "probe_timeout": self.probe_timeout,
+            "mean_frame_gap": (
+                round(self._mean_gap, 3) if self._mean_gap is not None else None
+            ),
+            "probes_sent": self.probes_sent,
+            "probes_answered": self.probes_answered,
+            "expirations": self.expirations,
+        }
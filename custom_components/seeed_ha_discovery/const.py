@@ -64,12 +64,80 @@ DEFAULT_CAMERA_PORT: Final = 82
 # 重连间隔（秒）| Reconnect interval in seconds
 RECONNECT_INTERVAL: Final = 5
 
+# 每个设备接收队列的最大帧数 | Maximum frames in each device's ingest queue
+INGEST_QUEUE_SIZE: Final = 256
+
+# 发送背压水位（字节）- 超过高水位时暂缓 HA 状态推送，降到低水位以下时恢复
+# Outbound backpressure watermarks (bytes) - HA state pushes are deferred above
+# the high watermark and resumed below the low watermark
+OUTBOUND_HIGH_WATERMARK: Final = 16384
+OUTBOUND_LOW_WATERMARK: Final = 4096
+
+# 拥塞时重试暂缓推送的间隔（秒）| Retry interval for deferred pushes while congested (seconds)
+OUTBOUND_RETRY_INTERVAL: Final = 0.5
+
+# 状态更新合并窗口（秒）- 窗口内的多个更新合并为一次实体刷新
+# State update coalescing window (seconds) - updates within it are flushed together
+COALESCE_WINDOW: Final = 0.005
+
+# 合并带来的最大额外延迟（秒）| Maximum latency added by coalescing (seconds)
+COALESCE_MAX_DELAY: Final = 0.05
+
+# 实体过期检测 - 超过 expected_interval 的倍数未上报时标记为不可用
+# Entity staleness - entities are marked unavailable after missing this many expected intervals
+STALE_INTERVAL_FACTOR: Final = 2
+
+# 设备发现中声明实体上报间隔（秒）的字段 | Discovery field declaring an entity's report interval (seconds)
+DISCOVERY_EXPECTED_INTERVAL: Final = "expected_interval"
+
+# 过期检测时间轮的刻度（秒）| Tick of the staleness timing wheel (seconds)
+TIMING_WHEEL_TICK: Final = 1.0
+
+# 集成共享的时间轮在 hass.data 中的键 | hass.data key of the integration-wide timing wheel
+DATA_TIMING_WHEEL: Final = f"{DOMAIN}_timing_wheel"
+
+# BLE 广播抓取与回放服务 | BLE advertisement capture and replay services
+SERVICE_START_CAPTURE: Final = "start_capture"
+SERVICE_STOP_CAPTURE: Final = "stop_capture"
+SERVICE_REPLAY: Final = "replay"
+ATTR_FILENAME: Final = "filename"
+ATTR_ADDRESS: Final = "address"
+ATTR_CONFIG_ENTRY_ID: Final = "config_entry_id"
+ATTR_SPEED: Final = "speed"
+# 进行中的 BLE 抓取在 hass.data 中的键 | hass.data key of the running BLE capture
+DATA_BLE_CAPTURE: Final = f"{DOMAIN}_ble_capture"
+
 # 心跳间隔（秒）
 # Heartbeat interval in seconds
 # 较短的心跳间隔可以更快检测到设备离线（如深度睡眠）
 # Shorter heartbeat allows faster detection of device offline (e.g. deep sleep)
 HEARTBEAT_INTERVAL: Final = 10
 
+# 供电类型 - 设备在 /info 中声明（power_profile）
+# Power profiles - declared by the device in /info (power_profile)
+POWER_PROFILE_MAINS: Final = "mains"
+POWER_PROFILE_BATTERY: Final = "battery"
+
+# 各供电类型的存活检测参数（秒）：(无数据多久后探测, 探测等待响应的时间)
+# 市电设备快速检测断线；电池设备很少探测，避免唤醒无线电
+# Liveness parameters per power profile (seconds): (idle time before probing,
+# time to wait for a probe answer). Mains devices are checked quickly; battery
+# devices are probed rarely so their radio is not kept awake
+LIVENESS_PROFILES: Final = {
+    POWER_PROFILE_MAINS: (3.0, 2.0),
+    POWER_PROFILE_BATTERY: (60.0, 10.0),
+}
+
+# 未声明供电类型时：探测等待时间，以及按观察到的帧间隔学习空闲时间
+# （平均间隔 × 系数，限制在最小值和 HEARTBEAT_INTERVAL 之间）
+# Without a declared profile: probe wait time, and the idle time learned from
+# observed frame gaps (mean gap × factor, clamped between the minimum and
+# HEARTBEAT_INTERVAL)
+LIVENESS_PROBE_TIMEOUT: Final = 5.0
+LIVENESS_GAP_FACTOR: Final = 3.0
+LIVENESS_MIN_IDLE: Final = 2.0
+LIVENESS_EWMA_ALPHA: Final = 0.2
+
 # =============================================================================
 # mDNS 配置 | mDNS Configuration
 # =============================================================================
@@ -116,6 +184,10 @@ MSG_TYPE_HA_STATE_CLEAR: Final = "ha_state_clear"
 # Device sleep notification - device is about to enter sleep mode
 MSG_TYPE_SLEEP: Final = "sleep"
 
+# 设备健康统计 - 设备定期上报堆内存、信号强度、运行时间和循环耗时
+# Device health stats - device periodically reports heap, RSSI, uptime and loop time
+MSG_TYPE_STATS: Final = "stats"
+
 # =============================================================================
 # 实体订阅配置 | Entity Subscription Configuration
 # =============================================================================
@@ -124,6 +196,33 @@ MSG_TYPE_SLEEP: Final = "sleep"
 # List of subscribed HA entities
 CONF_SUBSCRIBED_ENTITIES: Final = "subscribed_entities"
 
+# =============================================================================
+# 数据接入配置 | Ingest Configuration
+# =============================================================================
+
+# 每个实体的聚合窗口（秒），格式: {设备实体 ID: 秒}
+# Per-entity aggregation windows in seconds, format: {device entity ID: seconds}
+CONF_AGGREGATION_WINDOWS: Final = "aggregation_windows"
+
+# =============================================================================
+# 设备健康 | Device Health
+# =============================================================================
+
+# 每个设备保留的健康统计样本数 | Health samples kept per device
+HEALTH_HISTORY_SIZE: Final = 120
+
+# 计算堆内存趋势所需的最少样本数 | Minimum samples before a heap trend is computed
+HEALTH_TREND_MIN_SAMPLES: Final = 10
+
+# 堆内存持续下降超过这个速度（字节/小时）时怀疑内存泄漏
+# A leak is suspected when free heap keeps falling faster than this (bytes/hour)
+HEALTH_LEAK_SLOPE: Final = -2048
+
+# 在这个时间窗口（秒）内重启这么多次视为重启循环
+# This many reboots within this window (seconds) counts as a reboot loop
+HEALTH_REBOOT_WINDOW: Final = 3600
+HEALTH_REBOOT_LOOP_COUNT: Final = 3
+
 # =============================================================================
 # 支持的平台 | Supported Platforms
 # =============================================================================
@@ -156,6 +255,24 @@ SEEED_HA_STATE_CHAR_UUID: Final = "5eed0004-b5a3-f393-e0a9-e50e24dcca9e"
 # BLE HA 状态订阅配置
 CONF_BLE_SUBSCRIBED_ENTITIES: Final = "ble_subscribed_entities"
 
+# BLE 传感器状态最长不写入时间（秒），值不变时到期后仍会重新写入，0 表示只在变化时写入
+# Max age of a BLE sensor state in seconds; an unchanged value is re-written once
+# it expires, 0 writes on change only
+CONF_BLE_MAX_AGE: Final = "ble_max_age"
+DEFAULT_BLE_MAX_AGE: Final = 300
+
+# BLE 链路质量：RSSI 和广播间隔的 EWMA 平滑系数
+# BLE link quality: EWMA smoothing factor of RSSI and advertisement interval
+BLE_LINK_EWMA_ALPHA: Final = 0.2
+# 丢包率统计窗口（预期包数），超过后计数减半，让旧的丢包逐渐失去权重
+# Packet loss window (expected packets); counts are halved past it so old losses fade out
+BLE_LINK_LOSS_WINDOW: Final = 1000
+# 链路质量传感器的写入间隔（秒）| Write interval of the link quality sensors (seconds)
+BLE_LINK_UPDATE_INTERVAL: Final = 60
+
+# BTHome 加密广播的绑定密钥（32 位十六进制）| Bind key of encrypted BTHome advertisements (32 hex digits)
+CONF_BLE_BIND_KEY: Final = "bind_key"
+
 # 连接类型 | Connection type
 CONF_CONNECTION_TYPE: Final = "connection_type"
 CONNECTION_TYPE_WIFI: Final = "wifi"
@@ -193,6 +310,40 @@ BTHOME_SENSOR_TYPES: Final = {
     0x2E: {"name": "Humidity", "device_class": "humidity", "unit": "%"},
     0x45: {"name": "Temperature", "device_class": "temperature", "unit": "°C", "factor": 0.1},
     0x46: {"name": "UV Index", "device_class": None, "unit": "UV index"},
+    0x07: {"name": "Mass", "device_class": "weight", "unit": "lb", "factor": 0.01},
+    0x2F: {"name": "Moisture", "device_class": "moisture", "unit": "%"},
+    0x3D: {"name": "Count", "device_class": None, "unit": None},
+    0x3E: {"name": "Count", "device_class": None, "unit": None},
+    0x3F: {"name": "Rotation", "device_class": None, "unit": "°", "factor": 0.1},
+    0x40: {"name": "Distance", "device_class": "distance", "unit": "mm"},
+    0x41: {"name": "Distance", "device_class": "distance", "unit": "m", "factor": 0.1},
+    0x42: {"name": "Duration", "device_class": "duration", "unit": "s", "factor": 0.001},
+    0x43: {"name": "Current", "device_class": "current", "unit": "A", "factor": 0.001},
+    0x44: {"name": "Speed", "device_class": "speed", "unit": "m/s", "factor": 0.01},
+    0x47: {"name": "Volume", "device_class": "volume", "unit": "L", "factor": 0.1},
+    0x48: {"name": "Volume", "device_class": "volume", "unit": "mL"},
+    0x49: {"name": "Volume Flow Rate", "device_class": "volume_flow_rate", "unit": "m³/h", "factor": 0.001},
+    0x4A: {"name": "Voltage", "device_class": "voltage", "unit": "V", "factor": 0.1},
+    0x4B: {"name": "Gas", "device_class": "gas", "unit": "m³", "factor": 0.001},
+    0x4C: {"name": "Gas", "device_class": "gas", "unit": "m³", "factor": 0.001},
+    0x4D: {"name": "Energy", "device_class": "energy", "unit": "kWh", "factor": 0.001},
+    0x4E: {"name": "Volume", "device_class": "volume", "unit": "L", "factor": 0.001},
+    0x4F: {"name": "Water", "device_class": "water", "unit": "L", "factor": 0.001},
+    0x51: {"name": "Acceleration", "device_class": None, "unit": "m/s²", "factor": 0.001},
+    0x52: {"name": "Gyroscope", "device_class": None, "unit": "°/s", "factor": 0.001},
+    0x55: {"name": "Volume Storage", "device_class": "volume_storage", "unit": "L", "factor": 0.001},
+    0x56: {"name": "Conductivity", "device_class": "conductivity", "unit": "µS/cm"},
+    0x57: {"name": "Temperature", "device_class": "temperature", "unit": "°C"},
+    0x58: {"name": "Temperature", "device_class": "temperature", "unit": "°C", "factor": 0.35},
+    0x59: {"name": "Count", "device_class": None, "unit": None},
+    0x5A: {"name": "Count", "device_class": None, "unit": None},
+    0x5B: {"name": "Count", "device_class": None, "unit": None},
+    0x5C: {"name": "Power", "device_class": "power", "unit": "W", "factor": 0.01},
+    0x5D: {"name": "Current", "device_class": "current", "unit": "A", "factor": 0.001},
+    0x5E: {"name": "Direction", "device_class": None, "unit": "°", "factor": 0.01},
+    0x5F: {"name": "Precipitation", "device_class": "precipitation", "unit": "mm", "factor": 0.1},
+    0x60: {"name": "Channel", "device_class": None, "unit": None},
+    0x61: {"name": "Rotational Speed", "device_class": None, "unit": "rpm"},
 }
 
 # BTHome 二进制传感器类型映射
@@ -209,6 +360,27 @@ BTHOME_BINARY_SENSOR_TYPES: Final = {
     0x16: {"name": "Battery Charging", "device_class": None},
     0x20: {"name": "Occupancy", "device_class": None},
     0x21: {"name": "Motion", "device_class": None},
+    0x17: {"name": "Carbon Monoxide", "device_class": None},
+    0x18: {"name": "Cold", "device_class": None},
+    0x19: {"name": "Connectivity", "device_class": None},
+    0x1A: {"name": "Door", "device_class": None},
+    0x1B: {"name": "Garage Door", "device_class": None},
+    0x1C: {"name": "Gas", "device_class": None},
+    0x1D: {"name": "Heat", "device_class": None},
+    0x1E: {"name": "Light", "device_class": None},
+    0x1F: {"name": "Lock", "device_class": None},
+    0x22: {"name": "Moving", "device_class": None},
+    0x23: {"name": "Occupancy", "device_class": None},
+    0x24: {"name": "Plug", "device_class": None},
+    0x25: {"name": "Presence", "device_class": None},
+    0x26: {"name": "Problem", "device_class": None},
+    0x27: {"name": "Running", "device_class": None},
+    0x28: {"name": "Safety", "device_class": None},
+    0x29: {"name": "Smoke", "device_class": None},
+    0x2A: {"name": "Sound", "device_class": None},
+    0x2B: {"name": "Tamper", "device_class": None},
+    0x2C: {"name": "Vibration", "device_class": None},
+    0x2D: {"name": "Window", "device_class": None},
 }
 
 # BTHome 事件类型（如按钮）| BTHome event types (e.g., button)
@@ -222,4 +394,11 @@ BTHOME_EVENT_TYPES: Final = {
         0x05: "long_double_press",
         0x06: "long_triple_press",
     }},
+    # 调光旋钮：第一个字节是事件，第二个字节是步数
+    # Dimmer: the first byte is the event, the second the number of steps
+    0x3C: {"name": "Dimmer", "events": {
+        0x00: "none",
+        0x01: "rotate_left",
+        0x02: "rotate_right",
+    }},
 }
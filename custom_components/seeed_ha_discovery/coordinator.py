@@ -18,6 +18,8 @@ This module is the bridge between Home Assistant and devices:
   Device actively pushes data (push mode), instead of polling (poll mode)
 - 当收到新数据时，自动通知所有相关实体更新
   When new data is received, automatically notifies all related entities to update
+- 短时间内的突发更新会被合并为一次刷新
+  Bursts of updates within a short window are coalesced into one refresh
 """
 from __future__ import annotations
 
@@ -29,7 +31,7 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
-from .const import DOMAIN
+from .const import DOMAIN, COALESCE_WINDOW, COALESCE_MAX_DELAY
 from .device import SeeedHADevice
 
 # 创建日志记录器
@@ -85,6 +87,17 @@ class SeeedHACoordinator(DataUpdateCoordinator[dict[str, Any]]):
         # 发现完成事件 - 用于等待设备报告其实体
         self._discovery_complete = asyncio.Event()
 
+        # 更新合并 | Update coalescing
+        # 待执行的刷新定时器 | Pending flush timer
+        self._flush_handle: asyncio.TimerHandle | None = None
+        # 第一个待合并更新的时间 | Time of the first pending update
+        self._first_pending: float | None = None
+        # 当前批次中的更新数 | Updates in the current batch
+        self._pending_updates = 0
+        # 统计 | Statistics
+        self._updates_received = 0
+        self._flushes = 0
+
     async def async_connect(self) -> None:
         """
         连接到设备并设置回调
@@ -134,6 +147,11 @@ class SeeedHACoordinator(DataUpdateCoordinator[dict[str, Any]]):
         # 协调器断开连接 | Coordinator disconnecting
         _LOGGER.info("Coordinator disconnecting")
 
+        # 取消待执行的刷新 | Cancel pending flush
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
         # 移除状态回调
         if self._remove_state_callback:
             self._remove_state_callback()
@@ -169,9 +187,68 @@ class SeeedHACoordinator(DataUpdateCoordinator[dict[str, Any]]):
         # 收到状态更新 | Received state update
         _LOGGER.debug("Received state update: %s = %s", entity_id, state)
 
+        # 合并突发更新，窗口结束后统一刷新实体
+        # Coalesce bursts, entities are refreshed once when the window ends
+        self._schedule_flush()
+
+    @callback
+    def _schedule_flush(self) -> None:
+        """
+        安排一次合并刷新
+        Schedule a coalesced flush.
+
+        每个新更新把刷新推迟 COALESCE_WINDOW，但距离第一个待处理更新
+        不会超过 COALESCE_MAX_DELAY。
+        Every new update pushes the flush back by COALESCE_WINDOW, but never
+        later than COALESCE_MAX_DELAY after the first pending update.
+        """
+        loop = self.hass.loop
+        now = loop.time()
+
+        self._updates_received += 1
+        self._pending_updates += 1
+        if self._first_pending is None:
+            self._first_pending = now
+
+        deadline = min(now + COALESCE_WINDOW, self._first_pending + COALESCE_MAX_DELAY)
+        if self._flush_handle:
+            self._flush_handle.cancel()
+        self._flush_handle = loop.call_at(deadline, self._flush_updates)
+
+    @callback
+    def _flush_updates(self) -> None:
+        """
+        刷新所有待处理的更新
+        Flush all pending updates.
+
+        一次 async_set_updated_data 调用通知所有实体。
+        A single async_set_updated_data call notifies every entity.
+        """
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        if self._pending_updates > 1:
+            _LOGGER.debug("Coalesced %d updates into one refresh", self._pending_updates)
+
+        self._first_pending = None
+        self._pending_updates = 0
+        self._flushes += 1
+
         # 更新协调器数据，触发实体刷新
         self.async_set_updated_data({"entities": self.device.entities})
 
+    def coalesce_stats(self) -> dict[str, Any]:
+        """
+        获取更新合并统计
+        Return update coalescing statistics.
+        """
+        return {
+            "updates_received": self._updates_received,
+            "flushes": self._flushes,
+            "pending": self._pending_updates,
+        }
+
     @callback
     def _handle_discovery(self, data: dict[str, Any]) -> None:
         """
@@ -181,13 +258,19 @@ class SeeedHACoordinator(DataUpdateCoordinator[dict[str, Any]]):
         当设备报告其支持的实体列表时，这个回调会被触发。
         设置发现完成事件，并更新数据。
 
+        分页发现只在最后一页之后回调，data 为最后一页。
+        Paginated discovery calls back only after the final page; data is that page.
+
         参数 | Args:
             data: 发现数据
                   格式: {type: "discovery", entities: [{id, name, type, ...}, ...]}
         """
         entities = data.get("entities", [])
         # 收到设备发现 | Received device discovery
-        _LOGGER.info("Received device discovery: %d entities", len(entities))
+        _LOGGER.info(
+            "Received device discovery: %d entities",
+            data.get("total", len(entities)),
+        )
 
         # Log entity states for debugging | 记录实体状态用于调试
         for entity in entities:
@@ -202,9 +285,11 @@ class SeeedHACoordinator(DataUpdateCoordinator[dict[str, Any]]):
 
         # 更新数据 - 这会触发所有 CoordinatorEntity 刷新状态
         # Update data - this triggers all CoordinatorEntity to refresh state
+        # 立即刷新，同时带上尚未刷新的状态更新
+        # Flush immediately, including any state updates still pending
         _LOGGER.info("Triggering coordinator data update for %d entities", 
                     len(self.device.entities))
-        self.async_set_updated_data({"entities": self.device.entities})
+        self._flush_updates()
 
     async def _async_update_data(self) -> dict[str, Any]:
         """
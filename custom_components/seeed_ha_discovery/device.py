@@ -28,17 +28,26 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+import struct
+from collections.abc import Mapping
+from functools import partial
 from typing import Any, Callable
 
 import aiohttp
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.device_registry import CONNECTION_NETWORK_MAC, DeviceInfo
 
 from homeassistant.helpers.event import async_track_state_change_event
 
 from .const import (
+    DOMAIN,
+    MANUFACTURER,
+    CONF_DEVICE_ID,
+    CONF_MODEL,
     MSG_TYPE_PING,
     MSG_TYPE_PONG,
     MSG_TYPE_STATE,
@@ -47,14 +56,54 @@ from .const import (
     MSG_TYPE_HA_STATE,
     MSG_TYPE_HA_STATE_CLEAR,
     MSG_TYPE_SLEEP,
-    HEARTBEAT_INTERVAL,
+    MSG_TYPE_STATS,
+    DISCOVERY_EXPECTED_INTERVAL,
+    STALE_INTERVAL_FACTOR,
+    INGEST_QUEUE_SIZE,
+    OUTBOUND_HIGH_WATERMARK,
+    OUTBOUND_LOW_WATERMARK,
+    OUTBOUND_RETRY_INTERVAL,
     RECONNECT_INTERVAL,
     DEFAULT_HTTP_PORT,
 )
+from .connection import (
+    ConnectionState,
+    ConnectionStateMachine,
+    IngestQueue,
+    LivenessTracker,
+    OutboundMonitor,
+)
+from .entity_store import EntityRecord, EntityStore
+from .health import DeviceHealth
+from .timing_wheel import async_get_timing_wheel
+from .ingest import EntityIngest, WindowResult, as_number, build_entity_ingest
 
 # 创建日志记录器
 _LOGGER = logging.getLogger(__name__)
 
+# /info 中影响设备描述的字段，uptime、heap、RSSI 等常变字段不会使缓存失效
+# /info fields the device descriptor depends on; frequently changing fields
+# such as uptime, heap or RSSI do not invalidate the cache
+_DESCRIPTOR_FIELDS = ("name", "model", "version")
+
+
+class _DiscoverySession:
+    """
+    进行中的分页发现
+    A paginated discovery in progress.
+    """
+
+    __slots__ = ("entity_types", "discovered", "next_page")
+
+    def __init__(self, entity_types: set[str]) -> None:
+        # 发现前已有的实体类型 - 这些类型的实体可能被删除
+        # Entity types present before discovery - their entities may be removed
+        self.entity_types = entity_types
+        # 本次发现中已收到的实体 ID | Entity IDs received in this discovery
+        self.discovered: set[str] = set()
+        # 期望的下一页 | Expected next page
+        self.next_page = 0
+
 
 class SeeedHADevice:
     """
@@ -90,25 +139,68 @@ class SeeedHADevice:
         # WebSocket 连接对象
         self._ws: aiohttp.ClientWebSocketResponse | None = None
 
-        # 连接状态
-        self._connected = False
-
-        # 后台任务
-        self._reconnect_task: asyncio.Task | None = None  # 重连任务
-        self._receive_task: asyncio.Task | None = None     # 消息接收任务
+        # 连接状态机 - 由唯一的监督任务驱动
+        # Connection state machine - driven by the single supervisor task
+        self._connection = ConnectionStateMachine(hass.loop, host)
+        # 监督任务 - 负责接收消息和重连 | Supervisor task - receives messages and reconnects
+        self._supervisor_task: asyncio.Task | None = None
+        # 设备通知即将休眠 | Device announced it is going to sleep
+        self._sleep_requested = False
+        # 有界接收队列 - 读取端入队，处理端逐帧处理
+        # Bounded ingest queue - the reader enqueues, the processor handles frames
+        self._ingest_queue = IngestQueue(
+            INGEST_QUEUE_SIZE, MSG_TYPE_STATE, MSG_TYPE_DISCOVERY
+        )
+        # 正在发送的 pong，同一时间只有一个 | Pong being sent, at most one at a time
+        self._pong_task: asyncio.Task | None = None
+        # 发送背压监测 - 拥塞时暂缓 HA 状态推送
+        # Outbound backpressure monitor - defers HA state pushes while congested
+        self._outbound = OutboundMonitor(
+            hass.loop, OUTBOUND_HIGH_WATERMARK, OUTBOUND_LOW_WATERMARK
+        )
+        # 暂缓的 HA 状态推送，每个实体只保留最新一条
+        # Deferred HA state pushes, only the latest one per entity is kept
+        self._deferred_pushes: dict[str, dict[str, Any]] = {}
+        self._deferred_handle: asyncio.TimerHandle | None = None
+        # 存活检测 - 按供电类型或观察到的流量决定何时探测
+        # Liveness detection - probes based on the power profile or observed traffic
+        self._liveness = LivenessTracker(hass.loop, host)
 
         # 回调函数列表
         # 状态更新回调 - 当收到传感器数据时调用
         self._state_callbacks: list[Callable[[dict[str, Any]], None]] = []
         # 发现回调 - 当收到设备实体列表时调用
         self._discovery_callbacks: list[Callable[[dict[str, Any]], None]] = []
-
-        # 设备上报的实体数据
-        # 格式: {entity_id: {type, name, state, unit, ...}}
-        self._entities: dict[str, dict[str, Any]] = {}
+        # 发现路由 - 按实体类型分桶，只接收该类型的记录
+        # Discovery routes - bucketed by entity type, receive only records of that type
+        self._discovery_routes: dict[
+            str, list[Callable[[Mapping[str, EntityRecord], bool], None]]
+        ] = {}
+        # 进行中的分页发现 | Paginated discovery in progress
+        self._discovery_session: _DiscoverySession | None = None
+
+        # 设备上报的实体数据，每个实体一个记录（配置与状态分开）
+        # Entities reported by the device, one record each (config kept apart from state)
+        self._entities = EntityStore()
 
         # 设备基本信息（型号、版本等）
         self._device_info: dict[str, Any] = {}
+        # 缓存的 HA 设备描述，所有实体共享，/info 中的名称、型号或版本变化时失效
+        # Cached HA device descriptor shared by all entities, invalidated when
+        # the name, model or version in /info changes
+        self._device_descriptor: DeviceInfo | None = None
+        self._descriptor_key: tuple[Any, ...] | None = None
+        # 设备定期上报的健康统计 | Health telemetry reported periodically by the device
+        self._health = DeviceHealth(host)
+
+        # =========================================================================
+        # 数据接入处理 | Ingest Processing
+        # =========================================================================
+
+        # 每个实体的处理管线保存在其记录中（record.ingest）
+        # Per-entity ingest pipelines live on their records (record.ingest)
+        # 用户选项中的聚合窗口 | Aggregation windows from options
+        self._aggregation_windows: dict[str, float] = {}
 
         # =========================================================================
         # HA 实体订阅相关 | HA Entity Subscription
@@ -125,7 +217,27 @@ class SeeedHADevice:
         获取连接状态
         Return if device is connected.
         """
-        return self._connected
+        return self._connection.state == ConnectionState.CONNECTED
+
+    @property
+    def connection_state(self) -> ConnectionState:
+        """
+        获取连接状态机的当前状态
+        Return the current state of the connection state machine.
+        """
+        return self._connection.state
+
+    def connection_stats(self) -> dict[str, Any]:
+        """
+        返回连接统计（用于诊断）
+        Return connection statistics (for diagnostics).
+        """
+        return {
+            **self._connection.stats(),
+            "ingest_queue": self._ingest_queue.stats(),
+            "outbound": self._outbound.stats(),
+            "liveness": self._liveness.stats(),
+        }
 
     @property
     def device_info(self) -> dict[str, Any]:
@@ -136,7 +248,100 @@ class SeeedHADevice:
         return self._device_info
 
     @property
-    def entities(self) -> dict[str, dict[str, Any]]:
+    def health(self) -> DeviceHealth:
+        """
+        获取设备健康统计
+        Return device health telemetry.
+        """
+        return self._health
+
+    @property
+    def device_descriptor(self) -> DeviceInfo:
+        """
+        获取 HA 设备描述（所有实体共享）
+        Return the HA device descriptor shared by all entities.
+
+        根据 /info 和配置入口数据构建一次，_DESCRIPTOR_FIELDS 变化时重新构建。
+        Built once from /info and the entry data, rebuilt when _DESCRIPTOR_FIELDS change.
+        """
+        if self._device_descriptor is None:
+            self._device_descriptor = self._build_device_descriptor()
+        return self._device_descriptor
+
+    def _build_device_descriptor(self) -> DeviceInfo:
+        """
+        构建 HA 设备描述
+        Build the HA device descriptor.
+
+        这个描述定义了设备在 HA 设备页面的显示信息。
+        This descriptor defines how the device is shown on the HA device page.
+        """
+        device_data = self._device_info
+        entry_data = self.entry.data
+
+        # 获取设备 IP 地址 | Get device IP address
+        host = entry_data.get("host", "")
+
+        # 构建设备信息 | Build device info
+        info = DeviceInfo(
+            # 设备标识符 - 用于关联实体到设备 | Device identifier
+            identifiers={(DOMAIN, entry_data.get(CONF_DEVICE_ID, ""))},
+            # 设备名称 | Device name
+            name=device_data.get("name", "Seeed HA Device"),
+            # 制造商 | Manufacturer
+            manufacturer=MANUFACTURER,
+            # 设备型号 | Device model
+            model=entry_data.get(CONF_MODEL, device_data.get("model", "ESP32")),
+            # 固件版本 | Firmware version
+            sw_version=device_data.get("version", "1.0.0"),
+        )
+
+        # 添加配置 URL（设备 IP 地址）| Add configuration URL (device IP)
+        if host:
+            info["configuration_url"] = f"http://{host}"
+
+        # 添加 MAC 地址连接信息 | Add MAC address connection info
+        mac_address = entry_data.get("mac_address", "")
+        if mac_address:
+            info["connections"] = {(CONNECTION_NETWORK_MAC, mac_address.lower())}
+
+        return info
+
+    def _update_device_info(self, device_info: dict[str, Any]) -> None:
+        """
+        保存 /info 返回的设备信息
+        Store the device info returned by /info.
+
+        只有 _DESCRIPTOR_FIELDS 变化时才使缓存的设备描述失效；固件版本变化时
+        同步更新设备注册表。
+        Invalidates the cached descriptor only when _DESCRIPTOR_FIELDS change; a
+        firmware version change is also written to the device registry.
+        """
+        old_version = self._device_info.get("version")
+        self._device_info = device_info
+        self._liveness.configure(device_info.get("power_profile"))
+
+        descriptor_key = tuple(device_info.get(field) for field in _DESCRIPTOR_FIELDS)
+        if descriptor_key == self._descriptor_key:
+            return
+        self._descriptor_key = descriptor_key
+        self._device_descriptor = None
+
+        new_version = device_info.get("version")
+        if old_version is None or new_version == old_version:
+            return
+
+        # 固件已更新 | Firmware was updated
+        _LOGGER.info("Firmware version changed: %s -> %s (%s)", old_version, new_version, self.host)
+        registry = dr.async_get(self.hass)
+        device = registry.async_get_device(
+            identifiers={(DOMAIN, self.entry.data.get(CONF_DEVICE_ID, ""))}
+        )
+        if device is not None:
+            registry.async_update_device(device.id, sw_version=new_version or "1.0.0")
+
+    @property
+    def entities(self) -> EntityStore:
         """
         获取已发现的实体
         Return discovered entities.
@@ -191,20 +396,264 @@ class SeeedHADevice:
 
         return remove_callback
 
+    def add_discovery_route(
+        self,
+        entity_type: str,
+        callback: Callable[[Mapping[str, EntityRecord], bool], None],
+    ) -> Callable[[], None]:
+        """
+        添加按实体类型路由的发现回调
+        Add a discovery callback routed by entity type.
+
+        每次发现后，只有实体类型受影响的回调会被调用，
+        并且只收到该类型的记录，无需扫描全部实体。
+        After each discovery only callbacks of affected entity types are called,
+        and they only receive records of that type instead of scanning all entities.
+
+        分页发现时，中间页只传入本页的记录（complete=False），
+        最后一页传入该类型的全部记录（complete=True），此时才应删除消失的实体。
+        With paginated discovery intermediate pages pass only that page's records
+        (complete=False); the final page passes all records of the type
+        (complete=True), and only then should vanished entities be removed.
+
+        参数 | Args:
+            entity_type: 实体类型（sensor / switch / camera）| Entity type
+            callback: 回调函数，接收 ({实体 ID: 记录}, complete)
+                      Callback receiving ({entity ID: record}, complete)
+
+        返回 | Returns:
+            移除回调的函数 | Function to remove the callback
+        """
+        routes = self._discovery_routes.setdefault(entity_type, [])
+        routes.append(callback)
+
+        def remove_route() -> None:
+            """移除回调 | Remove callback"""
+            routes.remove(callback)
+
+        return remove_route
+
     async def async_connect(self) -> bool:
         """
         连接到设备
         Connect to the device.
 
+        首次连接在这里完成，成功后启动监督任务；之后的接收和重连都由监督任务负责。
+        监督任务已在运行时不会再次连接。
+        The first connect happens here and starts the supervisor task on success;
+        receiving and reconnecting are handled by the supervisor afterwards.
+        Does not connect again while the supervisor is running.
+
+        返回 | Returns:
+            bool: 连接是否成功
+        """
+        if self._supervisor_task is not None:
+            return self.connected
+
+        if self._connection.state == ConnectionState.STOPPED:
+            return False
+
+        self._transition(ConnectionState.CONNECTING)
+        if not await self._async_open():
+            self._transition(ConnectionState.IDLE)
+            return False
+
+        self._transition(ConnectionState.CONNECTED)
+        self._supervisor_task = self.hass.async_create_background_task(
+            self._async_supervise(), f"seeed_ha_discovery supervisor {self.host}"
+        )
+        return True
+
+    async def async_disconnect(self) -> None:
+        """
+        断开与设备的连接
+        Disconnect from the device.
+
+        停止监督任务并清理所有连接资源。
+        Stops the supervisor task and cleans up all connection resources.
+        """
+        # 正在断开连接 | Disconnecting
+        _LOGGER.info("Disconnecting: %s", self.host)
+        self._transition(ConnectionState.STOPPED)
+
+        # 取消 HA 实体状态监听 | Cancel HA entity state listener
+        if self._state_unsub:
+            self._state_unsub()
+            self._state_unsub = None
+
+        # 取消聚合窗口定时器和过期检测 | Cancel aggregation window timers and staleness checks
+        for record in self._entities.values():
+            if (pipeline := record.ingest) is not None and pipeline.flush_handle:
+                pipeline.flush_handle.cancel()
+                pipeline.flush_handle = None
+            if record.watchdog is not None:
+                record.watchdog.cancel()
+                record.watchdog = None
+
+        # 丢弃暂缓的推送 | Drop deferred pushes
+        self._clear_deferred_pushes()
+
+        # 停止监督任务 | Stop the supervisor task
+        if self._supervisor_task:
+            self._supervisor_task.cancel()
+            try:
+                await self._supervisor_task
+            except asyncio.CancelledError:
+                pass
+            self._supervisor_task = None
+
+        # 关闭 WebSocket 连接
+        await self._async_close_socket()
+
+        # 已断开连接 | Disconnected
+        _LOGGER.info("Disconnected: %s", self.host)
+
+    async def _async_supervise(self) -> None:
+        """
+        连接监督任务
+        Connection supervisor task.
+
+        每个设备唯一的长期任务，按状态机循环：接收消息直到链路断开，
+        然后立即重连；连接失败时等待 RECONNECT_INTERVAL 后重试。
+        The single long-lived task of a device, looping through the state
+        machine: receive until the link drops, then reconnect immediately;
+        failed connects are retried after RECONNECT_INTERVAL.
+        """
+        connection = self._connection
+        while connection.state != ConnectionState.STOPPED:
+            if connection.state == ConnectionState.CONNECTED:
+                await self._async_run_connection()
+                await self._async_close_socket()
+                if connection.state == ConnectionState.STOPPED:
+                    break
+
+                if self._sleep_requested:
+                    # 设备休眠 - 立即开始重连 | Device sleeping - reconnect immediately
+                    self._sleep_requested = False
+                    self._transition(ConnectionState.SLEEPING)
+
+            # 离开 CONNECTED 时通知，实体在重连期间不可用
+            # Leaving CONNECTED notifies, so entities are unavailable while reconnecting
+            self._transition(ConnectionState.CONNECTING)
+            if await self._async_open():
+                self._transition(ConnectionState.CONNECTED)
+                continue
+
+            self._transition(ConnectionState.BACKOFF)
+            await asyncio.sleep(RECONNECT_INTERVAL)
+
+    def _transition(self, new_state: ConnectionState) -> None:
+        """
+        转换连接状态，connected 改变时通知状态回调
+        Transition the connection state and notify state callbacks when connected changes.
+
+        参数 | Args:
+            new_state: 目标状态 | Target state
+        """
+        was_connected = self.connected
+        self._connection.transition(new_state)
+        if self.connected != was_connected:
+            self._notify_connection_change()
+
+    async def _async_run_connection(self) -> None:
+        """
+        运行一次已建立的连接，直到链路断开
+        Run one established connection until the link drops.
+
+        读取和处理分开进行：接收循环只负责读取和入队，
+        处理任务从队列中取帧处理；链路断开后先处理完已排队的帧。
+        Reading and processing run separately: the receive loop only reads and
+        enqueues, the processor task takes frames from the queue; frames already
+        queued are handled after the link drops.
+        """
+        queue = self._ingest_queue
+        queue.reset()
+        processor = self.hass.async_create_background_task(
+            self._async_process_frames(), f"seeed_ha_discovery processor {self.host}"
+        )
+        self._liveness.start(self._send_liveness_probe, self._on_liveness_expired)
+        try:
+            await self._async_receive_loop()
+            queue.close()
+            await processor
+        finally:
+            self._liveness.stop()
+            if not processor.done():
+                processor.cancel()
+
+    def _send_liveness_probe(self) -> None:
+        """
+        链路空闲 - 发送 WebSocket ping 探测
+        Link is idle - send a WebSocket ping probe.
+        """
+        if (ws := self._ws) is None or ws.closed:
+            return
+        self.hass.async_create_background_task(
+            self._async_ping(ws), f"{DOMAIN}_ping_{self.host}"
+        )
+
+    async def _async_ping(self, ws: aiohttp.ClientWebSocketResponse) -> None:
+        """
+        发送 WebSocket ping
+        Send a WebSocket ping.
+        """
+        try:
+            await ws.ping()
+        except Exception as err:  # noqa: BLE001
+            _LOGGER.debug("Failed to ping %s: %s", self.host, err)
+
+    async def _async_pong(
+        self, ws: aiohttp.ClientWebSocketResponse, data: bytes
+    ) -> None:
+        """
+        回复 WebSocket ping
+        Answer a WebSocket ping.
+        """
+        try:
+            await ws.pong(data)
+        except Exception as err:  # noqa: BLE001
+            _LOGGER.debug("Failed to pong %s: %s", self.host, err)
+
+    def _on_liveness_expired(self) -> None:
+        """
+        探测超时 - 关闭套接字，接收循环结束后由监督任务重连
+        Probe timed out - close the socket; the supervisor reconnects once the
+        receive loop ends.
+        """
+        self.hass.async_create_background_task(
+            self._async_close_socket(), f"{DOMAIN}_close_{self.host}"
+        )
+
+    async def _async_process_frames(self) -> None:
+        """
+        消息处理任务 - 逐帧处理接收队列
+        Processor task - handles the ingest queue frame by frame.
+        """
+        queue = self._ingest_queue
+        loop = self.hass.loop
+        while (data := await queue.get()) is not None:
+            started = loop.time()
+            try:
+                await self._async_handle_message(data)
+            except Exception:  # noqa: BLE001
+                _LOGGER.exception("Error handling message from %s", self.host)
+            self._connection.record_handling(loop.time() - started)
+
+    async def _async_open(self) -> bool:
+        """
+        建立连接
+        Open the connection.
+
         执行以下步骤：
         1. 通过 HTTP 获取设备信息
         2. 建立 WebSocket 连接
-        3. 启动消息接收任务
-        4. 请求设备发送实体发现信息
+        3. 请求设备发送实体发现信息
+        4. 推送订阅实体的当前状态
 
         返回 | Returns:
             bool: 连接是否成功
         """
+        self._connection.connect_attempts += 1
         try:
             # 步骤 1: 获取设备信息 | Step 1: Get device info
             _LOGGER.info("Getting device info: %s", self.host)
@@ -216,24 +665,32 @@ class SeeedHADevice:
 
             _LOGGER.info("Connecting to WebSocket: %s", ws_url)
 
+            # 关闭可能残留的旧连接，保证同一时间只有一个套接字
+            # Close any leftover socket so only one is ever open
+            await self._async_close_socket()
             self._ws = await session.ws_connect(
                 ws_url,
-                heartbeat=HEARTBEAT_INTERVAL,  # 自动心跳
+                # 心跳由存活检测负责，ping/pong 帧在接收循环中处理
+                # Liveness detection does the heartbeat; ping/pong frames are
+                # handled in the receive loop
+                autoping=False,
                 timeout=aiohttp.ClientTimeout(total=10),
             )
+            self._connection.sockets_opened += 1
+            self._outbound.bind(self._socket_buffer_size(self._ws))
+            # 连接后会重新推送全部订阅状态，旧的暂缓推送不再需要
+            # All subscribed states are re-pushed after connecting, so older
+            # deferred pushes are no longer needed
+            self._clear_deferred_pushes()
 
-            self._connected = True
             # WebSocket 连接成功 | WebSocket connected
             _LOGGER.info("WebSocket connected: %s", self.host)
 
-            # 步骤 3: 启动消息接收循环
-            self._receive_task = asyncio.create_task(self._async_receive_loop())
-
-            # 步骤 4: 请求设备发送实体信息
+            # 步骤 3: 请求设备发送实体信息
             await self.async_request_discovery()
 
-            # 步骤 5: 如果有订阅实体，推送当前状态（确保设备重启后能收到状态）
-            # Step 5: If there are subscribed entities, push current states
+            # 步骤 4: 如果有订阅实体，推送当前状态（确保设备重启后能收到状态）
+            # Step 4: If there are subscribed entities, push current states
             # (ensures device receives states after restart)
             if self._subscribed_entities:
                 _LOGGER.info("Pushing %d subscribed entity states after connect", 
@@ -249,54 +706,43 @@ class SeeedHADevice:
 
             return True
 
+        except asyncio.CancelledError:
+            await self._async_close_socket()
+            raise
         except Exception as err:
             # 连接失败 | Connection failed
             _LOGGER.error("Connection failed %s: %s", self.host, err)
-            self._connected = False
+            self._connection.connect_failures += 1
+            await self._async_close_socket()
             return False
 
-    async def async_disconnect(self) -> None:
+    async def _async_close_socket(self) -> None:
         """
-        断开与设备的连接
-        Disconnect from the device.
-
-        清理所有后台任务和连接资源。
-        Cleans up all background tasks and connection resources.
+        关闭当前 WebSocket（可重复调用）
+        Close the current WebSocket (idempotent).
         """
-        # 正在断开连接 | Disconnecting
-        _LOGGER.info("Disconnecting: %s", self.host)
-        self._connected = False
-
-        # 取消 HA 实体状态监听 | Cancel HA entity state listener
-        if self._state_unsub:
-            self._state_unsub()
-            self._state_unsub = None
-
-        # 取消接收任务
-        if self._receive_task:
-            self._receive_task.cancel()
+        if (ws := self._ws) is None:
+            return
+        self._ws = None
+        self._connection.sockets_closed += 1
+        self._outbound.bind(None)
+        if not ws.closed:
             try:
-                await self._receive_task
-            except asyncio.CancelledError:
-                pass
-            self._receive_task = None
+                await ws.close()
+            except Exception as err:  # noqa: BLE001
+                _LOGGER.debug("Error closing WebSocket %s: %s", self.host, err)
 
-        # 取消重连任务
-        if self._reconnect_task:
-            self._reconnect_task.cancel()
+    def _notify_connection_change(self) -> None:
+        """
+        通知状态回调设备连接状态变化，让实体刷新可用性
+        Notify state callbacks of a connection change so entities refresh availability.
+        """
+        data = {"type": MSG_TYPE_STATE, "connected": self.connected}
+        for callback in self._state_callbacks:
             try:
-                await self._reconnect_task
-            except asyncio.CancelledError:
-                pass
-            self._reconnect_task = None
-
-        # 关闭 WebSocket 连接
-        if self._ws and not self._ws.closed:
-            await self._ws.close()
-            self._ws = None
-
-        # 已断开连接 | Disconnected
-        _LOGGER.info("Disconnected: %s", self.host)
+                callback(data)
+            except Exception as err:
+                _LOGGER.error("State callback error: %s", err)
 
     async def _async_fetch_device_info(self) -> None:
         """
@@ -312,7 +758,7 @@ class SeeedHADevice:
             async with asyncio.timeout(10):
                 async with session.get(url) as response:
                     if response.status == 200:
-                        self._device_info = await response.json()
+                        self._update_device_info(await response.json())
                         _LOGGER.info("Device info: %s", self._device_info)
                     else:
                         # 获取设备信息失败 | Failed to get device info
@@ -331,27 +777,53 @@ class SeeedHADevice:
         - ERROR: 连接错误
         - CLOSED: 连接关闭
 
-        断开后会自动触发重连。
+        这里只读取和入队，不等待消息处理，慢处理不会让设备的 TCP 缓冲区堆积。
+        链路断开时返回，由监督任务负责重连。
+        Only reads and enqueues without waiting for processing, so slow handling
+        never backs up the device's TCP buffer.
+        Returns when the link drops; the supervisor task reconnects.
         """
-        if not self._ws:
+        if not (ws := self._ws):
             return
 
         # 开始消息接收循环 | Starting message receive loop
         _LOGGER.debug("Starting message receive loop")
+        queue = self._ingest_queue
 
         try:
-            async for msg in self._ws:
-                if msg.type == aiohttp.WSMsgType.TEXT:
-                    # 收到文本消息，解析 JSON | Received text message, parse JSON
+            async for msg in ws:
+                if msg.type == aiohttp.WSMsgType.PONG:
+                    # 探测的响应 | Answer to a probe
+                    self._liveness.observe(solicited=True)
+                    continue
+
+                # 任何其他帧都证明链路存活 | Any other frame proves the link is alive
+                self._liveness.observe()
+
+                if msg.type == aiohttp.WSMsgType.PING:
+                    # 后台发送 pong，慢发送不阻塞读取；上一个 pong 未发完时合并
+                    # Pong in the background so a slow send never stalls reading;
+                    # coalesced while the previous pong is still being sent
+                    if self._pong_task is None or self._pong_task.done():
+                        self._pong_task = self.hass.async_create_background_task(
+                            self._async_pong(ws, msg.data), f"{DOMAIN}_pong_{self.host}"
+                        )
+
+                elif msg.type == aiohttp.WSMsgType.TEXT:
+                    # 收到文本消息，解析 JSON 后入队 | Received text message, parse JSON and enqueue
                     try:
                         data = json.loads(msg.data)
-                        await self._async_handle_message(data)
                     except json.JSONDecodeError:
                         _LOGGER.warning("Received invalid JSON: %s", msg.data)
+                        continue
+                    if isinstance(data, dict):
+                        queue.put(data)
+                    else:
+                        _LOGGER.warning("Received non-object message: %s", msg.data)
 
                 elif msg.type == aiohttp.WSMsgType.ERROR:
                     # WebSocket 错误 | WebSocket error
-                    _LOGGER.error("WebSocket error: %s", self._ws.exception())
+                    _LOGGER.error("WebSocket error: %s", ws.exception())
                     break
 
                 elif msg.type == aiohttp.WSMsgType.CLOSED:
@@ -365,12 +837,6 @@ class SeeedHADevice:
         except Exception as err:
             _LOGGER.error("Error receiving messages: %s", err)
 
-        finally:
-            # 连接断开，触发重连
-            self._connected = False
-            if not self._reconnect_task:
-                self._reconnect_task = asyncio.create_task(self._async_reconnect())
-
     async def _async_handle_message(self, data: dict[str, Any]) -> None:
         """
         处理接收到的消息
@@ -399,77 +865,458 @@ class SeeedHADevice:
             # 状态更新消息
             # 格式: {type: "state", entity_id: "xxx", state: xxx, attributes: {...}}
             entity_id = data.get("entity_id")
-            state = data.get("state")
-            attributes = data.get("attributes", {})
+            record = self._entities.get(entity_id) if entity_id else None
 
-            if entity_id:
-                # 更新本地实体数据
-                if entity_id not in self._entities:
-                    self._entities[entity_id] = {}
+            # 任何上报都说明实体仍然存活 | Any report shows the entity is still alive
+            if record is not None and record.watchdog is not None:
+                self._feed_watchdog(record)
 
-                self._entities[entity_id]["state"] = state
-                self._entities[entity_id]["attributes"] = attributes
+            pipeline = record.ingest if record is not None else None
+            if pipeline is not None:
+                # 使用实体的解码器解码一次，无效值在这里被拒绝
+                # Decode once with the entity's decoder, invalid values are rejected here
+                if pipeline.decoder is not None:
+                    try:
+                        data["state"] = pipeline.decoder(data.get("state"))
+                    except (TypeError, ValueError) as err:
+                        pipeline.rejected += 1
+                        _LOGGER.warning("Rejected state for %s: %s", entity_id, err)
+                        return
+
+                value = as_number(data.get("state"))
+                if value is not None:
+                    # 需要聚合的实体先进入窗口，窗口结束时才写入状态
+                    # Aggregated entities go into their window, state is written when it closes
+                    if pipeline.aggregator is not None:
+                        self._aggregate_sample(record, value, data)
+                        return
+                    # 死区内的值不写入 | Values inside the deadband are not written
+                    if pipeline.deadband is not None and not pipeline.deadband.accept(
+                        value, data.get("attributes", {})
+                    ):
+                        return
+
+            self._publish_state(data, record)
 
-                # 实体状态更新 | Entity state updated
-                _LOGGER.info("Entity state updated: %s = %s", entity_id, state)
+        elif msg_type == MSG_TYPE_DISCOVERY:
+            # 实体发现消息，可以分页发送
+            # Entity discovery message, may be split into pages
+            # 格式: {type: "discovery", entities: [{id, name, type, unit, ...}, ...],
+            #        page: 0, pages: 4, total: 60}
+            self._handle_discovery_page(data)
 
-            # 通知所有状态回调 | Notify all state callbacks
-            for callback in self._state_callbacks:
+        elif msg_type == MSG_TYPE_SLEEP:
+            # 设备休眠通知 - 关闭连接，由监督任务立即开始重连
+            # Device sleep notification - close the connection, the supervisor reconnects immediately
+            _LOGGER.info("Device entering sleep mode: %s", self.host)
+            self._sleep_requested = True
+            await self._async_close_socket()
+
+        elif msg_type == MSG_TYPE_STATS:
+            # 设备健康统计 | Device health telemetry
+            # 格式: {type: "stats", free_heap, min_free_heap, rssi, uptime, loop_time}
+            self._health.update(data, self.hass.loop.time())
+            # 回调可能在调用时移除自己 | Callbacks may remove themselves when called
+            for callback in list(self._state_callbacks):
                 try:
                     callback(data)
                 except Exception as err:
                     _LOGGER.error("State callback error: %s", err)
 
-        elif msg_type == MSG_TYPE_DISCOVERY:
-            # 实体发现消息
-            # 格式: {type: "discovery", entities: [{id, name, type, unit, ...}, ...]}
-            # Format: {type: "discovery", entities: [{id, name, type, unit, ...}, ...]}
-            entities = data.get("entities", [])
-
-            # 收到实体发现 | Received entity discovery
-            _LOGGER.info("Received entity discovery: %d entities", len(entities))
-
-            for entity in entities:
-                entity_id = entity.get("id")
-                if entity_id:
-                    self._entities[entity_id] = entity
-                    _LOGGER.debug("Discovered entity: %s", entity)
-
-            # 通知所有发现回调 | Notify all discovery callbacks
-            for callback in self._discovery_callbacks:
-                try:
-                    callback(data)
-                except Exception as err:
-                    _LOGGER.error("Discovery callback error: %s", err)
+    def _handle_discovery_page(self, data: dict[str, Any]) -> None:
+        """
+        处理一页设备发现
+        Handle one page of discovery.
+
+        实体较多的设备把发现列表拆成多页发送（page 从 0 开始，pages 为总页数，
+        total 为实体总数），没有分页字段的消息视为只有一页。
+        每页的实体到达后立即创建；最后一页之后才删除消失的实体并通知发现完成。
+        Devices with many entities split the discovery list into pages (page is
+        0-based, pages is the page count, total the entity count); messages
+        without paging fields count as a single page.
+        Entities of each page are created as soon as it arrives; vanished
+        entities are removed and discovery completes only after the final page.
 
-        elif msg_type == MSG_TYPE_SLEEP:
-            # 设备休眠通知 - 立即标记断开并开始重连
-            # Device sleep notification - immediately mark disconnected and start reconnect
-            _LOGGER.info("Device entering sleep mode: %s", self.host)
-            self._connected = False
-            
-            # 关闭当前 WebSocket 连接
-            if self._ws and not self._ws.closed:
-                await self._ws.close()
-            
-            # 立即启动重连任务
-            if not self._reconnect_task:
-                self._reconnect_task = asyncio.create_task(self._async_reconnect())
-
-    async def _async_reconnect(self) -> None:
-        """
-        自动重连（固定间隔）
-        Reconnect to the device (fixed interval).
-        """
-        while not self._connected:
-            if await self.async_connect():
-                # 状态推送已在 async_connect 中完成，无需再次调用
-                # State push is already done in async_connect, no need to call again
-                break
-            
-            await asyncio.sleep(RECONNECT_INTERVAL)
+        参数 | Args:
+            data: 发现消息（一页）| Discovery message (one page)
+        """
+        entities = data.get("entities", [])
+        page = data.get("page", 0)
+        pages = data.get("pages", 1)
+
+        # 第一页开始新的发现会话 | The first page starts a new discovery session
+        session = self._discovery_session
+        if page == 0 or session is None:
+            if page != 0:
+                _LOGGER.warning(
+                    "Discovery page %s received without page 0 (%s)", page, self.host
+                )
+            session = self._discovery_session = _DiscoverySession(
+                self._entities.entity_types
+            )
+        elif page != session.next_page:
+            _LOGGER.warning(
+                "Discovery page %s received, expected %s (%s)",
+                page, session.next_page, self.host,
+            )
+        session.next_page = page + 1
+
+        # 收到实体发现 | Received entity discovery
+        _LOGGER.info(
+            "Received entity discovery: %d entities (page %d/%d)",
+            len(entities), page + 1, pages,
+        )
+
+        page_records: dict[str, dict[str, EntityRecord]] = {}
+        for entity in entities:
+            if entity.get("id"):
+                record = self._entities.upsert(entity)
+                # 没有 state 时保留的 record.state 已经解码过，不再解码
+                # Without a state the kept record.state is already decoded, skip decoding it
+                self._rebuild_ingest(record, decode_state="state" in entity)
+                self._rebuild_watchdog(record)
+                session.discovered.add(record.entity_id)
+                if (entity_type := record.entity_type) is not None:
+                    page_records.setdefault(entity_type, {})[record.entity_id] = record
+                _LOGGER.debug("Discovered entity: %s", entity)
+
+        if page + 1 < pages:
+            # 中间页 - 只把本页的实体路由到平台
+            # Intermediate page - only route this page's entities to platforms
+            for entity_type, records in page_records.items():
+                self._route_discovery(entity_type, records, complete=False)
+            return
+
+        # 最后一页 | Final page
+        self._discovery_session = None
+
+        # 删除本次发现中消失的实体（只删除曾被发现过的实体）
+        # Remove entities missing from this discovery (only previously discovered ones)
+        vanished = [
+            entity_id
+            for entity_id, record in self._entities.items()
+            if entity_id not in session.discovered and record.entity_type is not None
+        ]
+        for entity_id in vanished:
+            if (record := self._entities.remove(entity_id)) is not None:
+                if record.ingest is not None and record.ingest.flush_handle is not None:
+                    record.ingest.flush_handle.cancel()
+                if record.watchdog is not None:
+                    record.watchdog.cancel()
+                _LOGGER.info("Entity no longer reported by device: %s", entity_id)
+
+        # 按实体类型路由到平台，每个平台只收到自己类型的记录
+        # Route to platforms by entity type, each platform only receives its own records
+        for entity_type in session.entity_types | self._entities.entity_types:
+            self._route_discovery(
+                entity_type, self._entities.of_type(entity_type), complete=True
+            )
+
+        # 通知所有发现回调 | Notify all discovery callbacks
+        for callback in self._discovery_callbacks:
+            try:
+                callback(data)
+            except Exception as err:
+                _LOGGER.error("Discovery callback error: %s", err)
+
+    def _route_discovery(
+        self,
+        entity_type: str,
+        records: Mapping[str, EntityRecord],
+        complete: bool,
+    ) -> None:
+        """
+        把发现的记录路由到该类型的平台
+        Route discovered records to the platforms of their type.
+        """
+        for route in self._discovery_routes.get(entity_type, ()):
+            try:
+                route(records, complete)
+            except Exception as err:
+                _LOGGER.error("Discovery route error (%s): %s", entity_type, err)
+
+    def _publish_state(
+        self, data: dict[str, Any], record: EntityRecord | None = None
+    ) -> None:
+        """
+        写入实体状态并通知回调
+        Store entity state and notify callbacks.
+
+        参数 | Args:
+            data: 状态消息 | State message
+                  格式: {type: "state", entity_id: "xxx", state: xxx, attributes: {...}}
+            record: 已查找到的实体记录 | Entity record if already looked up
+        """
+        entity_id = data.get("entity_id")
+        state = data.get("state")
+
+        if entity_id:
+            # 更新本地实体数据（设备可能在发现之前发送状态）
+            # Update local entity data (device may send state before discovery)
+            if record is None:
+                record = self._entities.get_or_create(entity_id)
+
+            record.state = state
+            record.attributes = data.get("attributes", {})
+
+            # 实体状态更新 | Entity state updated
+            _LOGGER.info("Entity state updated: %s = %s", entity_id, state)
+
+        # 通知所有状态回调 | Notify all state callbacks
+        for callback in self._state_callbacks:
+            try:
+                callback(data)
+            except Exception as err:
+                _LOGGER.error("State callback error: %s", err)
+
+    def ingest_stats(self) -> dict[str, Any]:
+        """
+        获取数据接入统计
+        Return ingest statistics.
+
+        返回 | Returns:
+            dict: 每个实体的解码拒绝、死区抑制计数和聚合窗口
+                  Per-entity decoder rejections, deadband suppressions and aggregation windows
+        """
+        entities: dict[str, Any] = {}
+        suppressed_total = 0
+        rejected_total = 0
+        for entity_id, record in self._entities.items():
+            if (pipeline := record.ingest) is None:
+                continue
+            stats: dict[str, Any] = {}
+            if pipeline.decoder is not None:
+                stats["rejected"] = pipeline.rejected
+                rejected_total += pipeline.rejected
+            if pipeline.aggregator is not None:
+                stats["aggregation_window"] = pipeline.aggregator.window
+            if pipeline.deadband is not None:
+                stats["written"] = pipeline.deadband.passed
+                stats["suppressed"] = pipeline.deadband.suppressed
+                suppressed_total += pipeline.deadband.suppressed
+            entities[entity_id] = stats
+
+        return {
+            "suppressed_total": suppressed_total,
+            "rejected_total": rejected_total,
+            "entities": entities,
+        }
+
+    # =========================================================================
+    # 窗口聚合 | Windowed Aggregation
+    # =========================================================================
+
+    def set_aggregation_windows(self, windows: dict[str, Any]) -> None:
+        """
+        设置用户选项中的聚合窗口
+        Set aggregation windows from options.
+
+        参数 | Args:
+            windows: {设备实体 ID: 秒} | {device entity ID: seconds}
+        """
+        parsed: dict[str, float] = {}
+        for entity_id, window in (windows or {}).items():
+            try:
+                parsed[str(entity_id)] = float(window)
+            except (TypeError, ValueError):
+                _LOGGER.warning("Invalid aggregation window for %s: %s", entity_id, window)
+
+        self._aggregation_windows = parsed
+        _LOGGER.info("Aggregation windows configured: %s", parsed)
+
+        for record in self._entities.values():
+            self._rebuild_ingest(record)
+
+    def _rebuild_ingest(self, record: EntityRecord, decode_state: bool = False) -> None:
+        """
+        重新构建实体的处理管线
+        Rebuild the ingest pipeline of an entity.
+
+        旧窗口中尚未输出的样本会先被输出。record.state 已经解码过，
+        只有设备发现刚带来原始状态时才解码，选项更新时不会再次缩放。
+        Samples pending in the old window are emitted first. record.state is
+        already decoded, so it is only decoded when discovery just delivered a
+        raw state; option updates never scale it a second time.
+
+        参数 | Args:
+            record: 实体记录 | Entity record
+            decode_state: record.state 是否是设备发现刚带来的原始值
+                          Whether record.state is a raw value just delivered by discovery
+        """
+        if record.ingest is not None:
+            self._flush_window(record)
 
-        self._reconnect_task = None
+        pipeline = record.ingest = build_entity_ingest(
+            record.config, self._aggregation_windows.get(record.entity_id)
+        )
+        if pipeline is None:
+            return
+
+        # 解码设备发现中携带的初始状态 | Decode the initial state carried by discovery
+        if decode_state and pipeline.decoder is not None and record.state is not None:
+            try:
+                record.state = pipeline.decoder(record.state)
+            except (TypeError, ValueError) as err:
+                pipeline.rejected += 1
+                record.state = None
+                _LOGGER.warning("Rejected initial state for %s: %s", record.entity_id, err)
+
+    def _rebuild_watchdog(self, record: EntityRecord) -> None:
+        """
+        根据设备发现中的 expected_interval 设置实体的过期检测
+        Set up an entity's staleness check from expected_interval in discovery.
+
+        所有实体共用集成的时间轮，每个实体只占一个计时器节点。
+        All entities share the integration's timing wheel, one timer node each.
+        """
+        interval = as_number(record.config.get(DISCOVERY_EXPECTED_INTERVAL))
+        if interval is None or interval <= 0:
+            # 没有声明上报间隔 - 只跟随设备连接状态
+            # No report interval declared - follow the device connection only
+            record.stale_after = None
+            if record.watchdog is not None:
+                record.watchdog.cancel()
+                record.watchdog = None
+            if record.stale:
+                record.stale = False
+                self._notify_availability(record)
+            return
+
+        record.stale_after = interval * STALE_INTERVAL_FACTOR
+        deadline = self.hass.loop.time() + record.stale_after
+        if record.watchdog is None:
+            record.watchdog = async_get_timing_wheel(self.hass).schedule(
+                deadline, partial(self._mark_stale, record)
+            )
+        else:
+            record.watchdog.reschedule(deadline)
+
+    def _feed_watchdog(self, record: EntityRecord) -> None:
+        """
+        实体上报后推迟其过期时间（O(1)）
+        Push back an entity's staleness deadline after a report (O(1)).
+        """
+        record.watchdog.reschedule(self.hass.loop.time() + record.stale_after)
+        if record.stale:
+            record.stale = False
+            _LOGGER.info("Entity reporting again: %s", record.entity_id)
+            self._notify_availability(record)
+
+    def _mark_stale(self, record: EntityRecord) -> None:
+        """
+        实体超过预期间隔未上报，标记为不可用
+        Mark an entity unavailable after it missed its expected interval.
+        """
+        if record.stale:
+            return
+        record.stale = True
+        _LOGGER.warning(
+            "Entity %s has not reported for %.0f s, marking unavailable",
+            record.entity_id, record.stale_after,
+        )
+        self._notify_availability(record)
+
+    def _notify_availability(self, record: EntityRecord) -> None:
+        """
+        通知状态回调实体可用性变化
+        Notify state callbacks of an entity availability change.
+        """
+        data = {
+            "type": MSG_TYPE_STATE,
+            "entity_id": record.entity_id,
+            "available": not record.stale,
+        }
+        for callback in self._state_callbacks:
+            try:
+                callback(data)
+            except Exception as err:
+                _LOGGER.error("State callback error: %s", err)
+
+    def entity_available(self, record: EntityRecord) -> bool:
+        """
+        实体是否可用（设备已连接且实体未过期）
+        Return if an entity is available (device connected and entity not stale).
+        """
+        return self.connected and not record.stale
+
+    def _aggregate_sample(
+        self,
+        record: EntityRecord,
+        value: float,
+        data: dict[str, Any],
+    ) -> None:
+        """
+        将样本加入聚合窗口
+        Add a sample to the aggregation window.
+        """
+        pipeline = record.ingest
+        aggregator = pipeline.aggregator
+        now = self.hass.loop.time()
+
+        # 保留设备上报的最新属性 | Keep the latest attributes reported by device
+        pipeline.last_attributes = data.get("attributes") or {}
+
+        if (result := aggregator.add(value, now)) is not None:
+            # 旧窗口已由样本关闭，其定时器作废 | Old window closed by sample, drop its timer
+            if pipeline.flush_handle:
+                pipeline.flush_handle.cancel()
+                pipeline.flush_handle = None
+            self._publish_window(record, pipeline, result)
+
+        # 新窗口开始时安排一次输出 | Schedule one flush when a new window starts
+        if pipeline.flush_handle is None:
+
+            def _flush() -> None:
+                pipeline.flush_handle = None
+                if record.ingest is pipeline:
+                    self._flush_window(record)
+
+            pipeline.flush_handle = self.hass.loop.call_at(aggregator.deadline, _flush)
+
+    def _flush_window(self, record: EntityRecord) -> None:
+        """
+        关闭聚合窗口并输出结果
+        Close the aggregation window and emit its result.
+        """
+        pipeline = record.ingest
+        if pipeline is None:
+            return
+
+        if pipeline.flush_handle:
+            pipeline.flush_handle.cancel()
+            pipeline.flush_handle = None
+
+        if pipeline.aggregator is None:
+            return
+
+        if (result := pipeline.aggregator.flush()) is not None:
+            self._publish_window(record, pipeline, result)
+
+    def _publish_window(
+        self, record: EntityRecord, pipeline: EntityIngest, result: WindowResult
+    ) -> None:
+        """
+        以一个状态输出窗口结果
+        Emit a window result as a single state.
+        """
+        attributes = dict(pipeline.last_attributes)
+        attributes.update(result.as_attributes())
+
+        if pipeline.deadband is not None and not pipeline.deadband.accept(
+            result.mean, attributes
+        ):
+            return
+
+        _LOGGER.debug(
+            "Aggregation window closed: %s mean=%s count=%d",
+            record.entity_id, result.mean, result.count,
+        )
+        self._publish_state({
+            "type": MSG_TYPE_STATE,
+            "entity_id": record.entity_id,
+            "state": result.mean,
+            "attributes": attributes,
+        }, record)
 
     async def _async_restore_entity_subscription(self) -> None:
         """
@@ -508,14 +1355,62 @@ class SeeedHADevice:
             _LOGGER.warning("Cannot send: WebSocket not connected")
             return False
 
+        # 自己序列化并编码一次，按实际发送的字节数统计（非 ASCII 字符占多个字节）
+        # Serialize and encode once here so the bytes on the wire are counted
+        # (non-ASCII characters take several bytes)
+        payload = json.dumps(data).encode()
+        size = len(payload)
+        self._outbound.begin(size)
         try:
-            await self._ws.send_json(data)
+            # 仍以文本帧发送，设备固件只解析文本帧
+            # Still sent as a text frame, the device firmware only parses text frames
+            await self._ws.send_frame(payload, aiohttp.WSMsgType.TEXT)
             _LOGGER.debug("Sent data: %s", data)
             return True
         except Exception as err:
             # 发送数据失败 | Failed to send data
             _LOGGER.error("Failed to send data: %s", err)
             return False
+        finally:
+            self._outbound.end(size)
+
+    @staticmethod
+    def _socket_buffer_size(
+        ws: aiohttp.ClientWebSocketResponse,
+    ) -> Callable[[], int] | None:
+        """
+        获取 WebSocket 套接字发送队列大小的查询函数
+        Return a query for the send queue size of the WebSocket's socket.
+
+        套接字通过公开的 get_extra_info("socket") 取得，用 TIOCOUTQ 读取内核中
+        尚未被设备确认的字节数。平台不支持（非 Linux）时返回 None，
+        只按发送中的字节数估计。
+        The socket comes from the public get_extra_info("socket"), and TIOCOUTQ
+        reads the bytes in the kernel the device has not acknowledged yet.
+        None is returned where that is unsupported (not Linux); only bytes in
+        flight are counted then.
+        """
+        try:
+            import fcntl
+            import termios
+        except ImportError:
+            return None
+        request = getattr(termios, "TIOCOUTQ", None)
+        sock = ws.get_extra_info("socket")
+        if request is None or sock is None:
+            return None
+
+        def send_queue_size() -> int:
+            # 套接字关闭后 fileno() 为 -1，ioctl 抛出异常，监测器不再查询
+            # fileno() is -1 once the socket closes; ioctl raises and the
+            # monitor stops querying
+            return struct.unpack("i", fcntl.ioctl(sock.fileno(), request, b"\0" * 4))[0]
+
+        try:
+            send_queue_size()
+        except (OSError, ValueError):
+            return None
+        return send_queue_size
 
     async def async_request_discovery(self) -> bool:
         """
@@ -680,9 +1575,72 @@ class SeeedHADevice:
             }
         }
 
+        # 拥塞时暂缓推送，同一实体的旧状态被新状态取代
+        # Defer the push while congested; a newer state supersedes an older one
+        if self._deferred_pushes or self._outbound.congested:
+            if self._deferred_pushes.pop(entity_id, None) is not None:
+                self._outbound.shed_pushes += 1
+            self._deferred_pushes[entity_id] = data
+            self._outbound.deferred_pushes += 1
+            self._schedule_deferred_flush()
+            return
+
         _LOGGER.debug("Pushing HA state to device: %s = %s", entity_id, state.state)
         await self._async_send(data)
 
+    def _schedule_deferred_flush(self) -> None:
+        """
+        安排重试暂缓的推送
+        Schedule a retry of the deferred pushes.
+        """
+        if self._deferred_handle is None:
+            self._deferred_handle = self.hass.loop.call_later(
+                OUTBOUND_RETRY_INTERVAL, self._on_deferred_retry
+            )
+
+    def _on_deferred_retry(self) -> None:
+        """
+        重试定时器 - 拥塞解除后发送暂缓的推送
+        Retry timer - sends the deferred pushes once congestion has cleared.
+        """
+        self._deferred_handle = None
+        if not self._deferred_pushes:
+            return
+        if self._outbound.congested:
+            self._schedule_deferred_flush()
+            return
+        self.hass.async_create_background_task(
+            self._async_flush_deferred_pushes(),
+            f"{DOMAIN}_flush_deferred_{self.host}",
+        )
+
+    async def _async_flush_deferred_pushes(self) -> None:
+        """
+        按顺序发送暂缓的推送，再次拥塞时停下
+        Send the deferred pushes in order, stopping if congestion returns.
+        """
+        while self._deferred_pushes:
+            if self._outbound.congested:
+                self._schedule_deferred_flush()
+                return
+            entity_id = next(iter(self._deferred_pushes))
+            data = self._deferred_pushes.pop(entity_id)
+            # 订阅已取消的实体不再推送 | Skip entities that are no longer subscribed
+            if entity_id not in self._subscribed_entities:
+                continue
+            _LOGGER.debug("Pushing deferred HA state to device: %s", entity_id)
+            await self._async_send(data)
+
+    def _clear_deferred_pushes(self) -> None:
+        """
+        丢弃所有暂缓的推送
+        Drop all deferred pushes.
+        """
+        self._deferred_pushes.clear()
+        if self._deferred_handle is not None:
+            self._deferred_handle.cancel()
+            self._deferred_handle = None
+
     async def _async_send_ha_state_clear(self) -> None:
         """
         发送清除 HA 状态消息到 Arduino 设备
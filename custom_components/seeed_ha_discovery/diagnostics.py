@@ -0,0 +1,112 @@
+"""
+Seeed HA Discovery - 诊断信息
+Seeed HA Discovery - Diagnostics.
+
+在 设置 → 设备与服务 → 下载诊断 中导出运行时统计，包括：
+Exports runtime statistics via Settings → Devices & Services → Download diagnostics, including:
+- 设备信息和连接状态机统计 | Device info and connection state machine statistics
+- 数据接入统计（死区抑制计数等）| Ingest statistics (deadband suppression counts, etc.)
+- 协调器更新合并统计 | Coordinator update coalescing statistics
+- 实体过期检测和时间轮统计 | Entity staleness and timing wheel statistics
+- BLE 广播去重统计 | BLE advertisement de-duplication statistics
+- 设备健康统计，以及所有 WiFi 设备的内存泄漏和重启循环汇总
+  Device health telemetry, plus a leak and reboot loop summary across all WiFi devices
+"""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    DOMAIN,
+    CONF_BLE_BIND_KEY,
+    CONF_DEVICE_ID,
+    CONF_HOST,
+    CONNECTION_TYPE_WIFI,
+    DATA_TIMING_WHEEL,
+)
+
+# 需要隐藏的字段 | Fields to redact
+TO_REDACT = {CONF_HOST, CONF_BLE_BIND_KEY, "mac_address", "mac", "ip"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """
+    返回配置入口的诊断信息
+    Return diagnostics for a config entry.
+    """
+    data = hass.data[DOMAIN].get(entry.entry_id, {})
+
+    diagnostics: dict[str, Any] = {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": async_redact_data(dict(entry.options), TO_REDACT),
+        },
+        "connection_type": data.get("connection_type", CONNECTION_TYPE_WIFI),
+    }
+
+    # WiFi 设备运行时统计 | WiFi device runtime statistics
+    if device := data.get("device"):
+        diagnostics["device"] = {
+            "info": async_redact_data(device.device_info, TO_REDACT),
+            "connected": device.connected,
+            "connection": device.connection_stats(),
+            "ingest": device.ingest_stats(),
+            "health": device.health.stats(),
+            "stale_entities": [
+                entity_id for entity_id, record in device.entities.items() if record.stale
+            ],
+        }
+
+    # BLE 广播去重和传感器状态写入统计
+    # BLE advertisement de-duplication and sensor state write statistics
+    if device_data := data.get("ble_device_data"):
+        diagnostics["ble_cache"] = device_data.cache.stats()
+        diagnostics["ble_writes"] = device_data.write_stats.stats()
+        diagnostics["ble_link_quality"] = device_data.link.stats()
+        diagnostics["ble_seeed_payload"] = {
+            **device_data.seeed_cache.stats(),
+            **device_data.seeed_decoder.stats(),
+        }
+        if device_data.decryptor is not None:
+            diagnostics["ble_encryption"] = device_data.decryptor.stats()
+
+    # BLE 可用性（由广播间隔判断）| BLE availability (derived from advertisement gaps)
+    if ble_coordinator := data.get("ble_coordinator"):
+        diagnostics["ble_available"] = ble_coordinator.available
+
+    if coordinator := data.get("coordinator"):
+        diagnostics["coordinator"] = coordinator.coalesce_stats()
+
+    if wheel := hass.data.get(DATA_TIMING_WHEEL):
+        diagnostics["timing_wheel"] = wheel.stats()
+
+    diagnostics["fleet_health"] = _fleet_health(hass)
+
+    return diagnostics
+
+
+def _fleet_health(hass: HomeAssistant) -> dict[str, Any]:
+    """
+    汇总所有 WiFi 设备的健康状况
+    Summarize the health of all WiFi devices.
+    """
+    devices: dict[str, Any] = {}
+    for entry_data in hass.data[DOMAIN].values():
+        if not (device := entry_data.get("device")) or not device.health.has_data:
+            continue
+        stats = device.health.stats()
+        devices[device.entry.data.get(CONF_DEVICE_ID, device.entry.entry_id)] = {
+            key: stats[key]
+            for key in ("heap_trend", "leak_suspected", "reboot_count", "reboot_loop")
+        }
+    return {
+        "devices": devices,
+        "leak_suspected": sorted(k for k, v in devices.items() if v["leak_suspected"]),
+        "reboot_loop": sorted(k for k, v in devices.items() if v["reboot_loop"]),
+    }
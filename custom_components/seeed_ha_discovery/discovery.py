@@ -0,0 +1,219 @@
+"""
+Seeed HA Discovery - 设备发现差异计算
+Seeed HA Discovery - Discovery diffing.
+
+这个模块被 sensor / switch / camera 平台共用：
+This module is shared by the sensor / switch / camera platforms:
+1. 每个平台按实体类型保存已知实体集合
+   Each platform keeps the set of known entities of its type
+2. 每次设备发现在 O(n) 内算出新增、删除和配置变化的实体
+   Every discovery computes added, removed and changed entities in O(n)
+   分页发现的每一页只处理本页实体，最后一页才计算删除
+   Each page of a paginated discovery only handles its own entities;
+   removals are computed after the final page
+3. 平台据此添加新实体、删除消失的实体、更新配置变化的实体
+   Platforms then add new entities, remove vanished ones and update changed ones
+"""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .entity_store import EntityRecord
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class DiscoveryDiff:
+    """
+    一次设备发现的差异
+    Difference produced by one discovery.
+    """
+    added: list[EntityRecord] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    changed: list[EntityRecord] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        """
+        是否有任何变化
+        Return if anything changed.
+        """
+        return bool(self.added or self.removed or self.changed)
+
+
+class DiscoveryTracker:
+    """
+    单一实体类型的发现差异跟踪器
+    Discovery diff tracker for a single entity type.
+
+    保存每个已知实体最近一次的配置，用集合运算得到差异。
+    Keeps the last config of every known entity and derives the diff with set operations.
+    """
+
+    def __init__(self, entity_type: str) -> None:
+        """
+        初始化跟踪器
+        Initialize the tracker.
+
+        参数 | Args:
+            entity_type: 实体类型（sensor / switch / camera）| Entity type
+        """
+        self.entity_type = entity_type
+        # {实体 ID: 最近一次的配置} | {entity ID: last seen config}
+        self._known: dict[str, dict[str, Any]] = {}
+
+    @property
+    def known(self) -> set[str]:
+        """
+        已知的实体 ID
+        Known entity IDs.
+        """
+        return set(self._known)
+
+    def diff(
+        self, records: Iterable[EntityRecord], complete: bool = True
+    ) -> DiscoveryDiff:
+        """
+        计算本次发现与上次的差异
+        Compute the difference against the previous discovery.
+
+        参数 | Args:
+            records: 设备当前的实体记录 | Current entity records of the device
+            complete: records 是否为完整列表；分页发现的中间页只包含部分实体，
+                      此时不计算删除
+                      Whether records is the full list; intermediate pages of a
+                      paginated discovery only hold some entities, so no removals
+                      are computed
+
+        返回 | Returns:
+            DiscoveryDiff: 新增、删除和配置变化的实体
+                           Added, removed and changed entities
+        """
+        result = DiscoveryDiff()
+        known = self._known
+        current: dict[str, dict[str, Any]] = {} if complete else known
+
+        for record in records:
+            if record.entity_type != self.entity_type:
+                continue
+            entity_id = record.entity_id
+            previous = known.get(entity_id)
+            current[entity_id] = record.config
+            if previous is None:
+                result.added.append(record)
+            elif previous != record.config:
+                result.changed.append(record)
+
+        if complete:
+            result.removed = [entity_id for entity_id in known if entity_id not in current]
+            self._known = current
+        return result
+
+
+class PlatformDiscovery:
+    """
+    平台实体发现管理器
+    Discovery-driven entity manager of one platform.
+
+    根据 DiscoveryDiff 添加、删除和更新平台实体。
+    实体需要实现 async_apply_record(record) 来应用新的配置。
+    Adds, removes and updates platform entities from a DiscoveryDiff.
+    Entities must implement async_apply_record(record) to apply a new config.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entity_type: str,
+        factory: Callable[[EntityRecord], Entity],
+        async_add_entities: AddEntitiesCallback,
+    ) -> None:
+        """
+        初始化管理器
+        Initialize the manager.
+
+        参数 | Args:
+            hass: Home Assistant 实例
+            entity_type: 实体类型 | Entity type
+            factory: 根据实体记录创建 HA 实体 | Creates an HA entity from a record
+            async_add_entities: 添加实体的回调 | Callback to add entities
+        """
+        self.hass = hass
+        self.entity_type = entity_type
+        self._factory = factory
+        self._async_add_entities = async_add_entities
+        self._tracker = DiscoveryTracker(entity_type)
+        # {设备实体 ID: HA 实体} | {device entity ID: HA entity}
+        self.entities: dict[str, Entity] = {}
+
+    @callback
+    def add_static(self, entity_id: str, entity: Entity) -> None:
+        """
+        添加不来自设备发现的实体（如默认摄像头）
+        Add an entity that does not come from discovery (e.g. the default camera).
+
+        静态实体不会因为发现中缺失而被删除。
+        Static entities are never removed for missing from discovery.
+        """
+        self.entities[entity_id] = entity
+        self._async_add_entities([entity])
+
+    @callback
+    def async_apply(
+        self, records: Iterable[EntityRecord], complete: bool = True
+    ) -> DiscoveryDiff:
+        """
+        应用一次设备发现
+        Apply one discovery.
+
+        参数 | Args:
+            records: 设备当前的实体记录 | Current entity records of the device
+            complete: records 是否为完整列表 | Whether records is the full list
+
+        返回 | Returns:
+            DiscoveryDiff: 本次发现的差异 | Difference of this discovery
+        """
+        diff = self._tracker.diff(records, complete)
+        if not diff:
+            return diff
+
+        # 移除消失的实体对象，保留实体注册表条目：固件短暂遗漏实体时不会丢失
+        # 用户的重命名、区域和自定义设置；有注册表条目的实体状态变为不可用
+        # Remove vanished entity objects but keep their registry entries, so a
+        # firmware that briefly omits an entity doesn't wipe the user's renames,
+        # area and customisations; registered entities turn unavailable
+        for entity_id in diff.removed:
+            if (entity := self.entities.pop(entity_id, None)) is None:
+                continue
+            _LOGGER.info("Removing vanished %s: %s", self.entity_type, entity_id)
+            self.hass.async_create_task(entity.async_remove())
+
+        # 更新配置变化的实体 | Update entities whose config changed
+        for record in diff.changed:
+            if (entity := self.entities.get(record.entity_id)) is not None:
+                _LOGGER.info("Updating changed %s: %s", self.entity_type, record.entity_id)
+                entity.async_apply_record(record)
+
+        # 添加新实体（已作为静态实体存在的按变化处理）
+        # Add new entities (ones already present as static entities are updated instead)
+        new_entities = []
+        for record in diff.added:
+            if (entity := self.entities.get(record.entity_id)) is not None:
+                entity.async_apply_record(record)
+                continue
+            _LOGGER.info("Discovered new %s: %s", self.entity_type, record.entity_id)
+            entity = self._factory(record)
+            self.entities[record.entity_id] = entity
+            new_entities.append(entity)
+
+        if new_entities:
+            self._async_add_entities(new_entities)
+            _LOGGER.info("Added %d %s entities", len(new_entities), self.entity_type)
+
+        return diff
@@ -0,0 +1,211 @@
+"""
+Seeed HA Discovery - 实体存储
+Seeed HA Discovery - Entity store.
+
+这个模块保存设备上报的所有实体：
+This module holds every entity reported by a device:
+1. 每个实体一个使用 __slots__ 的紧凑记录
+   One compact __slots__ record per entity
+2. 配置（来自设备发现）与热状态（state / attributes）分开存放
+   Config (from discovery) is kept apart from hot state (state / attributes)
+3. 记录在重新发现时原地更新，实体可以直接持有记录引用
+   Records are updated in place on rediscovery, so entities can hold direct references
+4. 按实体类型建立索引，平台只读取自己类型的记录
+   Records are indexed by entity type, so platforms only read their own type
+
+HA 实体在每次状态写入时直接读取 record.state，不再按 ID 查找。
+HA entities read record.state directly on every state write, without an ID lookup.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping
+from types import MappingProxyType
+from typing import Any
+
+from .ingest import EntityIngest
+from .timing_wheel import WheelTimer
+
+
+class EntityRecord:
+    """
+    单个实体的记录
+    Record of a single entity.
+    """
+
+    __slots__ = (
+        "entity_id",
+        "config",
+        "state",
+        "attributes",
+        "ingest",
+        "stale",
+        "stale_after",
+        "watchdog",
+    )
+
+    def __init__(self, entity_id: str, config: dict[str, Any] | None = None) -> None:
+        """
+        初始化实体记录
+        Initialize the entity record.
+
+        参数 | Args:
+            entity_id: 设备上报的实体 ID | Entity ID reported by device
+            config: 设备发现配置（不含 state）| Discovery config (without state)
+        """
+        self.entity_id = entity_id
+        # 设备发现配置 - 只在发现时改变 | Discovery config - only changes on discovery
+        self.config: dict[str, Any] = config if config is not None else {}
+        # 热状态 - 每个 state 消息都会改变 | Hot state - changes on every state message
+        self.state: Any = None
+        self.attributes: dict[str, Any] = {}
+        # 接入处理管线 | Ingest pipeline
+        self.ingest: EntityIngest | None = None
+        # 过期检测 - 超过 stale_after 秒未上报时 stale 为 True
+        # Staleness - stale is True after no report for stale_after seconds
+        self.stale = False
+        self.stale_after: float | None = None
+        self.watchdog: WheelTimer | None = None
+
+    @property
+    def entity_type(self) -> str | None:
+        """
+        实体类型（sensor / switch / camera）
+        Entity type (sensor / switch / camera).
+        """
+        return self.config.get("type")
+
+    def __repr__(self) -> str:
+        """
+        返回记录的字符串表示
+        Return the string representation of the record.
+        """
+        return f"EntityRecord({self.entity_id!r}, type={self.entity_type!r}, state={self.state!r})"
+
+
+class EntityStore(Mapping[str, EntityRecord]):
+    """
+    设备实体存储
+    Store of a device's entities.
+
+    以只读映射的形式提供给平台和协调器，写入只通过设备进行。
+    Exposed as a read-only mapping to platforms and the coordinator; writes go
+    through the device.
+    """
+
+    __slots__ = ("_records", "_by_type")
+
+    def __init__(self) -> None:
+        """
+        初始化实体存储
+        Initialize the entity store.
+        """
+        self._records: dict[str, EntityRecord] = {}
+        # 类型索引 {实体类型: {实体 ID: 记录}}，不含尚未被发现的记录
+        # Type index {entity type: {entity ID: record}}, excludes not yet discovered records
+        self._by_type: dict[str, dict[str, EntityRecord]] = {}
+
+    def __getitem__(self, entity_id: str) -> EntityRecord:
+        return self._records[entity_id]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._records)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, entity_id: object) -> bool:
+        return entity_id in self._records
+
+    def get(self, entity_id: str, default: Any = None) -> Any:
+        """
+        按 ID 获取记录（热路径，避免 Mapping 的通用实现）
+        Get a record by ID (hot path, bypasses the generic Mapping implementation).
+        """
+        return self._records.get(entity_id, default)
+
+    def get_or_create(self, entity_id: str) -> EntityRecord:
+        """
+        获取记录，不存在时创建空记录
+        Get a record, creating an empty one if missing.
+
+        设备可能在发现之前发送 state 消息。
+        Devices may send state messages before discovery.
+        """
+        if (record := self._records.get(entity_id)) is None:
+            record = self._records[entity_id] = EntityRecord(entity_id)
+        return record
+
+    def upsert(self, entity: dict[str, Any]) -> EntityRecord:
+        """
+        写入设备发现的实体配置
+        Insert or update an entity from discovery.
+
+        已有记录会被原地更新，保持实体持有的引用有效。
+        Existing records are updated in place so references held by entities stay valid.
+        没有 state 时保留已有的（已解码的）状态。
+        Without a state the existing (already decoded) state is kept.
+
+        参数 | Args:
+            entity: 发现消息中的实体 | Entity from the discovery message
+                    格式: {id, name, type, unit, state, ...}
+
+        返回 | Returns:
+            EntityRecord: 实体记录 | Entity record
+        """
+        config = dict(entity)
+        record = self.get_or_create(config["id"])
+        if "state" in config:
+            record.state = config.pop("state")
+        if "attributes" in config:
+            record.attributes = config.pop("attributes") or {}
+
+        # 实体类型可能在重新发现时改变 | The entity type may change on rediscovery
+        previous_type = record.entity_type
+        record.config = config
+        if previous_type != record.entity_type:
+            self._unindex(record.entity_id, previous_type)
+        if (entity_type := record.entity_type) is not None:
+            self._by_type.setdefault(entity_type, {})[record.entity_id] = record
+        return record
+
+    def of_type(self, entity_type: str) -> Mapping[str, EntityRecord]:
+        """
+        获取某一类型的所有记录
+        Get all records of one entity type.
+
+        参数 | Args:
+            entity_type: 实体类型（sensor / switch / camera）| Entity type
+
+        返回 | Returns:
+            Mapping: 只读视图 {实体 ID: 记录} | Read-only view {entity ID: record}
+        """
+        return MappingProxyType(self._by_type.get(entity_type, {}))
+
+    @property
+    def entity_types(self) -> set[str]:
+        """
+        当前存在记录的实体类型
+        Entity types that currently have records.
+        """
+        return {entity_type for entity_type, records in self._by_type.items() if records}
+
+    def _unindex(self, entity_id: str, entity_type: str | None) -> None:
+        """
+        从类型索引中删除记录
+        Remove a record from the type index.
+        """
+        if entity_type is not None and (records := self._by_type.get(entity_type)):
+            records.pop(entity_id, None)
+
+    def remove(self, entity_id: str) -> EntityRecord | None:
+        """
+        删除不再被设备上报的实体记录
+        Remove the record of an entity no longer reported by the device.
+
+        返回 | Returns:
+            EntityRecord | None: 被删除的记录 | The removed record
+        """
+        record = self._records.pop(entity_id, None)
+        if record is not None:
+            self._unindex(entity_id, record.entity_type)
+        return record
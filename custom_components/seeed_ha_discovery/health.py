@@ -0,0 +1,213 @@
+"""
+Seeed HA Discovery - 设备健康统计
+Seeed HA Discovery - Device health telemetry.
+
+设备定期发送 stats 消息，这个模块负责：
+Devices periodically send stats messages; this module:
+1. 保存最新的堆内存、信号强度、运行时间和循环耗时
+   Keeps the latest heap, RSSI, uptime and loop time
+2. 保留一段紧凑的滚动历史，用最小二乘法计算空闲堆内存的变化趋势（字节/小时），
+   持续下降时标记可能的内存泄漏
+   Keeps a compact rolling history and fits the free heap trend (bytes/hour)
+   with least squares, flagging a possible memory leak when it keeps falling
+3. 运行时间变小说明设备重启了；短时间内多次重启标记为重启循环
+   A decreasing uptime means the device rebooted; several reboots in a short
+   window are flagged as a reboot loop
+
+stats 消息格式 | stats message format:
+{
+    "type": "stats",
+    "free_heap": 182340,      # 字节 | bytes
+    "min_free_heap": 171200,  # 字节 | bytes
+    "rssi": -61,              # dBm
+    "uptime": 86400,          # 秒 | seconds
+    "loop_time": 1.8          # 毫秒（平均）| milliseconds (average)
+}
+"""
+from __future__ import annotations
+
+import logging
+from collections import deque
+from typing import Any
+
+from .const import (
+    HEALTH_HISTORY_SIZE,
+    HEALTH_LEAK_SLOPE,
+    HEALTH_REBOOT_LOOP_COUNT,
+    HEALTH_REBOOT_WINDOW,
+    HEALTH_TREND_MIN_SAMPLES,
+)
+from .ingest import as_number
+
+_LOGGER = logging.getLogger(__name__)
+
+# stats 消息中的数值字段 | Numeric fields of a stats message
+HEALTH_FIELDS = ("free_heap", "min_free_heap", "rssi", "uptime", "loop_time")
+
+
+class DeviceHealth:
+    """
+    单个设备的健康统计
+    Health telemetry of one device.
+    """
+
+    def __init__(self, name: str, history_size: int = HEALTH_HISTORY_SIZE) -> None:
+        """
+        初始化健康统计
+        Initialize health telemetry.
+
+        参数 | Args:
+            name: 日志中使用的名称（设备地址）| Name used in logs (device host)
+            history_size: 保留的样本数 | Samples kept
+        """
+        self._name = name
+        # 最新的数值 | Latest values
+        self.latest: dict[str, float] = {}
+        # 本次启动以来的 (时间, 空闲堆内存) 样本 | (time, free heap) samples since boot
+        self._history: deque[tuple[float, float]] = deque(maxlen=history_size)
+        # 最近的重启时间 | Recent reboot times
+        self._reboots: deque[float] = deque(maxlen=HEALTH_REBOOT_LOOP_COUNT)
+        self.reboot_count = 0
+        self.samples = 0
+
+        # 空闲堆内存趋势（字节/小时），每条 stats 消息计算一次，样本不足时为 None
+        # Free heap trend (bytes/hour), computed once per stats message, None with too few samples
+        self.heap_trend: float | None = None
+        self.leak_suspected = False
+        self.reboot_loop = False
+
+    @property
+    def has_data(self) -> bool:
+        """
+        是否收到过 stats 消息
+        Return if a stats message was ever received.
+        """
+        return bool(self.latest)
+
+    def update(self, data: dict[str, Any], now: float) -> None:
+        """
+        处理一条 stats 消息
+        Handle one stats message.
+
+        参数 | Args:
+            data: stats 消息 | stats message
+            now: 当前时间（loop.time()）| Current time (loop.time())
+        """
+        values = {
+            key: value
+            for key in HEALTH_FIELDS
+            if (value := as_number(data.get(key))) is not None
+        }
+        if not values:
+            return
+        self.samples += 1
+
+        # 运行时间变小 - 设备重启了 | Uptime went down - the device rebooted
+        uptime = values.get("uptime")
+        previous = self.latest.get("uptime")
+        if uptime is not None and previous is not None and uptime < previous:
+            self._record_reboot(now)
+        self._update_reboot_loop(now)
+
+        self.latest.update(values)
+        if (free_heap := values.get("free_heap")) is not None:
+            self._history.append((now, free_heap))
+        self._update_leak()
+
+    def _record_reboot(self, now: float) -> None:
+        """
+        记录一次重启
+        Record a reboot.
+        """
+        self.reboot_count += 1
+        self._reboots.append(now)
+        # 重启后堆内存重新开始，旧的趋势不再有效
+        # The heap starts over after a reboot, the old trend no longer applies
+        self._history.clear()
+        _LOGGER.info("Device rebooted: %s", self._name)
+
+    def _update_reboot_loop(self, now: float) -> None:
+        """
+        根据窗口内的重启次数更新重启循环标记
+        Update the reboot loop flag from the reboots within the window.
+
+        每条 stats 消息都会调用，窗口过后没有新的重启时标记会被清除。
+        Called for every stats message, so the flag clears once the window
+        passes without new reboots.
+        """
+        reboots = self._reboots
+        while reboots and now - reboots[0] > HEALTH_REBOOT_WINDOW:
+            reboots.popleft()
+
+        reboot_loop = len(reboots) >= HEALTH_REBOOT_LOOP_COUNT
+        if reboot_loop and not self.reboot_loop:
+            _LOGGER.warning(
+                "Reboot loop on %s: %d reboots within %d s",
+                self._name, len(self._reboots), HEALTH_REBOOT_WINDOW,
+            )
+        elif self.reboot_loop and not reboot_loop:
+            _LOGGER.info("Reboot loop cleared on %s", self._name)
+        self.reboot_loop = reboot_loop
+
+    def _fit_heap_trend(self) -> float | None:
+        """
+        用最小二乘法拟合空闲堆内存的变化趋势（字节/小时），样本不足时为 None
+        Fit the free heap trend (bytes/hour) with least squares, None with too few samples.
+        """
+        history = self._history
+        count = len(history)
+        if count < HEALTH_TREND_MIN_SAMPLES:
+            return None
+        mean_t = sum(t for t, _ in history) / count
+        mean_h = sum(h for _, h in history) / count
+        var_t = sum((t - mean_t) ** 2 for t, _ in history)
+        if var_t == 0:
+            return None
+        cov = sum((t - mean_t) * (h - mean_h) for t, h in history)
+        return cov / var_t * 3600
+
+    def _update_leak(self) -> None:
+        """
+        重新计算堆内存趋势并更新泄漏标记
+        Recompute the heap trend and update the leak flag.
+        """
+        trend = self.heap_trend = self._fit_heap_trend()
+        leak_suspected = trend is not None and trend < HEALTH_LEAK_SLOPE
+        if leak_suspected and not self.leak_suspected:
+            _LOGGER.warning(
+                "Possible memory leak on %s: free heap falling %.0f bytes/hour",
+                self._name, -trend,
+            )
+        self.leak_suspected = leak_suspected
+
+    def value(self, key: str) -> Any:
+        """
+        读取一个健康统计值（只读缓存，不重新计算趋势）
+        Read one health value (cached, the trend is not recomputed).
+
+        参数 | Args:
+            key: HEALTH_FIELDS 中的字段、heap_trend 或 reboot_count
+                 A HEALTH_FIELDS field, heap_trend or reboot_count
+        """
+        if key == "heap_trend":
+            trend = self.heap_trend
+            return round(trend, 1) if trend is not None else None
+        if key == "reboot_count":
+            return self.reboot_count
+        return self.latest.get(key)
+
+    def stats(self) -> dict[str, Any]:
+        """
+        返回健康统计（用于诊断）
+        Return health statistics (for diagnostics).
+        """
+        trend = self.heap_trend
+        return {
+            **self.latest,
+            "heap_trend": round(trend, 1) if trend is not None else None,
+            "leak_suspected": self.leak_suspected,
+            "reboot_count": self.reboot_count,
+            "reboot_loop": self.reboot_loop,
+            "samples": self.samples,
+            "history": len(self._history),
+        }
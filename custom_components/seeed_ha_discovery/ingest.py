@@ -0,0 +1,483 @@
+"""
+Seeed HA Discovery - 数据接入处理
+Seeed HA Discovery - Ingest processing.
+
+这个模块负责在设备数据写入 Home Assistant 之前对其进行预处理：
+This module pre-processes device data before it is written to Home Assistant:
+1. 时间窗口聚合 - 高频传感器每个窗口只输出一个状态
+   Windowed aggregation - high-frequency sensors emit one state per window
+2. 死区过滤 - 显示结果相同或变化过小的值不写入状态
+   Deadband filtering - values that display identically or barely change are not written
+3. 类型解码 - 根据设备发现为每个实体编译一个解码器，state 消息只解码一次
+   Typed decoding - one decoder per entity is compiled from discovery,
+   each state message is decoded once
+
+所有处理都是增量的，每个样本 O(1)，不保存历史样本。
+All processing is incremental, O(1) per sample, no sample history is kept.
+
+配置示例（WiFi 设备发现）| Config example (WiFi discovery):
+{
+    "id": "vibration",
+    "type": "sensor",
+    "precision": 2,
+    "aggregation_window": 10,
+    "deadband": 0.05,
+    "deadband_percent": 1,
+    "scale": 0.01,
+    "offset": 0,
+    "min": -40,
+    "max": 125
+}
+
+枚举传感器使用 "options": [...] 或映射 "enum": {"0": "idle", "1": "busy"}。
+Enum sensors use "options": [...] or a mapping "enum": {"0": "idle", "1": "busy"}.
+"""
+from __future__ import annotations
+
+import asyncio
+import math
+from dataclasses import dataclass
+from typing import Any, Callable
+
+# 设备发现中的聚合窗口字段（秒）| Aggregation window field in discovery (seconds)
+DISCOVERY_AGGREGATION_WINDOW = "aggregation_window"
+# 设备发现中的死区字段 | Deadband fields in discovery
+DISCOVERY_DEADBAND = "deadband"
+DISCOVERY_DEADBAND_PERCENT = "deadband_percent"
+# 设备发现中的解码字段 | Decoding fields in discovery
+DISCOVERY_SCALE = "scale"
+DISCOVERY_OFFSET = "offset"
+DISCOVERY_MIN = "min"
+DISCOVERY_MAX = "max"
+DISCOVERY_OPTIONS = "options"
+DISCOVERY_ENUM = "enum"
+
+# 不作为数值解码的传感器设备类别 | Sensor device classes not decoded as numbers
+NON_NUMERIC_DEVICE_CLASSES = {"enum", "timestamp", "date"}
+
+# 开关状态的文本取值 | Text values of switch states
+_TRUE_STRINGS = {"on", "true", "1", "yes"}
+_FALSE_STRINGS = {"off", "false", "0", "no"}
+
+# 解码器类型：输入原始值，返回解码值，无效时抛出 ValueError
+# Decoder type: takes the raw value, returns the decoded value, raises ValueError if invalid
+Decoder = Callable[[Any], Any]
+
+
+@dataclass
+class WindowResult:
+    """
+    一个聚合窗口的结果
+    Result of one aggregation window.
+    """
+    mean: float
+    minimum: float
+    maximum: float
+    count: int
+
+    def as_attributes(self) -> dict[str, Any]:
+        """
+        转换为实体属性
+        Convert to entity attributes.
+        """
+        return {
+            "min": self.minimum,
+            "max": self.maximum,
+            "count": self.count,
+        }
+
+
+class WindowAggregator:
+    """
+    时间窗口聚合器
+    Incremental tumbling-window aggregator.
+
+    只保存计数、总和、最小值和最大值，每个样本 O(1)。
+    Only keeps count, sum, min and max, O(1) per sample.
+    """
+
+    def __init__(self, window: float) -> None:
+        """
+        初始化聚合器
+        Initialize the aggregator.
+
+        参数 | Args:
+            window: 窗口长度（秒）| Window length in seconds
+        """
+        self.window = window
+        self._count = 0
+        self._total = 0.0
+        self._minimum = 0.0
+        self._maximum = 0.0
+        self._deadline = 0.0
+
+    @property
+    def pending(self) -> bool:
+        """
+        当前窗口是否有样本
+        Return if the current window holds samples.
+        """
+        return self._count > 0
+
+    @property
+    def deadline(self) -> float:
+        """
+        当前窗口的结束时间
+        Return the end time of the current window.
+        """
+        return self._deadline
+
+    def add(self, value: float, now: float) -> WindowResult | None:
+        """
+        添加一个样本
+        Add one sample.
+
+        如果样本落在已结束的窗口之后（定时器尚未触发），先关闭旧窗口并返回其结果，
+        新样本开启下一个窗口。
+        If the sample arrives after the current window ended (timer not yet fired),
+        the old window is closed and returned; the sample opens the next window.
+
+        参数 | Args:
+            value: 样本值 | Sample value
+            now: 当前单调时间（秒）| Current monotonic time in seconds
+
+        返回 | Returns:
+            WindowResult: 被关闭窗口的结果，否则为 None
+                          Result of the closed window, otherwise None
+        """
+        result = None
+        if self._count and now >= self._deadline:
+            result = self.flush()
+
+        if not self._count:
+            self._deadline = now + self.window
+            self._minimum = value
+            self._maximum = value
+        elif value < self._minimum:
+            self._minimum = value
+        elif value > self._maximum:
+            self._maximum = value
+
+        self._count += 1
+        self._total += value
+        return result
+
+    def flush(self) -> WindowResult | None:
+        """
+        关闭当前窗口
+        Close the current window.
+
+        返回 | Returns:
+            WindowResult: 窗口结果，窗口为空时返回 None
+                          Window result, None if the window is empty
+        """
+        if not self._count:
+            return None
+
+        result = WindowResult(
+            mean=self._total / self._count,
+            minimum=self._minimum,
+            maximum=self._maximum,
+            count=self._count,
+        )
+        self._count = 0
+        self._total = 0.0
+        return result
+
+
+class DeadbandFilter:
+    """
+    死区过滤器
+    Precision-aware deadband filter.
+
+    与上一次写入的值比较，以下情况的值会被抑制：
+    Compared with the last written value, a value is suppressed when:
+    - 按声明精度四舍五入后相同 | It rounds to the same value at the declared precision
+    - 变化小于绝对死区 | It moves less than the absolute deadband
+    - 变化小于百分比死区 | It moves less than the percentage deadband
+    """
+
+    def __init__(
+        self,
+        precision: int | None = None,
+        absolute: float | None = None,
+        percent: float | None = None,
+    ) -> None:
+        """
+        初始化过滤器
+        Initialize the filter.
+
+        参数 | Args:
+            precision: 显示精度（小数位数）| Display precision (decimal places)
+            absolute: 绝对死区 | Absolute deadband
+            percent: 百分比死区 | Percentage deadband
+        """
+        self.precision = precision
+        self.absolute = absolute
+        self.percent = percent
+        self.suppressed = 0
+        self.passed = 0
+        self._last_value: float | None = None
+        self._last_attributes: dict[str, Any] | None = None
+
+    def accept(self, value: float, attributes: dict[str, Any]) -> bool:
+        """
+        判断值是否需要写入
+        Decide whether a value should be written.
+
+        属性变化的值总是写入。
+        Values whose attributes changed are always written.
+
+        参数 | Args:
+            value: 新值 | New value
+            attributes: 新属性 | New attributes
+
+        返回 | Returns:
+            bool: 是否写入 | Whether to write
+        """
+        last = self._last_value
+        if last is not None and attributes == self._last_attributes:
+            delta = abs(value - last)
+            if (
+                (self.precision is not None
+                 and round(value, self.precision) == round(last, self.precision))
+                or (self.absolute is not None and delta < self.absolute)
+                or (self.percent is not None and delta < abs(last) * self.percent / 100)
+            ):
+                self.suppressed += 1
+                return False
+
+        self._last_value = value
+        self._last_attributes = attributes
+        self.passed += 1
+        return True
+
+
+class EntityIngest:
+    """
+    单个实体的接入处理管线
+    Ingest pipeline of a single entity.
+
+    由设备发现配置和用户选项构建，设备收到 state 消息时调用。
+    Built from discovery config and user options, used when a state message arrives.
+    """
+
+    def __init__(
+        self,
+        decoder: Decoder | None = None,
+        aggregator: WindowAggregator | None = None,
+        deadband: DeadbandFilter | None = None,
+    ) -> None:
+        """
+        初始化处理管线
+        Initialize the pipeline.
+        """
+        self.decoder = decoder
+        self.aggregator = aggregator
+        self.deadband = deadband
+        # 被解码器拒绝的值的数量 | Number of values rejected by the decoder
+        self.rejected = 0
+        # 窗口定时器句柄（由设备管理）| Window timer handle (owned by device)
+        self.flush_handle: asyncio.TimerHandle | None = None
+        # 窗口内最新的设备属性 | Latest device attributes within the window
+        self.last_attributes: dict[str, Any] = {}
+
+    @property
+    def is_passthrough(self) -> bool:
+        """
+        管线是否不做任何处理
+        Return if the pipeline does nothing.
+        """
+        return self.decoder is None and self.aggregator is None and self.deadband is None
+
+
+def build_entity_ingest(
+    entity_config: dict[str, Any],
+    aggregation_window: float | None = None,
+) -> EntityIngest | None:
+    """
+    根据实体配置构建处理管线
+    Build the ingest pipeline for an entity.
+
+    参数 | Args:
+        entity_config: 设备发现的实体配置 | Entity config from discovery
+        aggregation_window: 用户选项中的窗口（优先于设备发现）
+                            Window from options (overrides discovery)
+
+    返回 | Returns:
+        EntityIngest: 处理管线，无需处理时返回 None
+                      Ingest pipeline, None when nothing needs processing
+    """
+    decoder = compile_decoder(entity_config)
+    if entity_config.get("type") != "sensor":
+        return EntityIngest(decoder=decoder) if decoder is not None else None
+
+    window = aggregation_window
+    if window is None:
+        window = entity_config.get(DISCOVERY_AGGREGATION_WINDOW)
+
+    aggregator = None
+    if (window := _positive(window)) is not None:
+        aggregator = WindowAggregator(window)
+
+    deadband = None
+    precision = entity_config.get("precision")
+    if not isinstance(precision, int) or isinstance(precision, bool) or precision < 0:
+        precision = None
+    absolute = _positive(entity_config.get(DISCOVERY_DEADBAND))
+    percent = _positive(entity_config.get(DISCOVERY_DEADBAND_PERCENT))
+    if precision is not None or absolute is not None or percent is not None:
+        deadband = DeadbandFilter(precision, absolute, percent)
+
+    pipeline = EntityIngest(decoder=decoder, aggregator=aggregator, deadband=deadband)
+    if pipeline.is_passthrough:
+        return None
+    return pipeline
+
+
+def compile_decoder(entity_config: dict[str, Any]) -> Decoder | None:
+    """
+    根据设备发现配置编译实体的解码器
+    Compile the value decoder of an entity from its discovery config.
+
+    所有配置判断都在编译时完成，返回的函数只做类型转换、缩放、映射和校验。
+    All config lookups happen at compile time; the returned function only
+    coerces, scales, maps and validates.
+
+    参数 | Args:
+        entity_config: 设备发现的实体配置 | Entity config from discovery
+
+    返回 | Returns:
+        Decoder: 解码函数，不需要解码时返回 None
+                 Decoder function, None when values are passed through
+    """
+    entity_type = entity_config.get("type")
+
+    if entity_type == "switch":
+        return _decode_bool
+
+    if entity_type != "sensor":
+        return None
+
+    # 枚举映射 | Enum mapping
+    mapping = entity_config.get(DISCOVERY_ENUM)
+    if isinstance(mapping, dict) and mapping:
+        labels = {str(raw): label for raw, label in mapping.items()}
+        allowed = set(labels.values())
+
+        def _decode_mapped(value: Any) -> Any:
+            if isinstance(value, bool):
+                value = int(value)
+            elif isinstance(value, float) and value.is_integer():
+                value = int(value)
+            key = str(value)
+            if key in labels:
+                return labels[key]
+            if key in allowed:
+                return key
+            raise ValueError(f"unknown enum value {value!r}")
+
+        return _decode_mapped
+
+    # 枚举选项 | Enum options
+    options = entity_config.get(DISCOVERY_OPTIONS)
+    if isinstance(options, list) and options:
+        allowed_options = {str(option) for option in options}
+
+        def _decode_option(value: Any) -> str:
+            key = str(value)
+            if key not in allowed_options:
+                raise ValueError(f"value {value!r} not in options")
+            return key
+
+        return _decode_option
+
+    # 非数值传感器保持原值 | Non-numeric sensors keep the raw value
+    if entity_config.get("device_class") in NON_NUMERIC_DEVICE_CLASSES:
+        return None
+    if (
+        "state_class" in entity_config
+        and not entity_config.get("state_class")
+        and not entity_config.get("unit_of_measurement")
+    ):
+        return None
+
+    scale = as_number(entity_config.get(DISCOVERY_SCALE))
+    offset = as_number(entity_config.get(DISCOVERY_OFFSET))
+    minimum = as_number(entity_config.get(DISCOVERY_MIN))
+    maximum = as_number(entity_config.get(DISCOVERY_MAX))
+    if scale == 1:
+        scale = None
+    if offset == 0:
+        offset = None
+
+    def _decode_number(value: Any) -> int | float:
+        if isinstance(value, bool) or value is None:
+            raise ValueError(f"not a number: {value!r}")
+        if not isinstance(value, (int, float)):
+            text = str(value).strip()
+            try:
+                value = int(text)
+            except ValueError:
+                value = float(text)
+        if scale is not None:
+            value = value * scale
+        if offset is not None:
+            value = value + offset
+        if isinstance(value, float) and not math.isfinite(value):
+            raise ValueError(f"not a finite number: {value!r}")
+        if minimum is not None and value < minimum:
+            raise ValueError(f"{value} below minimum {minimum}")
+        if maximum is not None and value > maximum:
+            raise ValueError(f"{value} above maximum {maximum}")
+        return value
+
+    return _decode_number
+
+
+def _decode_bool(value: Any) -> bool:
+    """
+    解码开关状态
+    Decode a switch state.
+    """
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        if value in (0, 1):
+            return bool(value)
+        raise ValueError(f"not a switch state: {value!r}")
+    text = str(value).strip().lower()
+    if text in _TRUE_STRINGS:
+        return True
+    if text in _FALSE_STRINGS:
+        return False
+    raise ValueError(f"not a switch state: {value!r}")
+
+
+def as_number(value: Any) -> float | None:
+    """
+    尝试将值转换为数字
+    Try to convert a value to a number.
+
+    布尔值不被视为数字。
+    Booleans are not treated as numbers.
+    """
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _positive(value: Any) -> float | None:
+    """
+    解析正数配置，无效时返回 None
+    Parse a positive number setting, None if invalid.
+    """
+    number = as_number(value)
+    if number is None or not number > 0:
+        return None
+    return number
@@ -0,0 +1,215 @@
+"""
+Seeed HA Discovery - Seeed 紧凑广播负载
+Seeed HA Discovery - Compact Seeed advertisement payload.
+
+BTHome 每个对象都要 1 字节 ID 加上按字节对齐的值，一条 31 字节的广播只能放下
+有限的读数。多传感器的板子可以改用 Seeed Manufacturer Data（公司 ID 0x5EED）
+中的紧凑格式：用存在掩码代替对象 ID，各字段按实际需要的位数紧密排列，
+计数器相对最近的关键帧做差分编码。
+BTHome spends a 1-byte ID plus a byte-aligned value on every object, which caps
+how many readings fit in one 31-byte advertisement. Dense multi-sensor boards can
+use the compact format in the Seeed manufacturer data (company ID 0x5EED) instead:
+a presence mask replaces the object IDs, fields are packed with just the bits they
+need, and counters are delta-encoded against the latest keyframe.
+
+负载格式（Manufacturer Data 中公司 ID 之后）| Payload format (after the company ID):
+    字节 0  | Byte 0   头部 | Header
+                         bit 7-5: 版本（1）| Version (1)
+                         bit 0:   关键帧标志 | Keyframe flag
+    字节 1  | Byte 1   序号，每次新的读数加 1，重复的广播序号相同
+                       Sequence, +1 per new reading, repeated advertisements keep it
+    字节 2  | Byte 2   关键帧 ID：关键帧自身的 ID，差分帧引用的关键帧 ID
+                       Keyframe ID: a keyframe's own ID, or the keyframe a delta frame refers to
+    字节 3-4 | Bytes 3-4 存在掩码（小端），第 i 位表示字段 i 存在
+                       Presence mask (little-endian), bit i means field i is present
+    字节 5- | Bytes 5-  位流：按掩码位序排列的字段，从最低位开始（LSB first）
+                       Bit stream: present fields in mask bit order, least significant bit first
+
+字段表（值 = 原始值 × 比例 + 偏移）| Field table (value = raw × scale + offset):
+    位 | Bit  对象 | Object         位数 | Bits          比例 | Scale  偏移 | Offset
+    0    0x01 Battery (%)          7                    1
+    1    0x45 Temperature (°C)     12 有符号 | signed  0.1
+    2    0x03 Humidity (%)         10                   0.1
+    3    0x04 Pressure (hPa)       14                   0.1      300
+    4    0x05 Illuminance (lx)     17                   1
+    5    0x12 CO2 (ppm)            14                   1
+    6    0x13 TVOC (µg/m³)         12                   1
+    7    0x0D PM2.5 (µg/m³)        10                   1
+    8    0x0E PM10 (µg/m³)         10                   1
+    9    0x2F Moisture (%)         7                    1
+    10   0x0C Voltage (V)          12                   0.001
+    11   0x3E Count                32 / 差分 | delta 8   1
+    12   0x0A Energy (kWh)         24 / 差分 | delta 12  0.001
+
+计数器字段在关键帧中是绝对值，在差分帧中是相对关键帧的增量。收到引用的
+关键帧之前，差分帧中的计数器被跳过，其他字段照常解码。
+Counter fields hold the absolute value in a keyframe and the increase since the
+keyframe in a delta frame. Until the referenced keyframe has been received,
+counters of delta frames are skipped while the other fields decode as usual.
+
+对象 ID、名称、设备类别和单位取自 BTHome 对象表，所以两种格式共用同一套实体。
+Object IDs, names, device classes and units come from the BTHome object table,
+so both formats share the same entities.
+"""
+from __future__ import annotations
+
+import logging
+from typing import NamedTuple
+
+from .bluetooth import BTHomeSensorData
+from .const import BTHOME_SENSOR_TYPES
+
+_LOGGER = logging.getLogger(__name__)
+
+# 负载版本 | Payload version
+SEEED_PAYLOAD_VERSION = 1
+SEEED_PAYLOAD_VERSION_SHIFT = 5
+# 关键帧标志 | Keyframe flag
+SEEED_PAYLOAD_KEYFRAME = 0x01
+# 头部字节数 | Header bytes
+SEEED_PAYLOAD_HEADER_SIZE = 5
+
+
+class _SeeedField(NamedTuple):
+    """
+    紧凑负载的一个字段
+    One field of the compact payload.
+    """
+    object_id: int
+    bits: int
+    scale: float = 1
+    offset: float = 0
+    signed: bool = False
+    # 差分帧中的位数，0 表示不是计数器 | Bits in a delta frame, 0 if not a counter
+    delta_bits: int = 0
+
+
+# 按掩码位序排列的字段 | Fields in mask bit order
+SEEED_PAYLOAD_FIELDS: tuple[_SeeedField, ...] = (
+    _SeeedField(0x01, 7),
+    _SeeedField(0x45, 12, 0.1, signed=True),
+    _SeeedField(0x03, 10, 0.1),
+    _SeeedField(0x04, 14, 0.1, 300),
+    _SeeedField(0x05, 17),
+    _SeeedField(0x12, 14),
+    _SeeedField(0x13, 12),
+    _SeeedField(0x0D, 10),
+    _SeeedField(0x0E, 10),
+    _SeeedField(0x2F, 7),
+    _SeeedField(0x0C, 12, 0.001),
+    _SeeedField(0x3E, 32, delta_bits=8),
+    _SeeedField(0x0A, 24, 0.001, delta_bits=12),
+)
+
+
+def seeed_payload_sequence(data: bytes) -> int | None:
+    """
+    不解码整个负载，直接读取序号（用于去重）
+    Read the sequence without decoding the whole payload (for de-duplication).
+    """
+    if (
+        len(data) >= SEEED_PAYLOAD_HEADER_SIZE
+        and data[0] >> SEEED_PAYLOAD_VERSION_SHIFT == SEEED_PAYLOAD_VERSION
+    ):
+        return data[1]
+    return None
+
+
+class SeeedPayloadDecoder:
+    """
+    单个设备的紧凑负载解码器（保存最近的关键帧）
+    Compact payload decoder of one device (keeps the latest keyframe).
+    """
+
+    def __init__(self) -> None:
+        """
+        初始化解码器
+        Initialize the decoder.
+        """
+        # 最近的关键帧 ID 和其中的计数器 | Latest keyframe ID and its counters
+        self._keyframe_id: int | None = None
+        self._counters: dict[int, int] = {}
+        # 统计 | Statistics
+        self.keyframes = 0
+        self.deltas = 0
+        self.missing_keyframe = 0
+
+    def decode(self, data: bytes) -> list[BTHomeSensorData] | None:
+        """
+        解码一条紧凑负载
+        Decode one compact payload.
+
+        参数 | Args:
+            data: Manufacturer Data（公司 ID 之后）| Manufacturer data (after the company ID)
+
+        返回 | Returns:
+            list: 传感器数据，不是紧凑负载时为 None
+                  Sensor data, None if this is not a compact payload
+        """
+        if seeed_payload_sequence(data) is None:
+            return None
+
+        keyframe = bool(data[0] & SEEED_PAYLOAD_KEYFRAME)
+        keyframe_id = data[2]
+        mask = data[3] | data[4] << 8
+        stream = int.from_bytes(data[SEEED_PAYLOAD_HEADER_SIZE:], "little")
+        available = (len(data) - SEEED_PAYLOAD_HEADER_SIZE) * 8
+
+        if keyframe:
+            self._keyframe_id = keyframe_id
+            self._counters = {}
+            self.keyframes += 1
+        else:
+            self.deltas += 1
+        has_keyframe = keyframe_id == self._keyframe_id
+
+        sensors: list[BTHomeSensorData] = []
+        position = 0
+        for bit in range(16):
+            if not mask & (1 << bit):
+                continue
+            if bit >= len(SEEED_PAYLOAD_FIELDS):
+                # 未知字段，不知道位数，无法继续 | Unknown field, its width is unknown, stop here
+                _LOGGER.debug("Unknown Seeed payload field: bit %d", bit)
+                break
+
+            field = SEEED_PAYLOAD_FIELDS[bit]
+            bits = field.bits if keyframe or not field.delta_bits else field.delta_bits
+            if position + bits > available:
+                _LOGGER.debug("Truncated Seeed payload at bit %d", bit)
+                break
+            raw = (stream >> position) & ((1 << bits) - 1)
+            position += bits
+
+            if field.delta_bits:
+                if keyframe:
+                    self._counters[field.object_id] = raw
+                elif has_keyframe and field.object_id in self._counters:
+                    raw += self._counters[field.object_id]
+                else:
+                    self.missing_keyframe += 1
+                    continue
+            elif field.signed and raw >> (bits - 1):
+                raw -= 1 << bits
+
+            info = BTHOME_SENSOR_TYPES[field.object_id]
+            value = raw * field.scale + field.offset
+            sensors.append(BTHomeSensorData(
+                object_id=field.object_id,
+                name=info["name"],
+                value=round(value, 3) if field.scale != 1 else int(value),
+                device_class=info.get("device_class"),
+                unit=info.get("unit"),
+            ))
+        return sensors
+
+    def stats(self) -> dict[str, int]:
+        """
+        返回解码统计
+        Return decoding statistics.
+        """
+        return {
+            "keyframes": self.keyframes,
+            "deltas": self.deltas,
+            "missing_keyframe": self.missing_keyframe,
+        }
@@ -18,6 +18,9 @@ WiFi 传感器工作流程 | WiFi sensor workflow:
    Device continuously sends state messages to update sensor values
 4. 实体自动刷新 UI 显示
    Entities automatically refresh UI display
+5. 设备定期发送 stats 消息时，额外创建健康诊断传感器（堆内存、信号、运行时间等）
+   When the device sends periodic stats messages, health diagnostic sensors
+   (heap, signal, uptime, ...) are created as well
 
 BLE 传感器工作流程 | BLE sensor workflow:
 1. 设备广播 BTHome 格式数据
@@ -42,33 +45,98 @@ BLE 传感器工作流程 | BLE sensor workflow:
 from __future__ import annotations
 
 import logging
-from typing import Any
+from collections.abc import Mapping
+from typing import Any, Callable
 
 from homeassistant.components.sensor import (
     SensorEntity,
+    SensorEntityDescription,
     SensorDeviceClass,
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import (
+    SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
+    EntityCategory,
+    UnitOfInformation,
+    UnitOfTime,
+)
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
     DOMAIN,
-    MANUFACTURER,
     CONF_DEVICE_ID,
-    CONF_MODEL,
     CONF_CONNECTION_TYPE,
     CONF_BLE_ADDRESS,
     CONNECTION_TYPE_BLE,
     CONNECTION_TYPE_WIFI,
+    MSG_TYPE_STATS,
 )
+from .discovery import PlatformDiscovery
+from .entity_store import EntityRecord
 
 # 创建日志记录器
 _LOGGER = logging.getLogger(__name__)
 
+# 设备健康诊断传感器，key 对应 DeviceHealth.stats() 中的字段
+# Device health diagnostic sensors, keys match the fields of DeviceHealth.stats()
+HEALTH_SENSORS: tuple[SensorEntityDescription, ...] = (
+    SensorEntityDescription(
+        key="free_heap",
+        name="Free heap",
+        icon="mdi:memory",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key="min_free_heap",
+        name="Minimum free heap",
+        icon="mdi:memory",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key="heap_trend",
+        name="Heap trend",
+        icon="mdi:chart-line-variant",
+        native_unit_of_measurement="B/h",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key="rssi",
+        name="WiFi signal",
+        device_class=SensorDeviceClass.SIGNAL_STRENGTH,
+        native_unit_of_measurement=SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key="uptime",
+        name="Uptime",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+    ),
+    SensorEntityDescription(
+        key="loop_time",
+        name="Loop time",
+        icon="mdi:timer-outline",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+    ),
+    SensorEntityDescription(
+        key="reboot_count",
+        name="Reboots",
+        icon="mdi:restart",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -129,46 +197,85 @@ async def _async_setup_wifi_sensors(
     # 设置 WiFi 传感器平台 | Setting up WiFi sensor platform
     _LOGGER.info("Setting up WiFi sensor platform, device: %s", entry.data.get(CONF_DEVICE_ID))
 
-    # 创建已发现的传感器实体
-    entities = []
-    for entity_id, entity_config in coordinator.device.entities.items():
-        # 只处理 sensor 类型的实体 | Only process sensor type entities
-        if entity_config.get("type") == "sensor":
-            _LOGGER.info("Creating sensor: %s (%s)", entity_id, entity_config.get("name"))
-            entities.append(SeeedHASensor(coordinator, entity_config, entry))
+    # 发现管理器 - 根据发现差异添加、删除和更新传感器
+    # Discovery manager - adds, removes and updates sensors from discovery diffs
+    manager = PlatformDiscovery(
+        hass,
+        "sensor",
+        lambda record: SeeedHASensor(coordinator, record, entry),
+        async_add_entities,
+    )
 
-    # 添加实体到 HA | Add entities to HA
-    if entities:
-        async_add_entities(entities)
-        _LOGGER.info("Added %d sensors", len(entities))
+    # 创建已发现的传感器实体 | Create already discovered sensor entities
+    manager.async_apply(coordinator.device.entities.of_type("sensor").values())
 
     # 注册发现回调，处理后续发现的传感器 | Register discovery callback
-    def handle_discovery(data: dict[str, Any]) -> None:
+    def handle_discovery(records: Mapping[str, EntityRecord], complete: bool) -> None:
         """
-        处理新发现的传感器
-        Handle newly discovered sensors.
+        处理设备发现（只收到 sensor 类型的记录）
+        Handle discovery (only receives sensor records).
 
-        当设备报告新的传感器时，动态创建实体。
-        Dynamically create entities when device reports new sensors.
+        新实体被创建，消失的实体被删除，配置变化的实体被更新。
+        New sensors are created, vanished ones removed and changed ones updated.
         """
-        new_entities = []
+        manager.async_apply(records.values(), complete)
+
+    # 注册按类型路由的回调 | Register the type-routed callback
+    entry.async_on_unload(
+        coordinator.device.add_discovery_route("sensor", handle_discovery)
+    )
+
+    # 健康诊断传感器 | Health diagnostic sensors
+    _async_setup_health_sensors(coordinator, entry, async_add_entities)
+
+
+@callback
+def _async_setup_health_sensors(
+    coordinator,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """
+    设置设备健康诊断传感器
+    Set up device health diagnostic sensors.
+
+    旧固件不发送 stats 消息，所以传感器在收到第一条 stats 消息后才创建。
+    Older firmware sends no stats messages, so the sensors are only created
+    once the first stats message arrives.
+    """
+    device = coordinator.device
+
+    def add_sensors() -> None:
+        """添加健康传感器 | Add the health sensors"""
+        async_add_entities(
+            SeeedHAHealthSensor(coordinator, entry, description)
+            for description in HEALTH_SENSORS
+        )
 
-        for entity_id, entity_config in coordinator.device.entities.items():
-            if entity_config.get("type") == "sensor":
-                # 检查实体是否已存在 | Check if entity already exists
-                existing_ids = [e._entity_id for e in entities]
-                if entity_id not in existing_ids:
-                    _LOGGER.info("Discovered new sensor: %s", entity_id)
-                    new_entity = SeeedHASensor(coordinator, entity_config, entry)
-                    entities.append(new_entity)
-                    new_entities.append(new_entity)
+    if device.health.has_data:
+        add_sensors()
+        return
 
-        if new_entities:
-            async_add_entities(new_entities)
-            _LOGGER.info("Dynamically added %d new sensors", len(new_entities))
+    unsub: Callable[[], None] | None = None
 
-    # 注册回调
-    coordinator.device.add_discovery_callback(handle_discovery)
+    @callback
+    def handle_state(data: dict[str, Any]) -> None:
+        """收到第一条 stats 消息时创建传感器 | Create the sensors on the first stats message"""
+        nonlocal unsub
+        if data.get("type") != MSG_TYPE_STATS or unsub is None:
+            return
+        unsub()
+        unsub = None
+        add_sensors()
+
+    @callback
+    def remove_listener() -> None:
+        """卸载时移除监听 | Remove the listener on unload"""
+        if unsub is not None:
+            unsub()
+
+    unsub = device.add_state_callback(handle_state)
+    entry.async_on_unload(remove_listener)
 
 
 class SeeedHASensor(CoordinatorEntity, SensorEntity):
@@ -193,7 +300,7 @@ class SeeedHASensor(CoordinatorEntity, SensorEntity):
     def __init__(
         self,
         coordinator,
-        entity_config: dict[str, Any],
+        record: EntityRecord,
         entry: ConfigEntry,
     ) -> None:
         """
@@ -202,37 +309,53 @@ class SeeedHASensor(CoordinatorEntity, SensorEntity):
 
         参数 | Args:
             coordinator: 数据协调器
-            entity_config: 实体配置（来自设备发现）
-                          包含: id, name, device_class, unit, state_class, precision, state
+            record: 实体记录（配置来自设备发现）
+                    record.config 包含: id, name, device_class, unit, state_class, precision
             entry: 配置入口
         """
         # 调用父类初始化，注册到协调器
         super().__init__(coordinator)
 
         self._entry = entry
+        # 直接持有实体记录，读取状态时无需查找
+        # Hold the entity record directly, no lookup when reading state
+        self._record = record
+        entity_config = record.config
         self._entity_config = entity_config
 
         # 实体 ID（设备上报的 ID）
-        self._entity_id = entity_config.get("id", "")
-
-        # =====================================================================
-        # 设置实体属性 | Set entity attributes
-        # =====================================================================
-
-        # 实体名称 - 显示在 UI 上
-        self._attr_name = entity_config.get("name", self._entity_id)
+        self._entity_id = record.entity_id
 
         # 唯一 ID - 用于 HA 内部识别
         # 格式: {device_id}_{entity_id}
         device_id = entry.data.get(CONF_DEVICE_ID, "")
         self._attr_unique_id = f"{device_id}_{self._entity_id}"
 
-        # =====================================================================
-        # 设置传感器特定属性 | Set sensor-specific attributes
-        # =====================================================================
+        # 设置实体属性 | Set entity attributes
+        self._apply_config(entity_config)
+
+        # 传感器初始化完成 | Sensor initialization complete
+        _LOGGER.info(
+            "Sensor initialized: %s (class=%s, unit=%s)",
+            self._attr_name,
+            entity_config.get("device_class"),
+            entity_config.get("unit_of_measurement"),
+        )
+
+    def _apply_config(self, entity_config: dict[str, Any]) -> None:
+        """
+        根据设备发现配置设置实体属性
+        Set entity attributes from the discovery config.
+
+        创建实体和配置变化时都会调用，所以每个属性都被显式赋值。
+        Called on creation and on config changes, so every attribute is set explicitly.
+        """
+        # 实体名称 - 显示在 UI 上
+        self._attr_name = entity_config.get("name", self._entity_id)
 
         # 设备类别 - 如 temperature, humidity | Device class
         # 影响 UI 显示的图标和格式 | Affects UI icon and formatting
+        self._attr_device_class = None
         device_class = entity_config.get("device_class")
         if device_class:
             try:
@@ -241,36 +364,47 @@ class SeeedHASensor(CoordinatorEntity, SensorEntity):
             except ValueError:
                 _LOGGER.warning("Unknown device class: %s", device_class)
 
+        # 枚举选项 - 枚举传感器的所有可能取值 | Enum options - possible values of enum sensors
+        # 枚举传感器没有状态类别 | Enum sensors have no state class
+        enum_options: list[str] = []
+        if isinstance(options := entity_config.get("options"), list):
+            enum_options = [str(option) for option in options]
+        elif isinstance(enum_map := entity_config.get("enum"), dict):
+            enum_options = list(dict.fromkeys(str(label) for label in enum_map.values()))
+        self._attr_options = enum_options or None
+        if enum_options:
+            self._attr_device_class = SensorDeviceClass.ENUM
+
         # 状态类别 - 如 measurement, total, total_increasing
         # 影响历史记录和统计
+        self._attr_state_class = None
         state_class = entity_config.get("state_class", "measurement")
-        if state_class:
+        if state_class and not enum_options:
             try:
                 self._attr_state_class = SensorStateClass(state_class)
             except ValueError:
                 self._attr_state_class = SensorStateClass.MEASUREMENT
 
         # 单位 - 如 °C, % | Unit
-        if unit := entity_config.get("unit_of_measurement"):
-            self._attr_native_unit_of_measurement = unit
-            _LOGGER.debug("Set unit: %s", unit)
+        self._attr_native_unit_of_measurement = entity_config.get("unit_of_measurement") or None
 
         # 精度 - 小数位数 | Precision - decimal places
-        if precision := entity_config.get("precision"):
-            self._attr_suggested_display_precision = precision
-            _LOGGER.debug("Set precision: %d", precision)
+        self._attr_suggested_display_precision = entity_config.get("precision") or None
 
         # 图标 - 如 mdi:thermometer
-        if icon := entity_config.get("icon"):
-            self._attr_icon = icon
+        self._attr_icon = entity_config.get("icon") or None
 
-        # 传感器初始化完成 | Sensor initialization complete
-        _LOGGER.info(
-            "Sensor initialized: %s (class=%s, unit=%s)",
-            self._attr_name,
-            device_class,
-            entity_config.get("unit_of_measurement"),
-        )
+    @callback
+    def async_apply_record(self, record: EntityRecord) -> None:
+        """
+        应用变化后的设备发现配置
+        Apply a changed discovery config.
+        """
+        self._record = record
+        self._entity_config = record.config
+        self._apply_config(record.config)
+        if self.hass is not None:
+            self.async_write_ha_state()
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -278,40 +412,10 @@ class SeeedHASensor(CoordinatorEntity, SensorEntity):
         返回设备信息
         Return device info.
 
-        这个属性定义了设备在 HA 设备页面的显示信息。
-        同一设备的所有实体共享相同的设备信息。
+        同一设备的所有实体共享设备缓存的设备描述。
+        All entities of a device share the descriptor cached by the device.
         """
-        device_data = self.coordinator.device.device_info
-        entry_data = self._entry.data
-        
-        # 获取设备 IP 地址 | Get device IP address
-        host = entry_data.get("host", "")
-        
-        # 构建设备信息 | Build device info
-        info = DeviceInfo(
-            # 设备标识符 - 用于关联实体到设备 | Device identifier
-            identifiers={(DOMAIN, entry_data.get(CONF_DEVICE_ID, ""))},
-            # 设备名称 | Device name
-            name=device_data.get("name", "Seeed HA Device"),
-            # 制造商 | Manufacturer
-            manufacturer=MANUFACTURER,
-            # 设备型号 | Device model
-            model=entry_data.get(CONF_MODEL, device_data.get("model", "ESP32")),
-            # 固件版本 | Firmware version
-            sw_version=device_data.get("version", "1.0.0"),
-        )
-        
-        # 添加配置 URL（设备 IP 地址）| Add configuration URL (device IP)
-        if host:
-            info["configuration_url"] = f"http://{host}"
-        
-        # 添加 MAC 地址连接信息 | Add MAC address connection info
-        mac_address = entry_data.get("mac_address", "")
-        if mac_address:
-            from homeassistant.helpers.device_registry import CONNECTION_NETWORK_MAC
-            info["connections"] = {(CONNECTION_NETWORK_MAC, mac_address.lower())}
-        
-        return info
+        return self.coordinator.device.device_descriptor
 
     @property
     def available(self) -> bool:
@@ -320,8 +424,11 @@ class SeeedHASensor(CoordinatorEntity, SensorEntity):
         Return if entity is available.
 
         当设备断开连接时，实体显示为不可用。
+
+        声明了 expected_interval 的实体超过预期间隔未上报时也不可用。
+        Entities declaring expected_interval are also unavailable when overdue.
         """
-        return self.coordinator.device.connected
+        return self.coordinator.device.entity_available(self._record)
 
     @property
     def native_value(self) -> Any:
@@ -330,17 +437,10 @@ class SeeedHASensor(CoordinatorEntity, SensorEntity):
         Return the state of the sensor.
 
         这是传感器最重要的属性，返回当前测量值。
-        值从协调器的设备数据中获取。
+        值已在接入时解码，直接从实体记录读取。
+        The value was decoded at ingest and is read straight from the entity record.
         """
-        entities = self.coordinator.device.entities
-
-        if self._entity_id in entities:
-            value = entities[self._entity_id].get("state")
-            # 传感器当前值 | Sensor current value
-            _LOGGER.debug("Sensor %s current value: %s", self._entity_id, value)
-            return value
-
-        return None
+        return self._record.state
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
@@ -351,9 +451,78 @@ class SeeedHASensor(CoordinatorEntity, SensorEntity):
         这些属性会显示在实体的属性面板中。
         可以包含如最后更新时间、原始数据等信息。
         """
-        entities = self.coordinator.device.entities
+        return self._record.attributes
+
+
+class SeeedHAHealthSensor(CoordinatorEntity, SensorEntity):
+    """
+    Seeed HA 设备健康诊断传感器
+    Seeed HA device health diagnostic sensor.
+
+    显示设备通过 stats 消息上报的健康统计，以及集成计算的堆内存趋势和重启次数。
+    Shows the health telemetry the device reports in stats messages, plus the
+    heap trend and reboot count computed by the integration.
+    """
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(
+        self,
+        coordinator,
+        entry: ConfigEntry,
+        description: SensorEntityDescription,
+    ) -> None:
+        """
+        初始化健康传感器
+        Initialize the health sensor.
+
+        参数 | Args:
+            coordinator: 数据协调器 | Data coordinator
+            entry: 配置入口 | Config entry
+            description: 传感器描述 | Sensor description
+        """
+        super().__init__(coordinator)
+        self.entity_description = description
+        device_id = entry.data.get(CONF_DEVICE_ID, "")
+        self._attr_unique_id = f"{device_id}_health_{description.key}"
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """
+        返回设备信息
+        Return device info.
+        """
+        return self.coordinator.device.device_descriptor
+
+    @property
+    def available(self) -> bool:
+        """
+        返回实体是否可用
+        Return if entity is available.
+        """
+        return self.coordinator.device.connected
+
+    @property
+    def native_value(self) -> Any:
+        """
+        返回最新的健康统计值
+        Return the latest health value.
+        """
+        return self.coordinator.device.health.value(self.entity_description.key)
 
-        if self._entity_id in entities:
-            return entities[self._entity_id].get("attributes", {})
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """
+        返回额外的状态属性
+        Return extra state attributes.
 
-        return {}
+        堆内存趋势附带泄漏标记，重启次数附带重启循环标记。
+        The heap trend carries the leak flag, the reboot count the reboot loop flag.
+        """
+        health = self.coordinator.device.health
+        if self.entity_description.key == "heap_trend":
+            return {"leak_suspected": health.leak_suspected}
+        if self.entity_description.key == "reboot_count":
+            return {"reboot_loop": health.reboot_loop}
+        return None
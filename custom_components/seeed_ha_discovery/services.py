@@ -0,0 +1,182 @@
+"""
+Seeed HA Discovery - 服务
+Seeed HA Discovery - Services.
+
+BLE 广播抓取与回放服务：
+BLE advertisement capture and replay services:
+1. start_capture - 把一个设备（或全部）的广播抓取到配置目录中的文件
+   Capture the advertisements of one device (or all) to a file in the config directory
+2. stop_capture - 停止抓取并写入剩余的记录
+   Stop the capture and write the remaining records
+3. replay - 把抓取文件回放到一个 BLE 配置入口，返回吞吐量和延迟
+   Replay a capture file into a BLE config entry and return throughput and latency
+
+文件只能位于配置目录中允许的路径下。
+Files must be under an allowed path in the config directory.
+"""
+from __future__ import annotations
+
+import logging
+from functools import partial
+
+import voluptuous as vol
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import (
+    Event,
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+
+from .const import (
+    DOMAIN,
+    ATTR_ADDRESS,
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_FILENAME,
+    ATTR_SPEED,
+    CONF_CONNECTION_TYPE,
+    CONNECTION_TYPE_BLE,
+    DATA_BLE_CAPTURE,
+    SERVICE_REPLAY,
+    SERVICE_START_CAPTURE,
+    SERVICE_STOP_CAPTURE,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+START_CAPTURE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_FILENAME): cv.string,
+        vol.Optional(ATTR_ADDRESS): cv.string,
+    }
+)
+
+REPLAY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_FILENAME): cv.string,
+        vol.Optional(ATTR_SPEED, default=1.0): vol.All(vol.Coerce(float), vol.Range(min=0)),
+    }
+)
+
+
+def _capture_path(hass: HomeAssistant, filename: str) -> str:
+    """
+    把文件名解析为配置目录中的路径
+    Resolve a file name to a path in the config directory.
+
+    异常 | Raises:
+        HomeAssistantError: 路径不允许访问 | The path is not allowed
+    """
+    path = hass.config.path(filename)
+    if not hass.config.is_allowed_path(path):
+        raise HomeAssistantError(f"Path is not allowed: {path}")
+    return path
+
+
+async def _async_start_capture(hass: HomeAssistant, call: ServiceCall) -> None:
+    """
+    开始抓取 BLE 广播
+    Start capturing BLE advertisements.
+    """
+    from .ble_capture import BLECaptureRecorder
+
+    if DATA_BLE_CAPTURE in hass.data:
+        raise HomeAssistantError("A BLE capture is already running")
+
+    path = _capture_path(hass, call.data[ATTR_FILENAME])
+    address = call.data.get(ATTR_ADDRESS)
+    recorder = hass.data[DATA_BLE_CAPTURE] = BLECaptureRecorder(
+        hass, path, address.upper() if address else None
+    )
+    recorder.async_start()
+    _LOGGER.info("BLE capture started: %s (%s)", path, address or "all addresses")
+
+
+async def _async_stop_capture(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """
+    停止抓取 BLE 广播
+    Stop capturing BLE advertisements.
+    """
+    if (recorder := hass.data.pop(DATA_BLE_CAPTURE, None)) is None:
+        raise HomeAssistantError("No BLE capture is running")
+
+    records = await recorder.async_stop()
+    _LOGGER.info("BLE capture stopped: %d records", records)
+    return {"records": records}
+
+
+async def _async_replay(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """
+    把抓取文件回放到 BLE 配置入口
+    Replay a capture file into a BLE config entry.
+    """
+    from .ble_capture import async_replay, coordinator_handler, read_capture_file
+
+    entry_id = call.data[ATTR_CONFIG_ENTRY_ID]
+    entry = hass.config_entries.async_get_entry(entry_id)
+    if (
+        entry is None
+        or entry.domain != DOMAIN
+        or entry.data.get(CONF_CONNECTION_TYPE) != CONNECTION_TYPE_BLE
+        or "ble_processor" not in hass.data.get(DOMAIN, {}).get(entry_id, {})
+    ):
+        raise HomeAssistantError(f"Not a loaded BLE device: {entry_id}")
+
+    path = _capture_path(hass, call.data[ATTR_FILENAME])
+    try:
+        records = await hass.async_add_executor_job(read_capture_file, path)
+    except (OSError, ValueError) as err:
+        raise HomeAssistantError(f"Cannot read BLE capture {path}: {err}") from err
+
+    stats = await async_replay(
+        records, coordinator_handler(hass, entry_id), call.data[ATTR_SPEED]
+    )
+    summary = stats.summary()
+    _LOGGER.info("BLE replay of %s finished: %s", path, summary)
+    return summary
+
+
+async def _async_stop_capture_on_shutdown(hass: HomeAssistant, event: Event) -> None:
+    """
+    Home Assistant 停止时结束抓取，缓冲的记录不会丢失
+    End the capture when Home Assistant stops so buffered records are not lost.
+    """
+    if (recorder := hass.data.pop(DATA_BLE_CAPTURE, None)) is not None:
+        await recorder.async_stop()
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """
+    注册集成的服务
+    Register the integration's services.
+
+    参数 | Args:
+        hass: Home Assistant 实例
+    """
+    hass.bus.async_listen_once(
+        EVENT_HOMEASSISTANT_STOP, partial(_async_stop_capture_on_shutdown, hass)
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_START_CAPTURE,
+        partial(_async_start_capture, hass),
+        schema=START_CAPTURE_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_STOP_CAPTURE,
+        partial(_async_stop_capture, hass),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REPLAY,
+        partial(_async_replay, hass),
+        schema=REPLAY_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
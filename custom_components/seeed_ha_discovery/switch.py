@@ -32,26 +32,27 @@ BLE 工作流程 | BLE workflow:
 from __future__ import annotations
 
 import logging
+from collections.abc import Mapping
 from typing import Any
 
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
     DOMAIN,
-    MANUFACTURER,
     CONF_DEVICE_ID,
-    CONF_MODEL,
     CONF_CONNECTION_TYPE,
     CONF_BLE_CONTROL,
     CONF_BLE_SUBSCRIBED_ENTITIES,
     CONNECTION_TYPE_BLE,
     CONNECTION_TYPE_WIFI,
 )
+from .discovery import PlatformDiscovery
+from .entity_store import EntityRecord
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -124,37 +125,29 @@ async def _async_setup_wifi_switches(
     # 设置 WiFi 开关平台 | Setting up WiFi switch platform
     _LOGGER.info("Setting up WiFi switch platform, device: %s", entry.data.get(CONF_DEVICE_ID))
 
-    entities = []
-    for entity_id, entity_config in coordinator.device.entities.items():
-        if entity_config.get("type") == "switch":
-            _LOGGER.info("Creating switch: %s (%s)", entity_id, entity_config.get("name"))
-            entities.append(SeeedHASwitch(coordinator, entity_config, entry))
+    # 发现管理器 | Discovery manager
+    manager = PlatformDiscovery(
+        hass,
+        "switch",
+        lambda record: SeeedHASwitch(coordinator, record, entry),
+        async_add_entities,
+    )
+    manager.async_apply(coordinator.device.entities.of_type("switch").values())
 
-    if entities:
-        async_add_entities(entities)
-        _LOGGER.info("Added %d switches", len(entities))
-
-    def handle_discovery(data: dict[str, Any]) -> None:
-        """
-        处理新发现的开关
-        Handle newly discovered switches.
+    def handle_discovery(records: Mapping[str, EntityRecord], complete: bool) -> None:
         """
-        new_entities = []
-
-        for entity_id, entity_config in coordinator.device.entities.items():
-            if entity_config.get("type") == "switch":
-                existing_ids = [e._entity_id for e in entities]
-                if entity_id not in existing_ids:
-                    _LOGGER.info("Discovered new switch: %s", entity_id)
-                    new_entity = SeeedHASwitch(coordinator, entity_config, entry)
-                    entities.append(new_entity)
-                    new_entities.append(new_entity)
+        处理设备发现（只收到 switch 类型的记录）
+        Handle discovery (only receives switch records).
 
-        if new_entities:
-            async_add_entities(new_entities)
-            _LOGGER.info("Dynamically added %d new switches", len(new_entities))
+        新实体被创建，消失的实体被删除，配置变化的实体被更新。
+        New switches are created, vanished ones removed and changed ones updated.
+        """
+        manager.async_apply(records.values(), complete)
 
-    coordinator.device.add_discovery_callback(handle_discovery)
+    # 注册按类型路由的回调 | Register the type-routed callback
+    entry.async_on_unload(
+        coordinator.device.add_discovery_route("switch", handle_discovery)
+    )
 
 
 class SeeedHASwitch(CoordinatorEntity, SwitchEntity):
@@ -168,7 +161,7 @@ class SeeedHASwitch(CoordinatorEntity, SwitchEntity):
     def __init__(
         self,
         coordinator,
-        entity_config: dict[str, Any],
+        record: EntityRecord,
         entry: ConfigEntry,
     ) -> None:
         """
@@ -178,58 +171,61 @@ class SeeedHASwitch(CoordinatorEntity, SwitchEntity):
         super().__init__(coordinator)
 
         self._entry = entry
+        # 直接持有实体记录 | Hold the entity record directly
+        self._record = record
+        entity_config = record.config
         self._entity_config = entity_config
-        self._entity_id = entity_config.get("id", "")
+        self._entity_id = record.entity_id
 
-        self._attr_name = entity_config.get("name", self._entity_id)
         device_id = entry.data.get(CONF_DEVICE_ID, "")
         self._attr_unique_id = f"{device_id}_{self._entity_id}"
 
-        if icon := entity_config.get("icon"):
-            self._attr_icon = icon
+        self._apply_config(entity_config)
 
         # 开关初始化完成 | Switch initialization complete
         _LOGGER.info("Switch initialized: %s (icon=%s)", self._attr_name, entity_config.get("icon"))
 
+    def _apply_config(self, entity_config: dict[str, Any]) -> None:
+        """
+        根据设备发现配置设置实体属性
+        Set entity attributes from the discovery config.
+        """
+        self._attr_name = entity_config.get("name", self._entity_id)
+        self._attr_icon = entity_config.get("icon") or None
+
+    @callback
+    def async_apply_record(self, record: EntityRecord) -> None:
+        """
+        应用变化后的设备发现配置
+        Apply a changed discovery config.
+        """
+        self._record = record
+        self._entity_config = record.config
+        self._apply_config(record.config)
+        if self.hass is not None:
+            self.async_write_ha_state()
+
     @property
     def device_info(self) -> DeviceInfo:
         """
         返回设备信息
         Return device info.
+
+        同一设备的所有实体共享设备缓存的设备描述。
+        All entities of a device share the descriptor cached by the device.
         """
-        device_data = self.coordinator.device.device_info
-        entry_data = self._entry.data
-        
-        # 获取设备 IP 地址 | Get device IP address
-        host = entry_data.get("host", "")
-
-        info = DeviceInfo(
-            identifiers={(DOMAIN, entry_data.get(CONF_DEVICE_ID, ""))},
-            name=device_data.get("name", "Seeed HA Device"),
-            manufacturer=MANUFACTURER,
-            model=entry_data.get(CONF_MODEL, device_data.get("model", "ESP32")),
-            sw_version=device_data.get("version", "1.0.0"),
-        )
-        
-        # 添加配置 URL（设备 IP 地址）| Add configuration URL (device IP)
-        if host:
-            info["configuration_url"] = f"http://{host}"
-        
-        # 添加 MAC 地址连接信息 | Add MAC address connection info
-        mac_address = entry_data.get("mac_address", "")
-        if mac_address:
-            from homeassistant.helpers.device_registry import CONNECTION_NETWORK_MAC
-            info["connections"] = {(CONNECTION_NETWORK_MAC, mac_address.lower())}
-        
-        return info
+        return self.coordinator.device.device_descriptor
 
     @property
     def available(self) -> bool:
         """
         返回实体是否可用
         Return if entity is available.
+
+        声明了 expected_interval 的实体超过预期间隔未上报时也不可用。
+        Entities declaring expected_interval are also unavailable when overdue.
         """
-        return self.coordinator.device.connected
+        return self.coordinator.device.entity_available(self._record)
 
     @property
     def is_on(self) -> bool:
@@ -237,17 +233,8 @@ class SeeedHASwitch(CoordinatorEntity, SwitchEntity):
         返回开关的当前状态
         Return current switch state.
         """
-        entities = self.coordinator.device.entities
-
-        if self._entity_id in entities:
-            state = entities[self._entity_id].get("state")
-            # 开关当前状态 | Switch current state
-            _LOGGER.debug("Switch %s reading state from entities: %s (type=%s)", 
-                         self._entity_id, state, type(state).__name__)
-            return bool(state)
-        
-        _LOGGER.warning("Switch %s not found in entities", self._entity_id)
-        return False
+        # 状态已在接入时解码为布尔值 | State was decoded to a bool at ingest
+        return bool(self._record.state)
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """
@@ -288,9 +275,4 @@ class SeeedHASwitch(CoordinatorEntity, SwitchEntity):
         返回额外的状态属性
         Return extra state attributes.
         """
-        entities = self.coordinator.device.entities
-
-        if self._entity_id in entities:
-            return entities[self._entity_id].get("attributes", {})
-
-        return {}
+        return self._record.attributes
@@ -0,0 +1,336 @@
+"""
+Seeed HA Discovery - 分层时间轮
+Seeed HA Discovery - Hierarchical timing wheel.
+
+这个模块为整个集成提供一个共享的过期检测时间轮：
+This module provides one integration-wide timing wheel for staleness detection:
+1. 三层轮，每层 64 个槽：1 秒、64 秒、4096 秒粒度，覆盖约 3 天
+   Three levels of 64 slots each: 1 s, 64 s and 4096 s granularity, covering ~3 days
+2. 所有计时器共用一个周期刻度，不再每个实体一个 asyncio 定时器
+   All timers share one periodic tick instead of one asyncio timer per entity
+3. 推迟截止时间是 O(1)：只更新截止时间，槽到期时再检查（惰性检查）
+   Pushing a deadline back is O(1): only the deadline is updated and it is
+   checked when its slot comes due (lazy check)
+4. 没有计时器时刻度自动停止
+   The tick stops by itself when no timers are scheduled
+
+用法 | Usage:
+    wheel = async_get_timing_wheel(hass)
+    timer = wheel.schedule(loop.time() + 30, on_expire)
+    timer.reschedule(loop.time() + 30)   # 每次收到数据 | on every report
+    timer.cancel()
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+from typing import Callable
+
+from homeassistant.core import HomeAssistant
+
+from .const import DATA_TIMING_WHEEL, TIMING_WHEEL_TICK
+
+_LOGGER = logging.getLogger(__name__)
+
+# 每层槽数（2 的幂）| Slots per level (power of two)
+WHEEL_BITS = 6
+WHEEL_SIZE = 1 << WHEEL_BITS
+WHEEL_MASK = WHEEL_SIZE - 1
+
+# 层数 | Number of levels
+WHEEL_LEVELS = 3
+
+# 时间轮能直接表示的最大刻度数，更远的计时器放在最高层并在到期时重新放入
+# Largest tick distance the wheel holds directly; farther timers go to the top
+# level and are re-inserted when it comes due
+WHEEL_SPAN = 1 << (WHEEL_BITS * WHEEL_LEVELS)
+
+
+class WheelTimer:
+    """
+    时间轮中的单个计时器
+    A single timer in the timing wheel.
+    """
+
+    __slots__ = ("deadline", "callback", "_wheel", "_slot")
+
+    def __init__(
+        self,
+        wheel: TimingWheel,
+        deadline: float,
+        callback: Callable[[], None],
+    ) -> None:
+        """
+        初始化计时器
+        Initialize the timer.
+
+        参数 | Args:
+            wheel: 所属时间轮 | Owning wheel
+            deadline: 截止时间（loop.time()）| Deadline (loop.time())
+            callback: 到期回调 | Expiry callback
+        """
+        self.deadline = deadline
+        self.callback = callback
+        self._wheel = wheel
+        # 所在的槽，None 表示未排程 | Slot it is in, None when not scheduled
+        self._slot: set[WheelTimer] | None = None
+
+    @property
+    def scheduled(self) -> bool:
+        """
+        计时器是否在时间轮中
+        Return if the timer is in the wheel.
+        """
+        return self._slot is not None
+
+    def reschedule(self, deadline: float) -> None:
+        """
+        修改截止时间
+        Change the deadline.
+
+        推迟截止时间只修改字段（O(1)），槽到期时再按新截止时间重新放入；
+        提前截止时间或计时器已到期时才移动槽。
+        Pushing the deadline back only updates the field (O(1)) and the timer is
+        re-inserted by its new deadline when its slot comes due; the slot only
+        moves when the deadline is brought forward or the timer already fired.
+        """
+        previous = self.deadline
+        self.deadline = deadline
+        if self._slot is not None and deadline >= previous:
+            return
+        self._wheel._insert(self)
+
+    def cancel(self) -> None:
+        """
+        取消计时器
+        Cancel the timer.
+        """
+        self._wheel._remove(self)
+
+
+class TimingWheel:
+    """
+    分层时间轮
+    Hierarchical timing wheel.
+
+    第 0 层每个槽一个刻度；第 n 层每个槽 64^n 个刻度。
+    第 0 层转完一圈时，把上一层当前槽中的计时器重新放入下层（级联）。
+    Level 0 has one tick per slot; level n has 64^n ticks per slot.
+    When level 0 wraps, timers in the current slot of the next level are
+    re-inserted into lower levels (cascading).
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        tick: float = TIMING_WHEEL_TICK,
+    ) -> None:
+        """
+        初始化时间轮
+        Initialize the timing wheel.
+
+        参数 | Args:
+            loop: 事件循环 | Event loop
+            tick: 刻度（秒）| Tick length (seconds)
+        """
+        self._loop = loop
+        self._tick = tick
+        self._wheels: list[list[set[WheelTimer]]] = [
+            [set() for _ in range(WHEEL_SIZE)] for _ in range(WHEEL_LEVELS)
+        ]
+        # 当前刻度（已处理到的刻度）| Current tick (last processed tick)
+        self._current = self._elapsed_of(loop.time())
+        self._count = 0
+        self._handle: asyncio.TimerHandle | None = None
+
+        # 统计 | Statistics
+        self.expired = 0
+        self.cascaded = 0
+
+    def __len__(self) -> int:
+        """
+        已排程的计时器数量
+        Number of scheduled timers.
+        """
+        return self._count
+
+    def schedule(self, deadline: float, callback: Callable[[], None]) -> WheelTimer:
+        """
+        添加计时器
+        Add a timer.
+
+        参数 | Args:
+            deadline: 截止时间（loop.time()）| Deadline (loop.time())
+            callback: 到期回调（在事件循环中调用）| Expiry callback (called in the event loop)
+
+        返回 | Returns:
+            WheelTimer: 计时器，可重新排程或取消 | Timer that can be rescheduled or cancelled
+        """
+        timer = WheelTimer(self, deadline, callback)
+        self._insert(timer)
+        return timer
+
+    def _tick_of(self, when: float) -> int:
+        """
+        截止时间所在的刻度（向上取整）
+        Tick a deadline falls due at (rounded up).
+        """
+        return math.ceil(when / self._tick)
+
+    def _elapsed_of(self, when: float) -> int:
+        """
+        某时间点已经过去的最后一个刻度（向下取整）
+        Last tick that has passed at a point in time (rounded down).
+        """
+        return math.floor(when / self._tick)
+
+    def _insert(self, timer: WheelTimer, earliest: int | None = None) -> None:
+        """
+        按截止时间把计时器放入对应的槽
+        Put a timer into the slot matching its deadline.
+
+        参数 | Args:
+            timer: 计时器 | Timer
+            earliest: 最早可放入的刻度，默认为下一个刻度；级联时为当前刻度
+                      Earliest tick to place into, the next tick by default;
+                      the current tick while cascading
+        """
+        if timer._slot is not None:
+            timer._slot.discard(timer)
+            self._count -= 1
+
+        if self._handle is None:
+            # 空闲后重新开始时从当前时间计起 | Restart from now after being idle
+            self._current = max(self._current, self._elapsed_of(self._loop.time()))
+
+        if earliest is None:
+            earliest = self._current + 1
+        due = max(self._tick_of(timer.deadline), earliest)
+        delta = min(due - self._current, WHEEL_SPAN - 1)
+
+        # 选择能容纳这个距离的最低层 | Pick the lowest level that holds this distance
+        level = 0
+        while delta >= 1 << (WHEEL_BITS * (level + 1)):
+            level += 1
+        if delta == WHEEL_SPAN - 1:
+            due = self._current + delta
+        slot = self._wheels[level][(due >> (WHEEL_BITS * level)) & WHEEL_MASK]
+
+        slot.add(timer)
+        timer._slot = slot
+        self._count += 1
+        self._ensure_ticking()
+
+    def _remove(self, timer: WheelTimer) -> None:
+        """
+        从时间轮中移除计时器
+        Remove a timer from the wheel.
+        """
+        if timer._slot is None:
+            return
+        timer._slot.discard(timer)
+        timer._slot = None
+        self._count -= 1
+
+    def _ensure_ticking(self) -> None:
+        """
+        有计时器时启动周期刻度
+        Start the periodic tick when timers exist.
+        """
+        if self._handle is None and self._count:
+            self._handle = self._loop.call_at(
+                (self._current + 1) * self._tick, self._on_tick
+            )
+
+    def _on_tick(self) -> None:
+        """
+        周期刻度 - 处理到期的槽
+        Periodic tick - process slots that came due.
+
+        事件循环被阻塞时，会补上错过的刻度。
+        Missed ticks are caught up if the event loop was blocked.
+        """
+        target = self._elapsed_of(self._loop.time())
+        while self._current < target and self._count:
+            self._advance(self._current + 1)
+        self._current = max(self._current, target)
+
+        # 处理期间保留旧句柄，避免插入时重新计时 | Keep the old handle while processing
+        self._handle = None
+        self._ensure_ticking()
+
+    def _advance(self, tick: int) -> None:
+        """
+        前进一个刻度
+        Advance by one tick.
+        """
+        self._current = tick
+
+        # 级联：低层转完一圈时，把上层当前槽重新放入（先于本刻度的槽处理）
+        # Cascade: when a lower level wraps, re-insert the current slot of the level
+        # above (before this tick's slot is processed)
+        for level in range(1, WHEEL_LEVELS):
+            if tick & ((1 << (WHEEL_BITS * level)) - 1):
+                break
+            self._reinsert(
+                self._wheels[level][(tick >> (WHEEL_BITS * level)) & WHEEL_MASK]
+            )
+
+        slot = self._wheels[0][tick & WHEEL_MASK]
+        if not slot:
+            return
+
+        now = tick * self._tick
+        for timer in list(slot):
+            # 回调可能取消或移动了其他计时器 | Callbacks may have cancelled or moved other timers
+            if timer._slot is not slot:
+                continue
+            slot.discard(timer)
+            timer._slot = None
+            self._count -= 1
+            if timer.deadline > now:
+                # 截止时间已被推迟，惰性地重新放入 | Deadline was pushed back, re-insert lazily
+                self._insert(timer)
+                continue
+            self.expired += 1
+            try:
+                timer.callback()
+            except Exception:  # noqa: BLE001
+                _LOGGER.exception("Timing wheel callback error")
+
+    def _reinsert(self, slot: set[WheelTimer]) -> None:
+        """
+        把一个槽中的计时器按截止时间重新放入
+        Re-insert the timers of a slot by their deadlines.
+        """
+        if not slot:
+            return
+        timers = list(slot)
+        slot.clear()
+        self._count -= len(timers)
+        self.cascaded += len(timers)
+        for timer in timers:
+            timer._slot = None
+            self._insert(timer, earliest=self._current)
+
+    def stats(self) -> dict[str, int]:
+        """
+        返回时间轮统计
+        Return timing wheel statistics.
+        """
+        return {
+            "scheduled": self._count,
+            "expired": self.expired,
+            "cascaded": self.cascaded,
+        }
+
+
+def async_get_timing_wheel(hass: HomeAssistant) -> TimingWheel:
+    """
+    获取集成共享的时间轮，不存在时创建
+    Get the integration-wide timing wheel, creating it if missing.
+    """
+    if (wheel := hass.data.get(DATA_TIMING_WHEEL)) is None:
+        wheel = hass.data[DATA_TIMING_WHEEL] = TimingWheel(hass.loop)
+    return wheel